@@ -27,9 +27,50 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 7 * 24 * 60
 
     DATABASE_URL: str
+    DATABASE_URL_SYNC: str | None = None
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 2
 
+    IMPORT_UPLOAD_BATCH_ROWS: int = 5000
+    ELO_INDEX_REFRESH_SECONDS: int = 60
+    MODEL_REGISTRY_POLL_SECONDS: int = 30
+    PREDICTION_BATCH_WINDOW_MS: float = 5.0
+    PREDICTION_BATCH_MAX_SIZE: int = 256
+    COMPUTE_WORKERS: int = 2
+    COMPUTE_MAX_QUEUE: int = 64
+    PREDICTION_CACHE_MAX_ENTRIES: int = 10_000
+    PREDICTION_CACHE_TTL_SECONDS: int = 600
+    PREDICTION_CACHE_POLL_SECONDS: int = 15
+
+    API_FOOTBALL_BASE_URL: str = "https://v3.football.api-sports.io"
+    API_FOOTBALL_KEY: str = ""
+    API_FOOTBALL_TIMEOUT_SECONDS: float = 10.0
+    API_FOOTBALL_MAX_CONNECTIONS: int = 20
+    API_FOOTBALL_MAX_RETRIES: int = 3
+    API_FOOTBALL_CACHE_MAX_ENTRIES: int = 5000
+    API_FOOTBALL_TTL_FINISHED_SECONDS: int = 24 * 60 * 60
+    API_FOOTBALL_TTL_LIVE_SECONDS: int = 15
+    API_FOOTBALL_TTL_DEFAULT_SECONDS: int = 300
+    API_FOOTBALL_STORE_PATH: str | None = "app/data/api_football.sqlite3"
+    API_FOOTBALL_REPLAY: bool = False
+    # Süresi tamamen dolmuş depo kayıtlarının silinme aralığı (0: kapalı)
+    API_FOOTBALL_STORE_PRUNE_SECONDS: int = 60 * 60
+    # Plan limitleri; API anahtarı tüm worker'lar için ortaktır
+    API_FOOTBALL_RATE_PER_MINUTE: int = 300
+    API_FOOTBALL_BURST: int = 10
+    # Aynı anahtarı kullanan uvicorn worker sayısı: her worker'ın bucket'ı
+    # RATE_PER_MINUTE / WORKERS hızında dolar
+    API_FOOTBALL_WORKERS: int = 1
+    API_FOOTBALL_DAILY_RESERVE: int = 500
+    # Senkronize edilecek api-sports lig id'leri (boşsa sync kapalı), örn: [203, 39]
+    API_FOOTBALL_SYNC_LEAGUES: list[int] = []
+    API_FOOTBALL_SYNC_SEASON: int | None = None
+    API_FOOTBALL_SYNC_SECONDS: int = 900
+    API_FOOTBALL_SYNC_LOOKAHEAD_DAYS: int = 7
+    API_FOOTBALL_SYNC_POSTPROCESS: bool = True
+    # Worker'lardan sadece bu dosyanın kilidini alan senkronizasyonu yürütür
+    API_FOOTBALL_SYNC_LOCK_PATH: str | None = "app/data/fixture_sync.lock"
+
     @field_validator("SECRET_KEY")
     @classmethod
     def validate_secret_key(cls, v: str) -> str:
@@ -4,10 +4,16 @@ from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import InvalidTokenError, UserNotFoundError
+from app.core.exceptions import (
+    InsufficientPermissionsError,
+    InvalidTokenError,
+    UserNotFoundError,
+)
 from app.core.security import verify_token
 from app.db.database import async_session_maker
 from app.models.user import User
+from app.repositories.import_job import ImportJobRepository
+from app.repositories.team import TeamRepository
 from app.repositories.user import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -27,6 +33,16 @@ async def get_user_repository(db: AsyncSession = Depends(get_db)) -> UserReposit
     return UserRepository(db)
 
 
+async def get_import_job_repository(
+    db: AsyncSession = Depends(get_db),
+) -> ImportJobRepository:
+    return ImportJobRepository(db)
+
+
+async def get_team_repository(db: AsyncSession = Depends(get_db)) -> TeamRepository:
+    return TeamRepository(db)
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     user_repo: UserRepository = Depends(get_user_repository),
@@ -43,3 +59,11 @@ async def get_current_user(
     if not user:
         raise UserNotFoundError()
     return user
+
+
+async def get_current_superuser(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    if not current_user.is_superuser:
+        raise InsufficientPermissionsError()
+    return current_user
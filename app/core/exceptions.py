@@ -93,6 +93,34 @@ class UserNotFoundError(NotFoundError):
         super().__init__(message=message)
 
 
+class ImportJobNotFoundError(NotFoundError):
+    """Import job not found."""
+
+    def __init__(self, message: str = "Import job not found"):
+        super().__init__(message=message)
+
+
+class MatchNotFoundError(NotFoundError):
+    """Match not found."""
+
+    def __init__(self, message: str = "Match not found"):
+        super().__init__(message=message)
+
+
+class TeamNotFoundError(NotFoundError):
+    """Team not found."""
+
+    def __init__(self, message: str = "Team not found"):
+        super().__init__(message=message)
+
+
+class EloRatingNotFoundError(NotFoundError):
+    """No Elo rating on or before the requested date."""
+
+    def __init__(self, message: str = "No Elo rating found for this team and date"):
+        super().__init__(message=message)
+
+
 # Conflict Exceptions
 class ConflictError(BaseAppException):
     """Resource conflict."""
@@ -110,6 +138,13 @@ class UserAlreadyExistsError(ConflictError):
         super().__init__(message=message)
 
 
+class ImportJobAlreadyStartedError(ConflictError):
+    """Import job already received an upload."""
+
+    def __init__(self, message: str = "Import job has already been started"):
+        super().__init__(message=message)
+
+
 # Validation Exceptions
 class ValidationError(BaseAppException):
     """Validation error."""
@@ -125,6 +160,39 @@ class PasswordValidationError(ValidationError):
         super().__init__(message=message)
 
 
+# Service Exceptions
+class ServiceUnavailableError(BaseAppException):
+    """Service temporarily unavailable."""
+
+    def __init__(
+        self, message: str = "Service unavailable", detail: Optional[Any] = None
+    ):
+        super().__init__(message=message, status_code=503, detail=detail)
+
+
+class ModelNotAvailableError(ServiceUnavailableError):
+    """No active model is loaded for the requested market."""
+
+    def __init__(self, message: str = "No active model is loaded for this market"):
+        super().__init__(message=message)
+
+
+class UpstreamRateLimitedError(ServiceUnavailableError):
+    """Upstream request was shed by the quota-aware scheduler."""
+
+    def __init__(self, message: str = "Upstream quota exhausted, try again later"):
+        super().__init__(message=message)
+
+
+class UpstreamServiceError(BaseAppException):
+    """External API returned an error or could not be reached."""
+
+    def __init__(
+        self, message: str = "Upstream service error", detail: Optional[Any] = None
+    ):
+        super().__init__(message=message, status_code=502, detail=detail)
+
+
 # Database Exceptions
 class DatabaseError(BaseAppException):
     """Database error."""
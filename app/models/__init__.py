@@ -1,8 +1,11 @@
 from app.models.division import Division
 from app.models.elo_history import EloHistory
+from app.models.import_job import ImportJob
+from app.models.import_manifest import ImportManifest
 from app.models.match import Match, MatchResult
 from app.models.ml_model import MLModel
 from app.models.prediction import Prediction
+from app.models.sync_state import SyncState
 from app.models.team import Team
 from app.models.team_stats import TeamStats
 from app.models.user import User
@@ -17,4 +20,7 @@ __all__ = [
     "EloHistory",
     "Prediction",
     "MLModel",
+    "ImportManifest",
+    "ImportJob",
+    "SyncState",
 ]
@@ -1,6 +1,15 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -12,6 +21,10 @@ class EloHistory(Base):
     
     ClubElo ayda 2 kez (1. ve 15. gün) snapshot alıyor.
     Bu snapshot'ları burada saklıyoruz.
+
+    source kolonu değerin kaynağını ayırır: 'clubelo' CSV'den import
+    edilen değerler, 'native' ise matches tablosundan hesaplanan
+    (app.services.elo) maç sonrası puanlardır.
     
     Örnek:
     ┌────┬─────────┬────────────┬─────────┐
@@ -23,12 +36,22 @@ class EloHistory(Base):
     └────┴─────────┴────────────┴─────────┘
     """
     __tablename__ = "elo_history"
+    __table_args__ = (
+        # Takım başına, kaynak başına günde tek snapshot
+        UniqueConstraint("team_id", "date", "source", name="uq_elo_history_team_date_source"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.id"), index=True)
     date: Mapped[date] = mapped_column(Date, index=True)
     elo: Mapped[float] = mapped_column(Float, nullable=False)
+    source: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="clubelo", server_default="clubelo"
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
 
     # İlişki
     team = relationship("Team", back_populates="elo_history")
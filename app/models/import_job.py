@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+class ImportJob(Base):
+    """
+    Admin panelinden yüklenen CSV import işleri.
+    
+    Upload sırasında her batch commit edildiğinde sayaçlar güncellenir;
+    böylece ilerleme başka bir istekten (ve başka bir worker'dan) izlenebilir.
+    
+    Örnek:
+    ┌──────────┬───────────┬────────────────┬───────────────┬────────────────┐
+    │ id       │ status    │ rows_processed │ matches_added │ bytes_received │
+    ├──────────┼───────────┼────────────────┼───────────────┼────────────────┤
+    │ 3f2a...  │ running   │ 45000          │ 44120         │ 12582912       │
+    │ 9c1b...  │ completed │ 230557         │ 1240          │ 64424509       │
+    └──────────┴───────────┴────────────────┴───────────────┴────────────────┘
+    """
+    __tablename__ = "import_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    created_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # pending -> running -> completed / failed
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # İlerleme
+    total_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    bytes_received: Mapped[int] = mapped_column(BigInteger, default=0)
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0)
+    matches_added: Mapped[int] = mapped_column(Integer, default=0)
+    matches_skipped: Mapped[int] = mapped_column(Integer, default=0)
+    elo_added: Mapped[int] = mapped_column(Integer, default=0)
+    elo_skipped: Mapped[int] = mapped_column(Integer, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
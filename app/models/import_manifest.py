@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+class ImportManifest(Base):
+    """
+    Dataset import checkpoint'leri.
+    
+    Her kaynak dosya ve import aşaması (matches, elo) için TEK satır vardır.
+    prefix_hash, dosyanın header + ilk rows_processed satırının hash'idir;
+    dosya sadece sona ekleme ile büyüdüyse import kaldığı yerden devam eder.
+    
+    Örnek:
+    ┌────┬───────────────────┬─────────┬────────────────┬─────────────┬──────────────┐
+    │ id │ source            │ stage   │ rows_processed │ last_batch  │ completed_at │
+    ├────┼───────────────────┼─────────┼────────────────┼─────────────┼──────────────┤
+    │ 1  │ /data/Matches.csv │ matches │ 230557         │ 3           │ 2024-05-01   │
+    │ 2  │ /data/Matches.csv │ elo     │ 100000         │ 1           │ NULL         │
+    └────┴───────────────────┴─────────┴────────────────┴─────────────┴──────────────┘
+    """
+    __tablename__ = "import_manifests"
+    __table_args__ = (
+        UniqueConstraint("source", "stage", name="uq_import_manifests_source_stage"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source: Mapped[str] = mapped_column(String(255), nullable=False)
+    stage: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Dosya parmak izleri (sha256)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    prefix_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # İlerleme
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0)
+    last_batch: Mapped[int] = mapped_column(Integer, default=0)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
@@ -2,7 +2,18 @@ import enum
 from datetime import date, datetime, time
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, DateTime, Enum, Float, ForeignKey, Integer, String, Time, func
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Time,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -24,6 +35,12 @@ class Match(Base):
     """
 
     __tablename__ = "matches"
+    __table_args__ = (
+        # Doğal anahtar: aynı gün aynı eşleşme tek maçtır
+        UniqueConstraint(
+            "match_date", "home_team_id", "away_team_id", name="uq_matches_natural_key"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 
@@ -45,6 +62,8 @@ class Match(Base):
     # Maç Öncesi Verileri (Model INPUT)
     home_team_elo: Mapped[float | None] = mapped_column(Float, nullable=True)
     away_team_elo: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # ELO kolonlarını yerel motor yazdıysa "native"; CSV'den (ClubElo) gelenlerde NULL
+    elo_source: Mapped[str | None] = mapped_column(String(20), nullable=True)
     form3_home: Mapped[int | None] = mapped_column(Integer, nullable=True)
     form3_away: Mapped[int | None] = mapped_column(Integer, nullable=True)
     form5_home: Mapped[int | None] = mapped_column(Integer, nullable=True)
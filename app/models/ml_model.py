@@ -44,6 +44,8 @@ class MLModel(Base):
     auc_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     log_loss: Mapped[float | None] = mapped_column(Float, nullable=True)
     mae: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Walk-forward backtest ayrıntıları (sezon bazında metrikler, ROI)
+    backtest: Mapped[dict | None] = mapped_column(JSON, nullable=True)
 
     # Durum
     is_active: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+class SyncState(Base):
+    """
+    Artımlı arka plan işlerinin watermark'ları.
+
+    Her iş (ve gerekiyorsa lig) için TEK satır vardır. watermark, işin en
+    son işlediği kaynak değişiklik zamanıdır; bir sonraki tur sadece
+    ondan yeni kayıtları ele alır.
+
+    Örnek:
+    ┌────────────────────┬─────────────────────┬──────────────────────┐
+    │ name               │ watermark           │ cursor               │
+    ├────────────────────┼─────────────────────┼──────────────────────┤
+    │ settlement:result  │ 2024-05-19 22:10:04 │ NULL                 │
+    │ fixtures:203       │ 2024-05-19 21:00:00 │ {"season": 2023}     │
+    └────────────────────┴─────────────────────┴──────────────────────┘
+    """
+    __tablename__ = "sync_states"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    watermark: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    cursor: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
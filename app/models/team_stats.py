@@ -1,6 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -45,6 +46,12 @@ class TeamStats(Base):
     win_streak: Mapped[int] = mapped_column(Integer, default=0)
     scoring_streak: Mapped[int] = mapped_column(Integer, default=0)
 
+    # Son 5 maçın ham değerleri (ring buffer, eskiden yeniye):
+    # [atılan, yenen, şut, isabetli şut, korner, yenen korner, puan]
+    recent_matches: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    last_match_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_match_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now()
     )
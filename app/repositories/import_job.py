@@ -0,0 +1,42 @@
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ImportJob
+
+
+class ImportJobRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, job_id: str) -> Optional[ImportJob]:
+        result = await self.db.execute(select(ImportJob).where(ImportJob.id == job_id))
+        return result.scalar_one_or_none()
+
+    async def create(self, job: ImportJob) -> ImportJob:
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def claim(self, job_id: str) -> bool:
+        """
+        pending işi atomik olarak running'e çek.
+
+        Aynı işe eşzamanlı iki upload gelirse sadece biri True alır.
+        """
+        result = await self.db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id, ImportJob.status == "pending")
+            .values(status="running")
+            .returning(ImportJob.id)
+        )
+        claimed = result.scalar_one_or_none() is not None
+        await self.db.commit()
+        return claimed
+
+    async def refresh(self, job: ImportJob) -> ImportJob:
+        """Başka bir session'ın yazdığı ilerlemeyi oku."""
+        await self.db.refresh(job)
+        return job
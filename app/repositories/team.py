@@ -0,0 +1,15 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Team
+
+
+class TeamRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, team_id: int) -> Optional[Team]:
+        result = await self.db.execute(select(Team).where(Team.id == team_id))
+        return result.scalar_one_or_none()
@@ -0,0 +1,80 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Request, status
+
+from app.core.config import get_settings
+from app.core.dependencies import get_current_superuser, get_import_job_repository
+from app.core.exceptions import ImportJobAlreadyStartedError, ImportJobNotFoundError
+from app.db.database import async_session_maker
+from app.models import ImportJob, User
+from app.repositories.import_job import ImportJobRepository
+from app.schemas.import_job import ImportJobCreate, ImportJobOut
+from app.services.csv_upload import ingest_matches_csv
+
+router = APIRouter(prefix="/admin/imports", tags=["Admin Imports"])
+settings = get_settings()
+
+
+@router.post("", response_model=ImportJobOut, status_code=status.HTTP_201_CREATED)
+async def create_import_job(
+    data: ImportJobCreate,
+    current_user: User = Depends(get_current_superuser),
+    job_repo: ImportJobRepository = Depends(get_import_job_repository),
+) -> ImportJobOut:
+    """Create an import job. Upload the CSV with PUT /admin/imports/{job_id}/upload."""
+    job = ImportJob(
+        id=str(uuid.uuid4()),
+        created_by=current_user.id,
+        filename=data.filename,
+        status="pending",
+        bytes_received=0,
+        rows_processed=0,
+        matches_added=0,
+        matches_skipped=0,
+        elo_added=0,
+        elo_skipped=0,
+    )
+    return await job_repo.create(job)
+
+
+@router.put("/{job_id}/upload", response_model=ImportJobOut, status_code=status.HTTP_200_OK)
+async def upload_matches_csv(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_superuser),
+    job_repo: ImportJobRepository = Depends(get_import_job_repository),
+) -> ImportJobOut:
+    """
+    Stream a Matches.csv request body (text/csv) into the database.
+
+    The body is parsed and written batch by batch while it is received;
+    progress is visible on GET /admin/imports/{job_id} during the upload.
+    """
+    job = await job_repo.get_by_id(job_id)
+    if not job:
+        raise ImportJobNotFoundError()
+    if not await job_repo.claim(job.id):
+        raise ImportJobAlreadyStartedError()
+
+    content_length = request.headers.get("content-length")
+    await ingest_matches_csv(
+        async_session_maker,
+        job.id,
+        request.stream(),
+        total_bytes=int(content_length) if content_length else None,
+        batch_rows=settings.IMPORT_UPLOAD_BATCH_ROWS,
+    )
+    return await job_repo.refresh(job)
+
+
+@router.get("/{job_id}", response_model=ImportJobOut, status_code=status.HTTP_200_OK)
+async def get_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_superuser),
+    job_repo: ImportJobRepository = Depends(get_import_job_repository),
+) -> ImportJobOut:
+    """Get import job status and live progress."""
+    job = await job_repo.get_by_id(job_id)
+    if not job:
+        raise ImportJobNotFoundError()
+    return job
@@ -0,0 +1,130 @@
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.dependencies import get_current_superuser, get_current_user, get_db
+from app.core.exceptions import MatchNotFoundError, ModelNotAvailableError
+from app.db.database import async_session_maker
+from app.models import User
+from app.schemas.prediction import (
+    BatcherMetricsOut,
+    ExecutorMetricsOut,
+    PredictionCacheMetricsOut,
+    MatchdayPredictionOut,
+    MatchdayPredictionRequest,
+    Market,
+    PredictionOut,
+)
+from app.services.batcher import MicroBatcher
+from app.services.executor import compute_executor
+from app.services.model_registry import model_registry
+from app.services.prediction_cache import CacheInvalidator, PredictionCache
+from app.services.predictions import (
+    active_models,
+    model_version,
+    predict_matchday,
+    predict_matches,
+)
+
+router = APIRouter(prefix="/predictions", tags=["Predictions"])
+settings = get_settings()
+
+# Tekil tahmin istekleri tek model çağrısında birleştirilir
+batcher = MicroBatcher(
+    lambda items: predict_matches(async_session_maker, model_registry, compute_executor, items),
+    window_ms=settings.PREDICTION_BATCH_WINDOW_MS,
+    max_batch_size=settings.PREDICTION_BATCH_MAX_SIZE,
+)
+
+# (match_id, market, model_version) -> tahmin; lifespan'da invalidator başlatılır
+cache = PredictionCache(
+    max_entries=settings.PREDICTION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS,
+)
+cache_invalidator = CacheInvalidator(cache)
+
+
+def drop_replaced_model(name, old, new) -> None:
+    if old is not None:
+        cache.invalidate_model_version(model_version(old))
+
+
+model_registry.on_swap(drop_replaced_model)
+
+
+@router.post(
+    "/matchday", response_model=MatchdayPredictionOut, status_code=status.HTTP_201_CREATED
+)
+async def create_matchday_predictions(
+    data: MatchdayPredictionRequest,
+    current_user: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_db),
+) -> MatchdayPredictionOut:
+    """
+    Predict every unplayed fixture in a date range and/or divisions at once.
+
+    One feature matrix is built for all fixtures, each market's active model
+    is called once, and all predictions are stored in a single bulk insert.
+    """
+    if not active_models(model_registry, data.markets):
+        raise ModelNotAvailableError()
+
+    summary = await predict_matchday(
+        db,
+        model_registry,
+        compute_executor,
+        date_from=data.date_from,
+        date_to=data.date_to,
+        divisions=data.divisions,
+        markets=data.markets,
+    )
+    for row in summary["predictions"]:
+        cache.put((row["match_id"], row["market"], row["model_version"]), row)
+    return MatchdayPredictionOut(**summary)
+
+
+@router.get("/matches/{match_id}", response_model=PredictionOut, status_code=status.HTTP_200_OK)
+async def predict_match(
+    match_id: int,
+    market: Market = Query("result", description="Market to predict"),
+    current_user: User = Depends(get_current_user),
+) -> PredictionOut:
+    """
+    Predict a single match with the active model (not stored).
+
+    Results are cached per model version; concurrent misses for the same
+    match share one computation and are micro-batched into one model call.
+    """
+    models = active_models(model_registry, [market])
+    if not models:
+        raise ModelNotAvailableError()
+
+    key = (match_id, market, model_version(models[market]))
+    prediction = await cache.get_or_compute(key, lambda: batcher.submit((match_id, market)))
+    if prediction is None:
+        raise MatchNotFoundError()
+    return PredictionOut(**prediction)
+
+
+@router.get("/batcher/metrics", response_model=BatcherMetricsOut, status_code=status.HTTP_200_OK)
+async def get_batcher_metrics(
+    current_user: User = Depends(get_current_superuser),
+) -> BatcherMetricsOut:
+    """Micro-batcher batch size and queue wait metrics."""
+    return BatcherMetricsOut(**batcher.metrics.snapshot())
+
+
+@router.get("/executor/metrics", response_model=ExecutorMetricsOut, status_code=status.HTTP_200_OK)
+async def get_executor_metrics(
+    current_user: User = Depends(get_current_superuser),
+) -> ExecutorMetricsOut:
+    """Process pool queue depth, saturation and throughput."""
+    return ExecutorMetricsOut(**compute_executor.metrics())
+
+
+@router.get("/cache/metrics", response_model=PredictionCacheMetricsOut, status_code=status.HTTP_200_OK)
+async def get_cache_metrics(
+    current_user: User = Depends(get_current_superuser),
+) -> PredictionCacheMetricsOut:
+    """Prediction cache size, hit/miss counters and invalidations."""
+    return PredictionCacheMetricsOut(**cache.stats())
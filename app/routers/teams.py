@@ -0,0 +1,67 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.dependencies import get_current_user, get_db, get_team_repository
+from app.core.exceptions import EloRatingNotFoundError, TeamNotFoundError
+from app.models import User
+from app.repositories.team import TeamRepository
+from app.schemas.team import EloPoint, EloSource, TeamEloHistoryOut, TeamEloOut
+from app.services.elo_index import EloIndex, elo_indexes
+
+router = APIRouter(prefix="/teams", tags=["Teams"])
+settings = get_settings()
+
+
+async def get_fresh_index(source: EloSource, db: AsyncSession) -> EloIndex:
+    index = elo_indexes[source]
+    await index.ensure_fresh(db, settings.ELO_INDEX_REFRESH_SECONDS)
+    return index
+
+
+@router.get("/{team_id}/elo", response_model=TeamEloOut, status_code=status.HTTP_200_OK)
+async def get_team_elo(
+    team_id: int,
+    on: date = Query(..., alias="date", description="As-of date (YYYY-MM-DD)"),
+    source: EloSource = Query("clubelo", description="Rating source"),
+    current_user: User = Depends(get_current_user),
+    team_repo: TeamRepository = Depends(get_team_repository),
+    db: AsyncSession = Depends(get_db),
+) -> TeamEloOut:
+    """Get the team's Elo rating on a date (latest snapshot on or before it)."""
+    if not await team_repo.get_by_id(team_id):
+        raise TeamNotFoundError()
+
+    index = await get_fresh_index(source, db)
+    found = index.asof(team_id, on)
+    if found is None:
+        raise EloRatingNotFoundError()
+    as_of, elo = found
+    return TeamEloOut(team_id=team_id, source=source, date=on, as_of=as_of, elo=elo)
+
+
+@router.get(
+    "/{team_id}/elo/history", response_model=TeamEloHistoryOut, status_code=status.HTTP_200_OK
+)
+async def get_team_elo_history(
+    team_id: int,
+    start: Optional[date] = Query(None, description="First date (inclusive)"),
+    end: Optional[date] = Query(None, description="Last date (inclusive)"),
+    source: EloSource = Query("clubelo", description="Rating source"),
+    current_user: User = Depends(get_current_user),
+    team_repo: TeamRepository = Depends(get_team_repository),
+    db: AsyncSession = Depends(get_db),
+) -> TeamEloHistoryOut:
+    """Get the team's Elo snapshots, optionally limited to a date range."""
+    if not await team_repo.get_by_id(team_id):
+        raise TeamNotFoundError()
+
+    index = await get_fresh_index(source, db)
+    dates, values = index.history(team_id, start, end)
+    points = [
+        EloPoint(date=day, elo=elo) for day, elo in zip(dates.tolist(), values.tolist())
+    ]
+    return TeamEloHistoryOut(team_id=team_id, source=source, points=points)
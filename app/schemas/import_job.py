@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field, computed_field
+
+
+class ImportJobCreate(BaseModel):
+    filename: Optional[str] = Field(
+        None, max_length=255, description="Uploaded file name (informational)"
+    )
+
+
+class ImportJobOut(BaseModel):
+    id: str = Field(..., description="Import job ID")
+    filename: Optional[str] = Field(None, description="Uploaded file name")
+    status: str = Field(..., description="pending, running, completed or failed")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    total_bytes: Optional[int] = Field(None, description="Upload size (Content-Length)")
+    bytes_received: int = Field(..., description="Bytes received so far")
+    rows_processed: int = Field(..., description="CSV rows processed so far")
+    matches_added: int = Field(..., description="Matches inserted")
+    matches_skipped: int = Field(..., description="Matches already present")
+    elo_added: int = Field(..., description="Elo history rows inserted")
+    elo_skipped: int = Field(..., description="Elo history rows already present")
+    created_at: datetime = Field(..., description="Job created at")
+    started_at: Optional[datetime] = Field(None, description="Upload started at")
+    finished_at: Optional[datetime] = Field(None, description="Job finished at")
+
+    @computed_field(description="Upload progress in percent, if the size is known")
+    @property
+    def progress(self) -> Optional[float]:
+        if not self.total_bytes:
+            return None
+        return round(min(self.bytes_received / self.total_bytes, 1.0) * 100, 1)
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,75 @@
+import datetime
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+Market = Literal["result", "over25"]
+
+
+class MatchdayPredictionRequest(BaseModel):
+    date_from: Optional[datetime.date] = Field(None, description="First match date (inclusive)")
+    date_to: Optional[datetime.date] = Field(None, description="Last match date (inclusive)")
+    divisions: Optional[List[str]] = Field(None, description="Division codes, e.g. ['E0', 'T1']")
+    markets: Optional[List[Market]] = Field(None, description="Markets to predict (default: all)")
+
+    @model_validator(mode="after")
+    def check_scope(self) -> "MatchdayPredictionRequest":
+        if self.date_from is None and self.date_to is None and not self.divisions:
+            raise ValueError("Either a date range or a division list is required")
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from must be on or before date_to")
+        return self
+
+
+class PredictionOut(BaseModel):
+    match_id: int = Field(..., description="Match ID")
+    market: str = Field(..., description="Market, e.g. result or over25")
+    prediction: Optional[str] = Field(None, description="Predicted outcome")
+    probability: Optional[float] = Field(None, description="Probability of the predicted outcome")
+    prob_details: Optional[Dict[str, float]] = Field(None, description="Probability per outcome")
+    model_version: Optional[str] = Field(None, description="Model name and version")
+
+    class Config:
+        from_attributes = True
+
+
+class MatchdayPredictionOut(BaseModel):
+    fixtures: int = Field(..., description="Fixtures predicted")
+    models: Dict[str, str] = Field(..., description="Market -> model version used")
+    feature_seconds: float = Field(..., description="Feature matrix build time")
+    model_seconds: float = Field(..., description="Total model time across markets")
+    predictions: List[PredictionOut] = Field(..., description="Stored predictions")
+
+
+class BatcherMetricsOut(BaseModel):
+    batches: int = Field(..., description="Model calls made")
+    items: int = Field(..., description="Requests served")
+    errors: int = Field(..., description="Failed batches")
+    avg_batch_size: float = Field(..., description="Average requests per model call")
+    batch_size_histogram: Dict[str, int] = Field(..., description="Batches per size bucket")
+    queue_wait_ms: Dict[str, float] = Field(..., description="Queue wait p50, p99 and max")
+
+
+class ExecutorMetricsOut(BaseModel):
+    enabled: bool = Field(..., description="False when jobs run in threads (COMPUTE_WORKERS=0)")
+    workers: int = Field(..., description="Pool size")
+    max_queue: int = Field(..., description="Jobs allowed to wait beyond the pool size")
+    running: int = Field(..., description="Jobs handed to the pool")
+    queue_depth: int = Field(..., description="Jobs waiting for a worker or a slot")
+    saturation: float = Field(..., description="Busy workers / pool size, right now")
+    utilization: float = Field(..., description="Busy worker time / capacity since start")
+    submitted: int = Field(..., description="Jobs submitted")
+    completed: int = Field(..., description="Jobs completed")
+    failed: int = Field(..., description="Jobs failed")
+
+
+class PredictionCacheMetricsOut(BaseModel):
+    entries: int = Field(..., description="Cached predictions")
+    max_entries: int = Field(..., description="LRU capacity")
+    ttl_seconds: float = Field(..., description="Entry lifetime")
+    hits: int = Field(..., description="Served from cache")
+    misses: int = Field(..., description="Computed")
+    coalesced: int = Field(..., description="Waited on an in-flight computation")
+    hit_rate: float = Field(..., description="hits / all lookups")
+    evictions: int = Field(..., description="Dropped by LRU capacity")
+    invalidations: int = Field(..., description="Dropped by model or input changes")
@@ -0,0 +1,25 @@
+import datetime
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+EloSource = Literal["clubelo", "native"]
+
+
+class TeamEloOut(BaseModel):
+    team_id: int = Field(..., description="Team ID")
+    source: EloSource = Field(..., description="clubelo (imported) or native (computed)")
+    date: datetime.date = Field(..., description="Requested date")
+    as_of: datetime.date = Field(..., description="Date of the rating snapshot used")
+    elo: float = Field(..., description="Elo rating on the requested date")
+
+
+class EloPoint(BaseModel):
+    date: datetime.date = Field(..., description="Snapshot date")
+    elo: float = Field(..., description="Elo rating")
+
+
+class TeamEloHistoryOut(BaseModel):
+    team_id: int = Field(..., description="Team ID")
+    source: EloSource = Field(..., description="clubelo (imported) or native (computed)")
+    points: List[EloPoint] = Field(..., description="Rating snapshots in date order")
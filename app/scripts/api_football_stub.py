@@ -0,0 +1,185 @@
+"""
+API-Football Stub Sunucusu
+api-sports.io'nun kullandığımız uçlarını (fixtures, fixtures/statistics,
+players, status) sabit örnek verilerle taklit eder. Ağ ve API kotası
+olmadan istemciyi, yeniden denemeleri ve proxy endpoint'lerini denemek
+için kullanılır.
+
+Kullanım:
+    python -m app.scripts.api_football_stub --port 8081
+
+    # Gecikme ve rastgele 503 ile (retry davranışını görmek için)
+    python -m app.scripts.api_football_stub --port 8081 --latency-ms 300 --fail-rate 0.2
+
+    # Kayıtlı gerçek yanıtları (API_FOOTBALL_STORE_PATH) sun, olmayanlar için örnek veri
+    python -m app.scripts.api_football_stub --store app/data/api_football.sqlite3
+
+    # Depodaki kayıtları sabitle: uygulamanın periyodik prune'u bunları silmez
+    python -m app.scripts.api_football_stub --store app/data/api_football.sqlite3 --pin
+
+    # Uygulamayı stub'a yönlendir
+    API_FOOTBALL_BASE_URL=http://localhost:8081 uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.api_store import ResponseStore
+
+TEAMS = {
+    549: "Besiktas",
+    611: "Fenerbahce",
+    645: "Galatasaray",
+    998: "Trabzonspor",
+}
+LEAGUE = {"id": 203, "name": "Süper Lig", "country": "Turkey"}
+DAILY_LIMIT = 7500
+
+app = FastAPI(title="API-Football stub")
+state = {"latency": 0.0, "fail_rate": 0.0, "requests": 0, "store": None}
+
+
+def envelope(endpoint: str, params: dict, response: list) -> dict:
+    return {
+        "get": endpoint,
+        "parameters": params,
+        "errors": [],
+        "results": len(response),
+        "paging": {"current": 1, "total": 1},
+        "response": response,
+    }
+
+
+def make_fixture(fixture_id: int, season: int) -> dict:
+    """fixture_id'den belirlenimci (her çağrıda aynı) örnek maç."""
+    rng = random.Random(fixture_id)
+    home, away = rng.sample(sorted(TEAMS), 2)
+    kickoff = datetime(season, 8, 1, 17, tzinfo=timezone.utc) + timedelta(days=7 * (fixture_id % 34))
+    finished = kickoff < datetime.now(timezone.utc)
+    goals = {"home": rng.randint(0, 4), "away": rng.randint(0, 3)} if finished else {"home": None, "away": None}
+    return {
+        "fixture": {
+            "id": fixture_id,
+            "date": kickoff.isoformat(),
+            "timestamp": int(kickoff.timestamp()),
+            "status": {"long": "Match Finished", "short": "FT", "elapsed": 90} if finished
+            else {"long": "Not Started", "short": "NS", "elapsed": None},
+        },
+        "league": {**LEAGUE, "season": season, "round": f"Regular Season - {fixture_id % 34 + 1}"},
+        "teams": {
+            "home": {"id": home, "name": TEAMS[home]},
+            "away": {"id": away, "name": TEAMS[away]},
+        },
+        "goals": goals,
+        "score": {"fulltime": goals},
+    }
+
+
+def make_statistics(fixture_id: int) -> list[dict]:
+    rng = random.Random(fixture_id * 7)
+    fixture = make_fixture(fixture_id, 2024)
+    return [
+        {
+            "team": fixture["teams"][side],
+            "statistics": [
+                {"type": "Shots on Goal", "value": rng.randint(1, 10)},
+                {"type": "Total Shots", "value": rng.randint(5, 20)},
+                {"type": "Corner Kicks", "value": rng.randint(0, 10)},
+                {"type": "Fouls", "value": rng.randint(5, 18)},
+                {"type": "Yellow Cards", "value": rng.randint(0, 5)},
+                {"type": "Red Cards", "value": rng.choice([None, None, None, 1])},
+                {"type": "Ball Possession", "value": f"{rng.randint(35, 65)}%"},
+            ],
+        }
+        for side in ("home", "away")
+    ]
+
+
+@app.middleware("http")
+async def simulate_network(request: Request, call_next):
+    state["requests"] += 1
+    if state["latency"]:
+        await asyncio.sleep(state["latency"])
+    if random.random() < state["fail_rate"]:
+        return JSONResponse({"message": "stub: simulated outage"}, status_code=503)
+    stored = None
+    if state["store"] is not None:
+        stored = await asyncio.to_thread(state["store"].load, request.url.path, dict(request.query_params))
+    response = JSONResponse(stored.payload) if stored is not None else await call_next(request)
+    response.headers["x-ratelimit-requests-limit"] = str(DAILY_LIMIT)
+    response.headers["x-ratelimit-requests-remaining"] = str(max(DAILY_LIMIT - state["requests"], 0))
+    return response
+
+
+@app.get("/status")
+async def status():
+    return envelope("status", {}, [{"requests": {"current": state["requests"], "limit_day": DAILY_LIMIT}}])
+
+
+@app.get("/fixtures")
+async def fixtures(request: Request):
+    params = dict(request.query_params)
+    season = int(params.get("season", 2024))
+    if "ids" in params:
+        ids = [int(i) for i in params["ids"].split("-") if i]
+    elif "id" in params:
+        ids = [int(params["id"])]
+    else:
+        ids = list(range(season * 1000, season * 1000 + 34))
+
+    response = [make_fixture(fixture_id, season) for fixture_id in ids]
+    if "team" in params:
+        team = int(params["team"])
+        response = [f for f in response if team in (f["teams"]["home"]["id"], f["teams"]["away"]["id"])]
+    return envelope("fixtures", params, response)
+
+
+@app.get("/fixtures/statistics")
+async def fixture_statistics(fixture: int):
+    return envelope("fixtures/statistics", {"fixture": str(fixture)}, make_statistics(fixture))
+
+
+@app.get("/players")
+async def players(request: Request):
+    params = dict(request.query_params)
+    response = [
+        {
+            "player": {"id": team_id * 100 + i, "name": f"{name} Player {i}"},
+            "statistics": [{"team": {"id": team_id, "name": name}, "league": LEAGUE}],
+        }
+        for team_id, name in TEAMS.items()
+        for i in range(1, 4)
+    ]
+    return envelope("players", params, response)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API-Football stub sunucusu")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Her yanıta eklenecek gecikme")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Rastgele 503 oranı (0-1)")
+    parser.add_argument("--store", type=str, help="Kayıtlı yanıtların SQLite deposu")
+    parser.add_argument(
+        "--pin",
+        action="store_true",
+        help="Depodaki kayıtları prune'a karşı sabitle (replay veri seti)"
+    )
+    args = parser.parse_args()
+
+    state["latency"] = args.latency_ms / 1000
+    state["fail_rate"] = args.fail_rate
+    if args.store:
+        state["store"] = ResponseStore(args.store)
+        if args.pin:
+            print(f"📌 {state['store'].pin():,} kayıt sabitlendi")
+    elif args.pin:
+        parser.error("--pin için --store gerekli")
+    print(f"🧪 API-Football stub: http://{args.host}:{args.port}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -10,37 +10,256 @@ Kullanım:
     python -m app.scripts.import_dataset --db "..." --only matches
     python -m app.scripts.import_dataset --db "..." --only elo
     python -m app.scripts.import_dataset --db "..." --only teams
+    
+    # Maçları COPY ile toplu import et (büyük CSV'ler için)
+    python -m app.scripts.import_dataset --db "..." --bulk
+    
+    # Manifest'i yok sayıp dosyayı baştan işle
+    python -m app.scripts.import_dataset --db "..." --full
+    
+    # Division bazında paralel import (her worker kendi bağlantısıyla)
+    python -m app.scripts.import_dataset --db "..." --workers 8
+
+Tekrar çalıştırmalar import_manifests tablosundaki checkpoint'i kullanır;
+sadece yeni eklenen satırlar işlenir.
 """
 
 import argparse
+import contextlib
+import csv
+import hashlib
+import io
+import multiprocessing
 import os
+import tempfile
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.db.database import Base
-from app.models import Division, Team, Match, MatchResult, EloHistory
+from app.models import Division, Team, Match, MatchResult, ImportManifest
+from app.services.elo import ensure_elo_source_column
+from app.services.match_csv import (
+    CSV_DTYPES,
+    ensure_elo_unique_constraint,
+    ensure_match_unique_constraint,
+    match_records,
+    prepare_elo_records,
+    prepare_matches,
+    record_complete,
+)
 
 
-def safe_int(value):
-    """NaN değerlerini None'a çevir."""
-    if pd.isna(value):
-        return None
-    return int(value)
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def read_record(f) -> bytes:
+    """
+    İkili dosyadan bir sonraki CSV kaydının ham byte'larını oku.
+    
+    Tırnaklı alanlar satır sonu içerebilir; kayıt, tırnak sayısının çift
+    olduğu ilk satır sonunda biter ("" kaçışı sayıyı bozmaz). pandas gibi
+    boş satırlar kayıt sayılmaz, bir sonraki kayda eklenir. Dosya sonunda
+    sadece boş satırlar (ya da b'') döner.
+    """
+    record = b''
+    for line in iter(f.readline, b''):
+        record += line
+        if record.strip() and record_complete(record):
+            break
+    return record
+
+
+def iter_csv_chunks(
+    csv_path: str,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    columns=None,
+    skip_rows: int = 0,
+):
+    """
+    CSV'yi sabit boyutlu parçalar halinde oku.
+    
+    Bellek kullanımı dosya boyutundan bağımsız olarak chunksize ile sınırlıdır.
+    columns verilirse sadece o kolonlar okunur, skip_rows verilirse header'dan
+    sonraki ilk skip_rows kayıt atlanır (checkpoint'ten devam için).
+    
+    Kayıtlar PrefixHasher ile aynı kuralla (read_record) atlanır; satır
+    numarasına göre atlamak tırnak içinde satır sonu olan dosyalarda
+    checkpoint'i kaydırırdı.
+    """
+    wanted = set(columns) if columns else set(CSV_DTYPES)
+    options = dict(
+        usecols=lambda col: col in wanted,
+        dtype={col: dtype for col, dtype in CSV_DTYPES.items() if col in wanted},
+        chunksize=chunksize,
+    )
+    if not skip_rows:
+        with pd.read_csv(csv_path, **options) as reader:
+            yield from reader
+        return
+    
+    with open(csv_path, 'rb') as f:
+        names = next(csv.reader([read_record(f).decode('utf-8-sig')]))
+        for _ in range(skip_rows):
+            if not read_record(f).strip():
+                return
+        with pd.read_csv(f, header=None, names=names, **options) as reader:
+            yield from reader
+
+
+def as_chunks(data):
+    """Tek bir DataFrame'i ya da chunk iterable'ını chunk iterable'ına çevir."""
+    if isinstance(data, pd.DataFrame):
+        return [data]
+    return data
 
 
-def safe_float(value):
-    """NaN değerlerini None'a çevir."""
-    if pd.isna(value):
+def collect_keys(csv_path: str, chunksize: int = DEFAULT_CHUNK_SIZE, skip_rows: int = 0):
+    """
+    Division ve takım isimlerini stream ederek topla.
+    
+    Returns:
+        (benzersiz Division/HomeTeam/AwayTeam satırları, okunan satır sayısı)
+    """
+    parts = []
+    total_rows = 0
+    columns = ['Division', 'HomeTeam', 'AwayTeam']
+    for chunk in iter_csv_chunks(csv_path, chunksize, columns, skip_rows):
+        total_rows += len(chunk)
+        parts.append(chunk.drop_duplicates())
+    
+    if not parts:
+        return pd.DataFrame(columns=['Division', 'HomeTeam', 'AwayTeam']), 0
+    keys = pd.concat(parts, ignore_index=True).drop_duplicates(ignore_index=True)
+    return keys, total_rows
+
+
+def file_sha256(path: str) -> str:
+    """Dosyanın tamamının sha256 hash'i."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PrefixHasher:
+    """
+    CSV'nin header + ilk N kaydının hash'ini artımlı hesaplar.
+    
+    Chunk'lar işlendikçe advance() ile ilerletilir, böylece her checkpoint'te
+    dosyanın baştan okunması gerekmez. Sayım fiziksel satır değil CSV kaydı
+    üzerindendir (read_record), pandas'ın chunk'ta döndürdüğü satırlarla aynı.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        self._digest = hashlib.sha256(read_record(self._file))
+        self.rows = 0
+
+    def advance(self, rows: int) -> None:
+        for _ in range(rows):
+            record = read_record(self._file)
+            if not record.strip():
+                break
+            self._digest.update(record)
+            self.rows += 1
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ImportCheckpoint:
+    """
+    Bir kaynak dosya + aşama için ImportManifest kaydını yönetir.
+    
+    Aşama fonksiyonları her chunk'ın sonunda commit(rows) çağırır; manifest
+    güncellemesi chunk'ın verisiyle aynı transaction'da commit edilir.
+    Böylece yarıda kalan bir import son commit edilen batch'ten devam eder.
+    
+    upsert=True ise dosya daha önce işlenmiş ama değişmiş (ya da --full):
+    mevcut kayıtlar atlanmaz, farklı olanlar güncellenir.
+    """
+
+    def __init__(self, db, manifest: ImportManifest, hasher: PrefixHasher, upsert: bool = False):
+        self.db = db
+        self.manifest = manifest
+        self.hasher = hasher
+        self.upsert = upsert
+
+    @property
+    def start_row(self) -> int:
+        return self.hasher.rows
+
+    def commit(self, rows: int) -> None:
+        self.hasher.advance(rows)
+        self.manifest.rows_processed = self.hasher.rows
+        self.manifest.prefix_hash = self.hasher.hexdigest()
+        self.manifest.last_batch += 1
+        self.db.commit()
+
+    def complete(self) -> None:
+        self.manifest.completed_at = datetime.now()
+        self.db.commit()
+        self.hasher.close()
+
+
+def plan_stage(db, csv_path: str, stage: str, content_hash: str, full: bool = False):
+    """
+    Aşama için checkpoint hazırla.
+    
+    Returns:
+        ImportCheckpoint, ya da dosya değişmediyse ve aşama tamamlandıysa None.
+        
+    Manifest'teki prefix_hash dosyanın ilk rows_processed satırıyla hâlâ
+    eşleşiyorsa (sona satır eklendi ya da import yarıda kaldı) sadece kalan
+    satırlar işlenir; eşleşmiyorsa (dosyada satır düzenlendi) dosya baştan
+    upsert ile işlenir, böylece değişen satırlar da güncellenir.
+    """
+    source = str(Path(csv_path).resolve())
+    manifest = db.query(ImportManifest).filter(
+        ImportManifest.source == source,
+        ImportManifest.stage == stage
+    ).first()
+    
+    if manifest and not full and manifest.content_hash == content_hash and manifest.completed_at:
         return None
-    return float(value)
+    
+    hasher = PrefixHasher(csv_path)
+    upsert = full
+    if manifest is None:
+        manifest = ImportManifest(
+            source=source, stage=stage, rows_processed=0, last_batch=0,
+            prefix_hash=hasher.hexdigest(),
+        )
+        db.add(manifest)
+    elif not full:
+        hasher.advance(manifest.rows_processed)
+        if hasher.rows != manifest.rows_processed or hasher.hexdigest() != manifest.prefix_hash:
+            hasher.close()
+            hasher = PrefixHasher(csv_path)
+            upsert = True
+    
+    manifest.content_hash = content_hash
+    manifest.completed_at = None
+    manifest.rows_processed = hasher.rows
+    manifest.prefix_hash = hasher.hexdigest()
+    db.commit()
+    return ImportCheckpoint(db, manifest, hasher, upsert)
 
 
 def get_session(database_url: str):
     """Database session oluştur."""
     engine = create_engine(database_url, echo=False)
     Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        ensure_elo_source_column(conn)
     Session = sessionmaker(bind=engine)
     return Session()
 
@@ -89,183 +308,463 @@ def import_teams(db, df) -> dict:
     return team_map
 
 
-def import_matches(db, df, div_map: dict, team_map: dict, batch_size: int = 1000):
-    """Maçları import et."""
-    total_rows = len(df)
+# COPY ile staging tablosuna yazılan kolonlar (sıra önemli)
+MATCH_COPY_COLUMNS = [
+    'division_id', 'match_date', 'match_time', 'home_team_id', 'away_team_id',
+    'home_team_elo', 'away_team_elo', 'form3_home', 'form3_away',
+    'form5_home', 'form5_away', 'ft_home', 'ft_away', 'ft_result',
+    'ht_home', 'ht_away', 'ht_result', 'home_shots', 'away_shots',
+    'home_shots_target', 'away_shots_target', 'home_corners', 'away_corners',
+    'home_fouls', 'away_fouls', 'home_yellow', 'away_yellow',
+    'home_red', 'away_red', 'odd_home', 'odd_draw', 'odd_away',
+    'odd_over25', 'odd_under25', 'c_htb', 'c_phb', 'c_vhd', 'c_vad',
+    'c_lth', 'c_lta', 'source',
+]
+
+
+def commit_chunk(db, checkpoint, rows: int) -> None:
+    """Chunk sonunda commit et; checkpoint varsa manifest'i de aynı transaction'da ilerlet."""
+    if checkpoint is not None:
+        checkpoint.commit(rows)
+    else:
+        db.commit()
+
+
+def import_matches(
+    db, df, div_map: dict, team_map: dict, batch_size: int = 1000, checkpoint=None, upsert: bool = None,
+):
+    """
+    Maçları import et.
+    
+    df tek bir DataFrame ya da iter_csv_chunks ile okunan chunk'lar olabilir.
+    upsert=True ise (varsayılan: checkpoint.upsert) mevcut maçların farklı
+    alanları CSV'deki değerlerle güncellenir.
+    """
     print(f"\n📅 Maçlar ekleniyor ({batch_size} satırlık batch'ler)...")
     
+    if upsert is None:
+        upsert = checkpoint is not None and checkpoint.upsert
     matches_added = 0
+    matches_updated = 0
     matches_skipped = 0
+    rows_processed = 0
     
-    for i, row in df.iterrows():
-        match_date = pd.to_datetime(row['MatchDate']).date()
-        home_team_id = team_map[row['HomeTeam']]
-        away_team_id = team_map[row['AwayTeam']]
-        
-        existing = db.query(Match).filter(
-            Match.match_date == match_date,
-            Match.home_team_id == home_team_id,
-            Match.away_team_id == away_team_id
-        ).first()
-        
-        if existing:
-            matches_skipped += 1
-            continue
-        
-        match_time = None
-        if pd.notna(row.get('MatchTime')) and row.get('MatchTime'):
-            try:
-                match_time = pd.to_datetime(row['MatchTime']).time()
-            except:
-                pass
-        
-        ft_result = None
-        if pd.notna(row.get('FTResult')) and row.get('FTResult') in ['H', 'D', 'A']:
-            ft_result = MatchResult(row['FTResult'])
-        
-        ht_result = None
-        if pd.notna(row.get('HTResult')) and row.get('HTResult') in ['H', 'D', 'A']:
-            ht_result = MatchResult(row['HTResult'])
+    for chunk in as_chunks(df):
+        for values in match_records(prepare_matches(chunk, div_map, team_map)):
+            rows_processed += 1
+            existing = db.query(Match).filter(
+                Match.match_date == values['match_date'],
+                Match.home_team_id == values['home_team_id'],
+                Match.away_team_id == values['away_team_id']
+            ).first()
+            
+            if existing:
+                changed = {
+                    key: value for key, value in values.items()
+                    if key != 'source' and getattr(existing, key) != value
+                    and not (key in MATCH_ELO_COLUMNS and value is None)
+                } if upsert else {}
+                if changed:
+                    if values['home_team_elo'] is not None:
+                        existing.elo_source = None
+                    for key, value in changed.items():
+                        setattr(existing, key, value)
+                    matches_updated += 1
+                else:
+                    matches_skipped += 1
+                continue
+            
+            db.add(Match(**values))
+            matches_added += 1
+            
+            if matches_added % batch_size == 0:
+                db.commit()
+                print(f"   📈 İlerleme: {rows_processed:,} satır ({matches_added:,} eklendi, {matches_skipped:,} atlandı)")
         
-        match = Match(
-            division_id=div_map[row['Division']],
-            match_date=match_date,
-            match_time=match_time,
-            home_team_id=home_team_id,
-            away_team_id=away_team_id,
-            home_team_elo=safe_float(row.get('HomeElo')),
-            away_team_elo=safe_float(row.get('AwayElo')),
-            form3_home=safe_int(row.get('Form3Home')),
-            form3_away=safe_int(row.get('Form3Away')),
-            form5_home=safe_int(row.get('Form5Home')),
-            form5_away=safe_int(row.get('Form5Away')),
-            ft_home=safe_int(row.get('FTHome')),
-            ft_away=safe_int(row.get('FTAway')),
-            ft_result=ft_result,
-            ht_home=safe_int(row.get('HTHome')),
-            ht_away=safe_int(row.get('HTAway')),
-            ht_result=ht_result,
-            home_shots=safe_int(row.get('HomeShots')),
-            away_shots=safe_int(row.get('AwayShots')),
-            home_shots_target=safe_int(row.get('HomeTarget')),
-            away_shots_target=safe_int(row.get('AwayTarget')),
-            home_corners=safe_int(row.get('HomeCorners')),
-            away_corners=safe_int(row.get('AwayCorners')),
-            home_fouls=safe_int(row.get('HomeFouls')),
-            away_fouls=safe_int(row.get('AwayFouls')),
-            home_yellow=safe_int(row.get('HomeYellow')),
-            away_yellow=safe_int(row.get('AwayYellow')),
-            home_red=safe_int(row.get('HomeRed')),
-            away_red=safe_int(row.get('AwayRed')),
-            odd_home=safe_float(row.get('OddHome')),
-            odd_draw=safe_float(row.get('OddDraw')),
-            odd_away=safe_float(row.get('OddAway')),
-            odd_over25=safe_float(row.get('Over25')),
-            odd_under25=safe_float(row.get('Under25')),
-            c_htb=safe_float(row.get('C_HTB')),
-            c_phb=safe_float(row.get('C_PHB')),
-            c_vhd=safe_float(row.get('C_VHD')),
-            c_vad=safe_float(row.get('C_VAD')),
-            c_lth=safe_float(row.get('C_LTH')),
-            c_lta=safe_float(row.get('C_LTA')),
-            source='csv'
+        commit_chunk(db, checkpoint, len(chunk))
+    
+    db.commit()
+    print(f"   ✅ Maçlar: {matches_added:,} eklendi, {matches_updated:,} güncellendi, {matches_skipped:,} atlandı")
+    return matches_added, matches_skipped
+
+
+# SQLAlchemy Enum kolonu enum isimlerini saklar (HOME/DRAW/AWAY)
+RESULT_DB_VALUES = {result: result.name for result in MatchResult}
+
+MATCH_KEY_COLUMNS = ['match_date', 'home_team_id', 'away_team_id']
+# Upsert'te güncellenen kolonlar; source ilk yazan kaynağı gösterir, değişmez
+MATCH_UPDATE_COLUMNS = [
+    col for col in MATCH_COPY_COLUMNS if col not in MATCH_KEY_COLUMNS and col != 'source'
+]
+# Boş CSV ELO'su yerel motorun doldurduğu değeri silmez
+MATCH_ELO_COLUMNS = ['home_team_elo', 'away_team_elo']
+
+
+def upsert_value(col: str) -> str:
+    if col in MATCH_ELO_COLUMNS:
+        return f"COALESCE(EXCLUDED.{col}, matches.{col})"
+    return f"EXCLUDED.{col}"
+
+
+def match_conflict_clause(upsert: bool) -> str:
+    """
+    matches_stage -> matches INSERT'inin ON CONFLICT kısmı.
+    
+    upsert=True ise mevcut satır sadece en az bir kolon farklıysa
+    güncellenir (IS DISTINCT FROM); aynı satırlar yazılmaz, updated_at
+    değişmez. CSV'de ELO varsa satır tekrar ClubElo ölçeğine geçer
+    (elo_source NULL).
+    """
+    target = f"ON CONFLICT ({', '.join(MATCH_KEY_COLUMNS)})"
+    if not upsert:
+        return f"{target} DO NOTHING"
+    assignments = ', '.join(f"{col} = {upsert_value(col)}" for col in MATCH_UPDATE_COLUMNS)
+    current = ', '.join(f"matches.{col}" for col in MATCH_UPDATE_COLUMNS)
+    excluded = ', '.join(upsert_value(col) for col in MATCH_UPDATE_COLUMNS)
+    return (
+        f"{target} DO UPDATE SET {assignments}, "
+        f"elo_source = CASE WHEN EXCLUDED.home_team_elo IS NULL THEN matches.elo_source END, "
+        f"updated_at = now() "
+        f"WHERE ({current}) IS DISTINCT FROM ({excluded})"
+    )
+
+
+def count_upserted(result) -> tuple:
+    """RETURNING (xmax = 0) sonucundan (eklenen, güncellenen) sayıları."""
+    inserted = [row[0] for row in result]
+    added = sum(inserted)
+    return added, len(inserted) - added
+
+
+def copy_frame(db, table: str, frame: pd.DataFrame) -> None:
+    """DataFrame'i PostgreSQL COPY ile tabloya aktar (tek round trip). NA -> NULL."""
+    buffer = io.StringIO()
+    frame.to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    
+    raw = db.connection().connection
+    with raw.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(frame.columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
         )
-        db.add(match)
-        matches_added += 1
+
+
+def import_matches_bulk(db, df, div_map: dict, team_map: dict, checkpoint=None, upsert: bool = None):
+    """
+    Maçları COPY + INSERT ... ON CONFLICT ile toplu import et.
+    
+    Her chunk önce geçici bir staging tablosuna COPY ile yazılır, ardından
+    tek bir set-based INSERT ile matches tablosuna aktarılır. Mevcut maçlar
+    uq_matches_natural_key sayesinde veritabanı tarafında atlanır; upsert=True
+    ise (varsayılan: checkpoint.upsert) farklı olanlar güncellenir.
+    Staging tablosu her commit'te boşalır (ON COMMIT DELETE ROWS).
+    """
+    print(f"\n📅 Maçlar toplu ekleniyor (COPY)...")
+    
+    if upsert is None:
+        upsert = checkpoint is not None and checkpoint.upsert
+    ensure_match_unique_constraint(db)
+    column_list = ', '.join(MATCH_COPY_COLUMNS)
+    db.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS matches_stage ON COMMIT DELETE ROWS AS "
+        f"SELECT {column_list} FROM matches WITH NO DATA"
+    ))
+    
+    staged = 0
+    matches_added = 0
+    matches_updated = 0
+    for chunk in as_chunks(df):
+        frame = prepare_matches(chunk, div_map, team_map)[MATCH_COPY_COLUMNS]
+        frame['ft_result'] = frame['ft_result'].map(RESULT_DB_VALUES)
+        frame['ht_result'] = frame['ht_result'].map(RESULT_DB_VALUES)
+        staged += len(frame)
+        if upsert:
+            # DO UPDATE aynı satırı tek komutta iki kez güncelleyemez; son görülen
+            # kazanır, atılan tekrarlar atlandı sayılır
+            frame = frame.drop_duplicates(subset=MATCH_KEY_COLUMNS, keep='last')
+        copy_frame(db, 'matches_stage', frame)
         
-        if matches_added % batch_size == 0:
-            db.commit()
-            progress = ((i + 1) / total_rows) * 100
-            print(f"   📈 İlerleme: {progress:.1f}% ({matches_added:,} eklendi, {matches_skipped:,} atlandı)")
+        result = db.execute(text(
+            f"INSERT INTO matches ({column_list}) "
+            f"SELECT {column_list} FROM matches_stage "
+            f"{match_conflict_clause(upsert)} RETURNING (xmax = 0)"
+        ))
+        added, updated = count_upserted(result)
+        matches_added += added
+        matches_updated += updated
+        commit_chunk(db, checkpoint, len(chunk))
+        print(f"   📈 İlerleme: {staged:,} satır ({matches_added:,} eklendi, {matches_updated:,} güncellendi)")
     
     db.commit()
-    print(f"   ✅ Maçlar: {matches_added:,} eklendi, {matches_skipped:,} atlandı")
+    matches_skipped = staged - matches_added - matches_updated
+    print(f"   ✅ Maçlar: {matches_added:,} eklendi, {matches_updated:,} güncellendi, {matches_skipped:,} atlandı")
     return matches_added, matches_skipped
 
 
-def import_elo_history(db, df, team_map: dict, batch_size: int = 5000):
-    """ELO history verilerini import et."""
-    total_rows = len(df)
-    print(f"\n📈 ELO History oluşturuluyor...")
+def import_elo_history(db, df, team_map: dict, checkpoint=None, upsert: bool = None):
+    """
+    ELO history verilerini set-based olarak import et.
     
-    # ELO kayıtlarını topla (set ile duplicate önle)
-    elo_records = set()
+    Her chunk'ın kayıtları COPY ile staging tablosuna yazılır, mevcut
+    kayıtlar elo_history ile tek bir anti-join (NOT EXISTS) ile elenir ve
+    kalanlar tek INSERT ile eklenir (source='clubelo').
+    uq_elo_history_team_date_source paralel worker'lar arasındaki
+    yarışlara karşı ON CONFLICT ile korur. upsert=True ise (varsayılan:
+    checkpoint.upsert) anti-join yapılmaz, değeri farklı kayıtlar güncellenir.
     
-    for i, row in df.iterrows():
-        match_date = pd.to_datetime(row['MatchDate']).date()
-        
-        # Home team ELO
-        home_team = row['HomeTeam']
-        home_elo = row.get('HomeElo')
-        if home_team in team_map and pd.notna(home_elo):
-            elo_records.add((team_map[home_team], match_date, float(home_elo)))
-        
-        # Away team ELO
-        away_team = row['AwayTeam']
-        away_elo = row.get('AwayElo')
-        if away_team in team_map and pd.notna(away_elo):
-            elo_records.add((team_map[away_team], match_date, float(away_elo)))
-        
-        if (i + 1) % 50000 == 0:
-            print(f"   📊 {i + 1:,}/{total_rows:,} maç işlendi...")
+    df tek bir DataFrame ya da iter_csv_chunks ile okunan chunk'lar olabilir.
+    """
+    print(f"\n📈 ELO History oluşturuluyor...")
     
-    print(f"   📊 {len(elo_records):,} benzersiz ELO kaydı bulundu")
+    if upsert is None:
+        upsert = checkpoint is not None and checkpoint.upsert
+    if upsert:
+        statement = (
+            "INSERT INTO elo_history (team_id, date, elo) "
+            "SELECT s.team_id, s.date, s.elo FROM elo_stage s "
+            "ON CONFLICT (team_id, date, source) DO UPDATE SET elo = EXCLUDED.elo, updated_at = now() "
+            "WHERE elo_history.elo IS DISTINCT FROM EXCLUDED.elo "
+            "RETURNING (xmax = 0)"
+        )
+    else:
+        statement = (
+            "INSERT INTO elo_history (team_id, date, elo) "
+            "SELECT s.team_id, s.date, s.elo FROM elo_stage s "
+            "WHERE NOT EXISTS ("
+            "    SELECT 1 FROM elo_history e "
+            "    WHERE e.team_id = s.team_id AND e.date = s.date AND e.source = 'clubelo'"
+            ") "
+            "ON CONFLICT (team_id, date, source) DO NOTHING "
+            "RETURNING (xmax = 0)"
+        )
+    ensure_elo_unique_constraint(db)
+    db.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS elo_stage ON COMMIT DELETE ROWS AS "
+        "SELECT team_id, date, elo FROM elo_history WITH NO DATA"
+    ))
     
-    # Database'e ekle
     added = 0
+    updated = 0
     skipped = 0
-    records_list = list(elo_records)
+    rows_processed = 0
     
-    for i, (team_id, date, elo) in enumerate(records_list):
-        existing = db.query(EloHistory).filter(
-            EloHistory.team_id == team_id,
-            EloHistory.date == date
-        ).first()
-        
-        if existing:
-            skipped += 1
-            continue
+    for chunk in as_chunks(df):
+        records = prepare_elo_records(chunk, team_map)
+        if not records.empty:
+            copy_frame(db, 'elo_stage', records)
+            chunk_added, chunk_updated = count_upserted(db.execute(text(statement)))
+            added += chunk_added
+            updated += chunk_updated
+            skipped += len(records) - chunk_added - chunk_updated
         
-        db.add(EloHistory(team_id=team_id, date=date, elo=elo))
-        added += 1
-        
-        if added % batch_size == 0:
-            db.commit()
-            progress = ((i + 1) / len(records_list)) * 100
-            print(f"   📈 İlerleme: {progress:.1f}% ({added:,} eklendi, {skipped:,} atlandı)")
+        commit_chunk(db, checkpoint, len(chunk))
+        rows_processed += len(chunk)
+        print(f"   📈 İlerleme: {rows_processed:,} maç işlendi ({added:,} eklendi, {skipped:,} atlandı)")
     
     db.commit()
-    print(f"   ✅ ELO History: {added:,} eklendi, {skipped:,} atlandı")
+    print(f"   ✅ ELO History: {added:,} eklendi, {updated:,} güncellendi, {skipped:,} atlandı")
     return added, skipped
 
 
-def run_import(csv_path: str, database_url: str, only: str = None):
+ELO_COLUMNS = ['MatchDate', 'HomeTeam', 'AwayTeam', 'HomeElo', 'AwayElo']
+
+
+def partition_csv(csv_path: str, out_dir: str, chunksize: int = DEFAULT_CHUNK_SIZE, skip_rows: int = 0) -> dict:
+    """
+    CSV'yi tek geçişte Division koduna göre ayrı dosyalara böl.
+    
+    Returns:
+        {division_code: (partition dosya yolu, satır sayısı)}
+    """
+    partitions = {}
+    for chunk in iter_csv_chunks(csv_path, chunksize, skip_rows=skip_rows):
+        for code, group in chunk.groupby('Division', sort=False):
+            path, rows = partitions.get(code, (os.path.join(out_dir, f"{code}.csv"), 0))
+            group.to_csv(path, mode='a', header=rows == 0, index=False)
+            partitions[code] = (path, rows + len(group))
+    return partitions
+
+
+def import_partition(
+    database_url: str,
+    partition_path: str,
+    division: str,
+    stages: list,
+    div_map: dict,
+    team_map: dict,
+    bulk: bool = False,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    upsert_stages: tuple = (),
+) -> dict:
+    """
+    Tek bir Division partition'ını kendi bağlantısıyla import et (worker process).
+    
+    Aşama fonksiyonlarının çıktısı bastırılır; ilerleme ana process'te
+    birleştirilerek raporlanır. upsert_stages'teki aşamalar mevcut kayıtları
+    günceller (bkz. ImportCheckpoint.upsert).
+    """
+    result = {'division': division, 'matches': (0, 0), 'elo': (0, 0)}
+    db = get_session(database_url)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if 'matches' in stages:
+                chunks = iter_csv_chunks(partition_path, chunksize)
+                upsert = 'matches' in upsert_stages
+                if bulk:
+                    result['matches'] = import_matches_bulk(db, chunks, div_map, team_map, upsert=upsert)
+                else:
+                    result['matches'] = import_matches(db, chunks, div_map, team_map, upsert=upsert)
+            if 'elo' in stages:
+                chunks = iter_csv_chunks(partition_path, chunksize, ELO_COLUMNS)
+                result['elo'] = import_elo_history(
+                    db, chunks, team_map, upsert='elo' in upsert_stages,
+                )
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        db.get_bind().dispose()
+    return result
+
+
+def import_parallel(
+    db,
+    csv_path: str,
+    database_url: str,
+    checkpoints: dict,
+    div_map: dict,
+    team_map: dict,
+    workers: int,
+    bulk: bool = False,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    """
+    Maç ve ELO aşamalarını Division partition'larına bölüp process pool'da çalıştır.
+    
+    Division ve takımlar önceden ana process'te çözülmüş olmalıdır. Her worker
+    kendi bağlantısını açar; sonuçlar Division koduna göre sıralı birleştirilir.
+    Paralel modda manifest batch bazında değil, tüm partition'lar başarıyla
+    bittiğinde ilerletilir; yarıda kalan paralel import tekrar çalıştırıldığında
+    aynı satırları (idempotent olarak) yeniden işler.
+    """
+    stages = list(checkpoints)
+    upsert_stages = tuple(stage for stage, cp in checkpoints.items() if cp.upsert)
+    start_row = min(cp.start_row for cp in checkpoints.values())
+    if 'matches' in stages and bulk:
+        ensure_match_unique_constraint(db)
+    if 'elo' in stages:
+        ensure_elo_unique_constraint(db)
+    db.commit()
+    
+    with tempfile.TemporaryDirectory(prefix="predictax_import_") as tmp_dir:
+        print(f"\n🧩 CSV Division'lara bölünüyor...")
+        partitions = partition_csv(csv_path, tmp_dir, chunksize, start_row)
+        total_rows = sum(rows for _, rows in partitions.values())
+        print(f"   ✅ {len(partitions)} partition, {total_rows:,} satır")
+        
+        print(f"\n⚙️  {workers} worker ile import ediliyor ({', '.join(stages)})...")
+        results = {}
+        done_rows = 0
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = {
+                executor.submit(
+                    import_partition, database_url, path, code, stages,
+                    div_map, team_map, bulk, chunksize, upsert_stages,
+                ): (code, rows)
+                for code, (path, rows) in sorted(partitions.items())
+            }
+            for future in as_completed(futures):
+                code, rows = futures[future]
+                results[code] = future.result()
+                done_rows += rows
+                progress = (done_rows / total_rows) * 100 if total_rows else 100.0
+                print(f"   📈 İlerleme: {progress:.1f}% ({code}: {rows:,} satır tamamlandı)")
+    
+    totals = {stage: [0, 0] for stage in ('matches', 'elo')}
+    for code in sorted(results):
+        for stage in totals:
+            added, skipped = results[code][stage]
+            totals[stage][0] += added
+            totals[stage][1] += skipped
+    
+    if 'matches' in stages:
+        print(f"   ✅ Maçlar: {totals['matches'][0]:,} eklendi, {totals['matches'][1]:,} atlandı")
+    if 'elo' in stages:
+        print(f"   ✅ ELO History: {totals['elo'][0]:,} eklendi, {totals['elo'][1]:,} atlandı")
+    
+    for checkpoint in checkpoints.values():
+        checkpoint.commit(start_row + total_rows - checkpoint.start_row)
+        checkpoint.complete()
+    return {code: results[code] for code in sorted(results)}
+
+
+def run_import(
+    csv_path: str,
+    database_url: str,
+    only: str = None,
+    bulk: bool = False,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    full: bool = False,
+    workers: int = 1,
+):
     """
     Ana import fonksiyonu.
     
+    CSV hiçbir zaman tamamen belleğe alınmaz; her aşama dosyayı
+    chunksize satırlık parçalar halinde stream eder.
+    
+    matches ve elo aşamaları ImportManifest ile checkpoint'lenir: dosya
+    değişmediyse aşama atlanır, sona satır eklendiyse sadece yeni satırlar,
+    yarıda kalan bir import'ta ise son commit edilen batch'ten sonrası işlenir.
+    
     Args:
         csv_path: CSV dosyasının yolu
         database_url: PostgreSQL bağlantı URL'si
         only: Sadece belirli bir kısmı import et (teams, matches, elo, None=hepsi)
+        bulk: Maçları COPY + ON CONFLICT ile toplu import et
+        chunksize: Bir seferde okunacak CSV satırı sayısı (= checkpoint batch'i)
+        full: Manifest'i yok say, dosyayı baştan işle ve mevcut kayıtları güncelle
+        workers: 1'den büyükse maç ve ELO aşamaları Division bazında paralel çalışır
     """
     print("=" * 60)
     print("🚀 PredictaX Dataset Import")
     print("=" * 60)
     
-    print(f"\n📂 CSV okunuyor: {csv_path}")
-    df = pd.read_csv(csv_path, low_memory=False)
-    total_rows = len(df)
-    print(f"📊 Toplam {total_rows:,} satır bulundu")
-    
     print(f"\n🔗 Database'e bağlanılıyor...")
     db = get_session(database_url)
     print(f"   ✅ Bağlantı başarılı")
     
+    checkpoints = {}
     try:
+        print(f"\n📂 CSV kontrol ediliyor: {csv_path}")
+        content_hash = file_sha256(csv_path)
+        for stage in ('matches', 'elo'):
+            if only in [None, stage]:
+                checkpoint = plan_stage(db, csv_path, stage, content_hash, full)
+                if checkpoint is None:
+                    print(f"   ⏭️  {stage}: dosya değişmemiş, atlanıyor")
+                else:
+                    if checkpoint.upsert:
+                        print(f"   🔁 {stage}: dosya değişmiş, baştan upsert ile işlenecek")
+                    else:
+                        print(f"   📌 {stage}: {checkpoint.start_row:,}. satırdan devam ediliyor")
+                    checkpoints[stage] = checkpoint
+        
+        if only != 'teams' and not checkpoints:
+            print("\n✅ Yeni satır yok, import gerekmiyor.")
+            return
+        
+        start_row = min((cp.start_row for cp in checkpoints.values()), default=0)
+        keys, total_rows = collect_keys(csv_path, chunksize, start_row)
+        print(f"📊 Toplam {total_rows:,} yeni satır bulundu")
+        
         # Division ve Team her zaman gerekli (mapping için)
         if only in [None, 'teams', 'matches']:
-            div_map = import_divisions(db, df)
-            team_map = import_teams(db, df)
+            div_map = import_divisions(db, keys)
+            team_map = import_teams(db, keys)
         else:
             # Sadece elo için mevcut team'leri yükle
             print("\n⚽ Mevcut takımlar yükleniyor...")
@@ -274,13 +773,29 @@ def run_import(csv_path: str, database_url: str, only: str = None):
             print(f"   ✅ {len(team_map)} takım yüklendi")
             div_map = {}
         
+        if workers > 1 and checkpoints:
+            import_parallel(
+                db, csv_path, database_url, checkpoints, div_map, team_map,
+                workers, bulk=bulk, chunksize=chunksize,
+            )
+            checkpoints = {}
+        
         # Matches
-        if only in [None, 'matches']:
-            import_matches(db, df, div_map, team_map)
+        checkpoint = checkpoints.get('matches')
+        if checkpoint:
+            chunks = iter_csv_chunks(csv_path, chunksize, skip_rows=checkpoint.start_row)
+            if bulk:
+                import_matches_bulk(db, chunks, div_map, team_map, checkpoint=checkpoint)
+            else:
+                import_matches(db, chunks, div_map, team_map, checkpoint=checkpoint)
+            checkpoint.complete()
         
         # ELO History
-        if only in [None, 'elo']:
-            import_elo_history(db, df, team_map)
+        checkpoint = checkpoints.get('elo')
+        if checkpoint:
+            chunks = iter_csv_chunks(csv_path, chunksize, ELO_COLUMNS, checkpoint.start_row)
+            import_elo_history(db, chunks, team_map, checkpoint=checkpoint)
+            checkpoint.complete()
         
         print("\n" + "=" * 60)
         print("✅ IMPORT TAMAMLANDI!")
@@ -291,6 +806,8 @@ def run_import(csv_path: str, database_url: str, only: str = None):
         print(f"\n❌ HATA: {e}")
         raise
     finally:
+        for checkpoint in checkpoints.values():
+            checkpoint.hasher.close()
         db.close()
 
 
@@ -308,6 +825,12 @@ if __name__ == "__main__":
   
   # Sadece ELO history import et
   python -m app.scripts.import_dataset --db "..." --only elo
+  
+  # Maçları COPY ile toplu import et
+  python -m app.scripts.import_dataset --db "..." --bulk
+  
+  # Division bazında 8 process ile paralel import et
+  python -m app.scripts.import_dataset --db "..." --bulk --workers 8
         """
     )
     parser.add_argument(
@@ -328,6 +851,28 @@ if __name__ == "__main__":
         default=None,
         help="Sadece belirli bir kısmı import et"
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Maçları COPY + INSERT ... ON CONFLICT ile toplu import et (PostgreSQL)"
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Bir seferde okunacak CSV satırı (varsayılan: {DEFAULT_CHUNK_SIZE})"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Manifest'i yok say, dosyayı baştan işle (mevcut kayıtlar güncellenir)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Paralel worker process sayısı (Division başına bir partition, varsayılan: 1)"
+    )
     args = parser.parse_args()
     
     # Database URL
@@ -349,4 +894,12 @@ if __name__ == "__main__":
         print(f"❌ CSV dosyası bulunamadı: {csv_path}")
         exit(1)
     
-    run_import(str(csv_path), db_url, args.only)
+    run_import(
+        str(csv_path),
+        db_url,
+        args.only,
+        bulk=args.bulk,
+        chunksize=args.chunksize,
+        full=args.full,
+        workers=args.workers,
+    )
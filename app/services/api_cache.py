@@ -0,0 +1,251 @@
+"""
+API-Football yanıt cache'i.
+
+Anahtar (endpoint, parametreler). Sınırlı LRU; her kaydın iki süresi var:
+- fresh: bu süre içinde yanıt doğrudan cache'ten döner
+- stale: fresh bittikten sonra bir TTL daha eski yanıt hemen döner ve
+  arka planda yenilenir (stale-while-revalidate); yenileme başarısız
+  olursa eski yanıt stale süresi dolana kadar kullanılmaya devam eder
+
+TTL yanıtın içeriğine göre seçilir (ResponseTtlPolicy): bitmiş maçlar
+uzun, canlı maçlar kısa, oynanmamış maçlar orta süre. Hata içeren
+yanıtlar (api-sports 200 ile "errors" döndürebilir) cache'lenmez.
+
+Single-flight: aynı anahtar için eşzamanlı miss'lerde upstream'e tek
+istek gider, diğerleri aynı sonucu bekler.
+
+store (app.services.api_store.ResponseStore) verilirse ikinci katman
+olarak kullanılır: miss'te önce depoya bakılır (başka bir worker aynı
+yanıtı çekmiş olabilir), upstream yanıtları depoya da yazılır ve warm()
+açılışta depodaki geçerli kayıtları belleğe yükler.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from app.services.api_store import ResponseStore
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATUSES = {"1H", "HT", "2H", "ET", "BT", "P", "SUSP", "INT", "LIVE"}
+FINISHED_STATUSES = {"FT", "AET", "PEN", "AWD", "WO", "CANC", "ABD"}
+
+
+def cache_key(path: str, params: dict | None) -> tuple:
+    return path, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+
+
+class ResponseTtlPolicy:
+    """
+    Yanıta göre TTL.
+
+    fixtures yanıtlarında görülen bitmiş maçlar hatırlanır; bu maçların
+    fixtures/statistics yanıtları da uzun TTL alır.
+    """
+
+    def __init__(self, finished: float = 86_400, live: float = 15, default: float = 300):
+        self.finished_ttl = finished
+        self.live_ttl = live
+        self.default_ttl = default
+        self.finished_ids: set[int] = set()
+
+    def observe(self, payload: dict) -> list[str]:
+        """Yanıttaki maç durumlarını döndür, bitmiş maçları hatırla."""
+        statuses = []
+        for item in payload.get("response") or []:
+            fixture = item.get("fixture") if isinstance(item, dict) else None
+            if not fixture:
+                continue
+            status = (fixture.get("status") or {}).get("short")
+            statuses.append(status)
+            if status in FINISHED_STATUSES:
+                self.finished_ids.add(fixture["id"])
+        return statuses
+
+    def ttl(self, path: str, params: dict | None, payload: dict) -> float:
+        if payload.get("errors"):
+            return 0.0
+
+        if path.rstrip("/").endswith("fixtures/statistics"):
+            fixture_id = int((params or {}).get("fixture", 0))
+            if fixture_id in self.finished_ids and payload.get("response"):
+                return self.finished_ttl
+            return self.default_ttl
+
+        statuses = self.observe(payload)
+        if not statuses:
+            return self.default_ttl
+        if any(status in LIVE_STATUSES for status in statuses):
+            return self.live_ttl
+        if all(status in FINISHED_STATUSES for status in statuses):
+            return self.finished_ttl
+        return self.default_ttl
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        policy: ResponseTtlPolicy | None = None,
+        store: ResponseStore | None = None,
+    ):
+        self.max_entries = max_entries
+        self.policy = policy or ResponseTtlPolicy()
+        self.store = store
+        # key -> (fresh_until, stale_until, payload)
+        self._entries: OrderedDict[tuple, tuple[float, float, dict]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._refreshes: set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refresh_failures = 0
+        self.evictions = 0
+        self.store_hits = 0
+        self.store_errors = 0
+        self.warmed = 0
+
+    def put(self, key: tuple, payload: dict, ttl: float, age: float = 0.0) -> None:
+        """age: yanıtın yaşı (depodan gelen kayıtlar için), kalan süreden düşülür."""
+        if ttl <= 0 or age >= 2 * ttl:
+            return
+        now = time.monotonic() - age
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (now + ttl, now + 2 * ttl, payload)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _load(self, key: tuple, path: str, params: dict | None, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Single-flight upstream çağrısı; sonuç cache'e yazılır.
+
+        Çağrı isteklerden bağımsız bir task içinde yürür: ilk isteğin iptal
+        edilmesi aynı anahtarı bekleyenleri iptal etmez.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        task = asyncio.create_task(self._fetch(key, path, params, fetch))
+        # Bekleyen kalmadıysa "exception never retrieved" uyarısını önle
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: tuple, path: str, params: dict | None, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        try:
+            stored = await self._from_store(path, params)
+            if stored is not None:
+                self.store_hits += 1
+                self.put(key, stored.payload, stored.ttl, stored.age)
+                return stored.payload
+            payload = await fetch()
+            ttl = self.policy.ttl(path, params, payload)
+            self.put(key, payload, ttl)
+            # Depoya yazma bekleyenleri geciktirmesin
+            self._background(self._to_store(path, params, payload, ttl))
+            return payload
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _from_store(self, path: str, params: dict | None):
+        """Depodaki kayıt hâlâ tazeyse döndür."""
+        if self.store is None:
+            return None
+        try:
+            stored = await asyncio.to_thread(self.store.load, path, params)
+        except Exception:
+            self.store_errors += 1
+            logger.exception("API-Football deposu okunamadı")
+            return None
+        if stored is None or stored.age >= stored.ttl:
+            return None
+        return stored
+
+    async def _to_store(self, path: str, params: dict | None, payload: dict, ttl: float) -> None:
+        if self.store is None or ttl <= 0:
+            return
+        try:
+            await asyncio.to_thread(self.store.save, path, params, payload, ttl)
+        except Exception:
+            self.store_errors += 1
+            logger.exception("API-Football deposuna yazılamadı")
+
+    async def warm(self) -> int:
+        """Depodaki geçerli kayıtları belleğe yükle (en yenisi en son kullanılmış sayılır)."""
+        if self.store is None:
+            return 0
+        rows = await asyncio.to_thread(self.store.recent, self.max_entries)
+        for row in reversed(rows):
+            if not row.path.rstrip("/").endswith("fixtures/statistics"):
+                self.policy.observe(row.payload)
+            self.put(cache_key(row.path, row.params), row.payload, row.ttl, row.age)
+        self.warmed = len(rows)
+        return len(rows)
+
+    async def _refresh(self, key: tuple, path: str, params: dict | None, fetch) -> None:
+        try:
+            await self._load(key, path, params, fetch)
+        except Exception:
+            self.refresh_failures += 1
+            logger.warning(f"API-Football cache yenilemesi başarısız: {path} {params}")
+
+    def _background(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def get_or_fetch(self, path: str, params: dict | None, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        key = cache_key(path, params)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            fresh_until, stale_until, payload = entry
+            if now < fresh_until:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return payload
+            if now < stale_until:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    self._background(self._refresh(key, path, params, fetch))
+                return payload
+            del self._entries[key]
+
+        if key not in self._inflight:
+            self.misses += 1
+        return await self._load(key, path, params, fetch)
+
+    async def close(self) -> None:
+        tasks = list(self._refreshes) + list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshes.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "refresh_failures": self.refresh_failures,
+            "evictions": self.evictions,
+            "finished_fixtures_known": len(self.policy.finished_ids),
+            "store": self.store is not None,
+            "store_hits": self.store_hits,
+            "store_errors": self.store_errors,
+            "warmed": self.warmed,
+        }
@@ -0,0 +1,262 @@
+"""
+API-Football (api-sports.io) istemcisi.
+
+Süreç başına TEK bir httpx.AsyncClient kullanılır: bağlantılar keep-alive
+ile havuzda tutulur, her istek yeni TCP/TLS bağlantısı açmaz ve event loop
+bloklanmaz. h2 paketi kuruluysa HTTP/2 açılır (tek bağlantı üzerinde
+çoklu istek), değilse HTTP/1.1 havuzu kullanılır.
+
+Bağlantı hataları, zaman aşımı, 429 ve 5xx yanıtları üstel geri çekilme
+(jitter'lı) ile max_retries kez yeniden denenir; 429'da Retry-After
+başlığına uyulur. Sonunda başarısız olan istekler UpstreamServiceError
+(502) olarak yükselir. Zamanlayıcı varsa yeniden denemeleri o yapar
+(her deneme bucket'tan token alır); istemci tek deneme gönderir (send_once).
+
+Verilirse yanıtlar ResponseCache üzerinden okunur (app.services.api_cache).
+scheduler (app.services.api_scheduler) verilirse tüm upstream istekleri
+kota-farkında kuyruktan, öncelik şeritleriyle gönderilir.
+
+replay=True iken ağa hiç çıkılmaz; yanıtlar kalıcı depodan
+(app.services.api_store) süresine bakılmadan döndürülür. Replay dışında
+depodaki süresi tamamen dolmuş kayıtlar (pin() ile sabitlenenler hariç)
+prune_interval'da bir silinir.
+
+İstemci main.py lifespan'da start() ile açılır, stop() ile kapatılır.
+Çevrimdışı geliştirme için base_url app.scripts.api_football_stub'a
+yönlendirilebilir.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+
+import httpx
+
+from app.core.exceptions import UpstreamServiceError
+from app.services.api_cache import ResponseCache
+from app.services.api_scheduler import RETRY_STATUSES, Priority, RequestScheduler, retry_after
+from app.services.api_store import ResponseStore
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class ApiFootballClient:
+    def __init__(
+        self,
+        base_url: str = "https://v3.football.api-sports.io",
+        api_key: str = "",
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.cache: ResponseCache | None = None
+        self.store: ResponseStore | None = None
+        self.scheduler: RequestScheduler | None = None
+        self.replay = False
+        self.pruned = 0
+        self._client: httpx.AsyncClient | None = None
+        self._prune_task: asyncio.Task | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("API-Football istemcisi başlatılmadı")
+        return self._client
+
+    def start(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        timeout: float | None = None,
+        max_connections: int | None = None,
+        max_retries: int | None = None,
+        cache: ResponseCache | None = None,
+        store: ResponseStore | None = None,
+        scheduler: RequestScheduler | None = None,
+        replay: bool = False,
+        prune_interval: float = 0,
+    ) -> None:
+        if base_url is not None:
+            self.base_url = base_url
+        if api_key is not None:
+            self.api_key = api_key
+        if timeout is not None:
+            self.timeout = timeout
+        if max_connections is not None:
+            self.max_connections = max_connections
+        if max_retries is not None:
+            self.max_retries = max_retries
+        self.cache = cache
+        self.store = store
+        self.replay = replay
+        if replay and store is None:
+            raise ValueError("Replay modu için yanıt deposu gerekli")
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"x-apisports-key": self.api_key},
+            timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=30.0,
+            ),
+            http2=HTTP2_AVAILABLE,
+        )
+        self.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.start(self.send_once, max_retries=self.max_retries, backoff=self.backoff)
+        if store is not None and not replay and prune_interval > 0:
+            self._prune_task = asyncio.create_task(self._prune_loop(prune_interval))
+
+    async def _prune_loop(self, interval: float) -> None:
+        """Depodan süresi tamamen dolmuş kayıtları periyodik olarak sil."""
+        while True:
+            try:
+                self.pruned += await asyncio.to_thread(self.store.prune)
+            except Exception:
+                logger.exception("API-Football yanıt deposu temizlenemedi")
+            await asyncio.sleep(interval)
+
+    async def warm(self) -> int:
+        """Bellekteki cache'i kalıcı depodan doldur."""
+        if self.cache is None:
+            return 0
+        return await self.cache.warm()
+
+    async def stop(self) -> None:
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+            try:
+                await self._prune_task
+            except asyncio.CancelledError:
+                pass
+            self._prune_task = None
+        if self.scheduler is not None:
+            await self.scheduler.stop()
+        if self.cache is not None:
+            await self.cache.close()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _delay(self, attempt: int, response: httpx.Response | None) -> float:
+        delay = retry_after(response)
+        if delay is not None:
+            return delay
+        return self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+    async def send_once(self, path: str, params: dict | None = None) -> httpx.Response:
+        """
+        Tek deneme (zamanlayıcı için). Yeniden denenebilir yanıtlar
+        (RETRY_STATUSES) döndürülür, bağlantı hataları yükselir.
+
+        Raises:
+            UpstreamServiceError: yeniden denenemez hata yanıtı
+            httpx.TransportError: bağlantı hatası / zaman aşımı
+        """
+        self.requests += 1
+        response = await self.client.get(path, params=params)
+        if response.is_error and response.status_code not in RETRY_STATUSES:
+            self.failures += 1
+            raise UpstreamServiceError(f"API-Football {response.status_code}", detail=response.text[:500])
+        return response
+
+    async def request(self, path: str, params: dict | None = None) -> httpx.Response:
+        """
+        GET isteği (yeniden denemeli).
+
+        Raises:
+            UpstreamServiceError: tüm denemeler başarısız
+        """
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            response = None
+            try:
+                response = await self.client.get(path, params=params)
+            except httpx.TransportError as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    if response.is_error:
+                        self.failures += 1
+                        raise UpstreamServiceError(
+                            f"API-Football {response.status_code}", detail=response.text[:500]
+                        )
+                    return response
+                error = f"HTTP {response.status_code}"
+
+            if attempt == self.max_retries:
+                break
+            self.retries += 1
+            delay = self._delay(attempt, response)
+            logger.warning(f"API-Football {path} başarısız ({error}), {delay:.1f} sn sonra tekrar")
+            await asyncio.sleep(delay)
+
+        self.failures += 1
+        raise UpstreamServiceError(f"API-Football {path} yanıt vermedi", detail=error)
+
+    async def fetch(
+        self, path: str, params: dict | None = None, priority: Priority = Priority.INTERACTIVE
+    ) -> dict:
+        """Cache'i atlayarak upstream'den (replay modunda depodan) oku."""
+        if self.replay:
+            stored = await asyncio.to_thread(self.store.load, path, params)
+            if stored is None:
+                raise UpstreamServiceError(
+                    "API-Football replay: kayıtlı yanıt yok", detail={"path": path, "params": params}
+                )
+            return stored.payload
+        if self.scheduler is not None:
+            return await self.scheduler.submit(path, params, priority)
+        response = await self.request(path, params)
+        return response.json()
+
+    async def get(
+        self, path: str, params: dict | None = None, priority: Priority = Priority.INTERACTIVE
+    ) -> dict:
+        if self.cache is None:
+            return await self.fetch(path, params, priority)
+        return await self.cache.get_or_fetch(path, params, lambda: self.fetch(path, params, priority))
+
+    async def fixtures(self, priority: Priority = Priority.INTERACTIVE, **params) -> dict:
+        return await self.get("/fixtures", params, priority)
+
+    async def fixture(self, fixture_id: int, priority: Priority = Priority.INTERACTIVE) -> dict:
+        """Tekil maç; zamanlayıcı eşzamanlı tekil istekleri fixtures?ids= ile birleştirir."""
+        return await self.get("/fixtures", {"id": fixture_id}, priority)
+
+    async def fixture_statistics(self, fixture_id: int, priority: Priority = Priority.LIVE) -> dict:
+        return await self.get("/fixtures/statistics", {"fixture": fixture_id}, priority)
+
+    async def players(self, priority: Priority = Priority.INTERACTIVE, **params) -> dict:
+        return await self.get("/players", params, priority)
+
+    def metrics(self) -> dict:
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "replay": self.replay,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "store_pruned": self.pruned,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "scheduler": self.scheduler.metrics() if self.scheduler is not None else None,
+        }
+
+
+# Süreç başına tek istemci (main.py lifespan'da başlatılır)
+api_football = ApiFootballClient()
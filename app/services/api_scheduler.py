@@ -0,0 +1,453 @@
+"""
+API-Football istek zamanlayıcısı.
+
+Tüm upstream istekleri tek bir kuyruktan, plan limitlerine göre
+ayarlanmış bir token bucket ile gönderilir. Bucket süreç başınadır;
+birden fazla uvicorn worker'ında plan limiti worker sayısına bölünür
+(API_FOOTBALL_WORKERS):
+
+- Öncelik şeritleri: LIVE (canlı maç istatistikleri) > INTERACTIVE
+  (kullanıcı istekleri) > BACKFILL (toplu fikstür çekme). Token boşalınca
+  her zaman en yüksek öncelikli bekleyen istek gönderilir.
+- Deadline: her istek şeridinin süresi kadar bekleyebilir; süresi dolan
+  istek upstream'e hiç gitmeden UpstreamRateLimitedError (503) ile düşer.
+- Günlük kota: yanıt başlıklarından okunan kalan günlük istek sayısı
+  daily_reserve'in altına inerse BACKFILL istekleri reddedilir, kalan
+  kota canlı ve kullanıcı isteklerine bırakılır. Dakikalık kalan 0 ise
+  bucket bir sonraki dakikaya kadar durdurulur.
+- Birleştirme: kuyrukta bekleyen tekil fixtures?id=X istekleri tek bir
+  fixtures?ids=X-Y-Z çağrısında (en fazla MAX_MERGED_IDS) gönderilir,
+  yanıt maç bazında bölünüp her isteğe kendi zarfıyla döndürülür.
+- Yeniden deneme: send tek deneme yapar. Bağlantı hatası, 429 ve 5xx'te
+  iş geri çekilme süresi sonunda kuyruğa geri konur ve tekrar token
+  harcar; 429'da Retry-After kadar bucket durdurulur. max_retries
+  aşılınca UpstreamServiceError (502) ile düşer.
+- api-sports limit aşımını çoğu zaman HTTP 200 ve gövdede
+  errors.rateLimit / errors.requests ile bildirir; bu yanıtlar da 429
+  gibi ele alınır (dakikalık limitte bucket dakika sonuna, günlük limitte
+  bir dakika durdurulur ve günlük kalan 0 sayılır) ve yanıt cache'e
+  düşmez.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from enum import IntEnum
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.core.exceptions import UpstreamRateLimitedError, UpstreamServiceError
+
+logger = logging.getLogger(__name__)
+
+MAX_MERGED_IDS = 20
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# HTTP 200 gövdesindeki limit hataları: errors.rateLimit (dakikalık), errors.requests (günlük)
+THROTTLE_ERRORS = ("rateLimit", "requests")
+
+
+class Priority(IntEnum):
+    LIVE = 0
+    INTERACTIVE = 1
+    BACKFILL = 2
+
+
+# Şerit -> kuyrukta en fazla bekleme (sn)
+DEFAULT_DEADLINES = {
+    Priority.LIVE: 5.0,
+    Priority.INTERACTIVE: 15.0,
+    Priority.BACKFILL: 600.0,
+}
+
+
+def retry_after(response: httpx.Response | None) -> float | None:
+    """429 yanıtındaki Retry-After (sn)."""
+    if response is not None and response.status_code == 429:
+        value = response.headers.get("Retry-After")
+        if value and value.isdigit():
+            return float(value)
+    return None
+
+
+def throttle_error(payload) -> str | None:
+    """Gövdedeki limit hatasının adı (THROTTLE_ERRORS), yoksa None."""
+    errors = payload.get("errors") if isinstance(payload, dict) else None
+    if isinstance(errors, dict):
+        for name in THROTTLE_ERRORS:
+            if errors.get(name):
+                return name
+    return None
+
+
+class TokenBucket:
+    """rate_per_minute hızında dolan, en fazla burst token tutan kova."""
+
+    def __init__(self, rate_per_minute: float, burst: int = 10):
+        self.rate = rate_per_minute / 60
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Bir token için beklenmesi gereken süre (0: hemen)."""
+        self._refill()
+        blocked = max(0.0, self.blocked_until - time.monotonic())
+        missing = max(0.0, 1.0 - self.tokens) / self.rate
+        return max(blocked, missing)
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def block(self, seconds: float) -> None:
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class Quota:
+    """Yanıt başlıklarından okunan api-sports kotası."""
+
+    def __init__(self):
+        self.daily_limit: int | None = None
+        self.daily_remaining: int | None = None
+        self.minute_limit: int | None = None
+        self.minute_remaining: int | None = None
+        self.updated_at: float | None = None
+
+    def update(self, headers: httpx.Headers) -> None:
+        def number(name: str) -> int | None:
+            value = headers.get(name)
+            return int(value) if value is not None and value.isdigit() else None
+
+        values = {
+            "daily_limit": number("x-ratelimit-requests-limit"),
+            "daily_remaining": number("x-ratelimit-requests-remaining"),
+            "minute_limit": number("x-ratelimit-limit"),
+            "minute_remaining": number("x-ratelimit-remaining"),
+        }
+        for name, value in values.items():
+            if value is not None:
+                setattr(self, name, value)
+                self.updated_at = time.time()
+
+    def snapshot(self) -> dict:
+        return {
+            "daily_limit": self.daily_limit,
+            "daily_remaining": self.daily_remaining,
+            "minute_limit": self.minute_limit,
+            "minute_remaining": self.minute_remaining,
+            "updated_at": self.updated_at,
+        }
+
+
+class Job:
+    def __init__(self, path: str, params: dict, priority: Priority, deadline: float, future: asyncio.Future):
+        self.path = path
+        self.params = params
+        self.priority = priority
+        self.deadline = deadline
+        self.future = future
+        self.enqueued = time.monotonic()
+        self.taken = False
+        self.attempts = 0
+        # Heap'teki güncel girdinin sırası; yeniden kuyruğa konan işin eski girdisi atlanır
+        self.sequence = -1
+
+    @property
+    def fixture_id(self) -> int | None:
+        """Birleştirilebilir tekil fikstür isteği ise maç id'si."""
+        if self.path.rstrip("/") == "/fixtures" and set(self.params) == {"id"}:
+            return int(self.params["id"])
+        return None
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        rate_per_minute: float = 300,
+        burst: int = 10,
+        daily_reserve: int = 500,
+        deadlines: dict[Priority, float] | None = None,
+    ):
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self.daily_reserve = daily_reserve
+        self.deadlines = {**DEFAULT_DEADLINES, **(deadlines or {})}
+        self.quota = Quota()
+        self.send: Callable[[str, dict], Awaitable[httpx.Response]] | None = None
+        self.max_retries = 3
+        self.backoff = 0.5
+        self._heap: list[tuple[int, float, int, Job]] = []
+        self._delayed: dict[Job, asyncio.TimerHandle] = {}
+        self._pending: dict[int, list[Job]] = {}
+        self._sequence = itertools.count()
+        self._available = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self.dispatched = 0
+        self.upstream_calls = 0
+        self.merged = 0
+        self.shed_deadline = 0
+        self.shed_quota = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(
+        self,
+        send: Callable[[str, dict], Awaitable[httpx.Response]],
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ) -> None:
+        """
+        send tek deneme yapmalı: yeniden denenebilir yanıtları (RETRY_STATUSES)
+        döndürmeli, bağlantı hatalarında httpx.TransportError yükseltmeli.
+        """
+        self.send = send
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._inflight):
+            task.cancel()
+        await asyncio.gather(*self._inflight, return_exceptions=True)
+        for job, handle in self._delayed.items():
+            handle.cancel()
+            if not job.future.done():
+                job.future.cancel()
+        self._delayed.clear()
+        for _, _, _, job in self._heap:
+            if not job.future.done():
+                job.future.cancel()
+        self._heap.clear()
+        self._pending.clear()
+
+    async def submit(
+        self,
+        path: str,
+        params: dict | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        timeout: float | None = None,
+    ) -> dict:
+        """İsteği kuyruğa al ve yanıt JSON'unu bekle."""
+        if (
+            priority == Priority.BACKFILL
+            and self.quota.daily_remaining is not None
+            and self.quota.daily_remaining <= self.daily_reserve
+        ):
+            self.shed_quota += 1
+            raise UpstreamRateLimitedError("API-Football günlük kotası canlı istekler için ayrıldı")
+
+        deadline = time.monotonic() + (timeout if timeout is not None else self.deadlines[priority])
+        job = Job(path, dict(params or {}), priority, deadline, asyncio.get_running_loop().create_future())
+        self._enqueue(job)
+        return await job.future
+
+    def _enqueue(self, job: Job) -> None:
+        self._delayed.pop(job, None)
+        if job.future.done():
+            return
+        job.taken = False
+        job.sequence = next(self._sequence)
+        heapq.heappush(self._heap, (int(job.priority), job.deadline, job.sequence, job))
+        if job.fixture_id is not None:
+            self._pending.setdefault(int(job.priority), []).append(job)
+        self._available.set()
+
+    def _pop(self) -> Job | None:
+        """Sıradaki gönderilebilir iş; süresi dolanlar düşürülür."""
+        now = time.monotonic()
+        while self._heap:
+            _, _, sequence, job = heapq.heappop(self._heap)
+            if sequence != job.sequence or job.taken or job.future.done():
+                continue
+            job.taken = True
+            if job.deadline < now:
+                self.shed_deadline += 1
+                job.future.set_exception(
+                    UpstreamRateLimitedError("API-Football isteği kuyrukta zaman aşımına uğradı")
+                )
+                continue
+            return job
+        return None
+
+    def _merge(self, job: Job) -> list[Job]:
+        """Kuyrukta bekleyen tekil fikstür isteklerini job'a ekle."""
+        if job.fixture_id is None:
+            return [job]
+        batch = [job]
+        ids = {job.fixture_id}
+        now = time.monotonic()
+        for lane in sorted(self._pending):
+            waiting = []
+            for other in self._pending[lane]:
+                if other.taken or other.future.done():
+                    continue
+                if len(ids) < MAX_MERGED_IDS and other.deadline >= now:
+                    other.taken = True
+                    batch.append(other)
+                    ids.add(other.fixture_id)
+                else:
+                    waiting.append(other)
+            self._pending[lane] = waiting
+        self.merged += len(batch) - 1
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._available.wait()
+            delay = self.bucket.wait_time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            job = self._pop()
+            if job is None:
+                self._available.clear()
+                continue
+            self.bucket.take()
+            batch = self._merge(job)
+            self.dispatched += len(batch)
+            task = asyncio.create_task(self._execute(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _execute(self, batch: list[Job]) -> None:
+        if len(batch) == 1:
+            path, params = batch[0].path, batch[0].params
+        else:
+            ids = sorted({job.fixture_id for job in batch})
+            path, params = batch[0].path, {"ids": "-".join(map(str, ids))}
+
+        self.upstream_calls += 1
+        try:
+            response = await self.send(path, params)
+        except asyncio.CancelledError:
+            # stop(): bekleyen istekler askıda kalmasın
+            for job in batch:
+                if not job.future.done():
+                    job.future.cancel()
+            raise
+        except httpx.TransportError as exc:
+            self._retry(batch, f"{type(exc).__name__}: {exc}", None)
+            return
+        except Exception as exc:
+            self._fail(batch, exc)
+            return
+
+        self.quota.update(response.headers)
+        if self.quota.minute_remaining == 0:
+            self.bucket.block(60 - time.time() % 60)
+        if response.status_code in RETRY_STATUSES:
+            self._retry(batch, f"HTTP {response.status_code}", response)
+            return
+        try:
+            payload = response.json()
+        except Exception as exc:
+            self._fail(batch, exc)
+            return
+
+        throttled = throttle_error(payload)
+        if throttled is not None:
+            if throttled == "requests":
+                self.quota.daily_remaining = 0
+                self.bucket.block(60)
+            else:
+                self.bucket.block(60 - time.time() % 60)
+            self._retry(batch, f"{throttled}: {payload['errors'][throttled]}", None)
+            return
+
+        if len(batch) == 1:
+            batch[0].future.set_result(payload)
+            return
+        for job, part in zip(batch, split_fixtures(payload, [job.fixture_id for job in batch])):
+            if not job.future.done():
+                job.future.set_result(part)
+
+    def _fail(self, batch: list[Job], exc: Exception) -> None:
+        self.failed += 1
+        for job in batch:
+            if not job.future.done():
+                job.future.set_exception(exc)
+
+    def _retry(self, batch: list[Job], error: str, response: httpx.Response | None) -> None:
+        """Başarısız işleri geri çekilme sonrası kuyruğa geri koy; hakkı bitenleri düşür."""
+        attempt = max(job.attempts for job in batch)
+        delay = retry_after(response)
+        if delay is not None:
+            # Upstream yavaşla diyor: sadece bu iş değil tüm kuyruk bekler
+            self.bucket.block(delay)
+        else:
+            delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+        loop = asyncio.get_running_loop()
+        requeued = 0
+        for job in batch:
+            if job.future.done():
+                continue
+            job.attempts += 1
+            if job.attempts > self.max_retries:
+                self.failed += 1
+                job.future.set_exception(
+                    UpstreamServiceError(f"API-Football {job.path} yanıt vermedi", detail=error)
+                )
+                continue
+            self.retried += 1
+            requeued += 1
+            self._delayed[job] = loop.call_later(delay, self._enqueue, job)
+        if requeued:
+            logger.warning(f"API-Football {batch[0].path} başarısız ({error}), {delay:.1f} sn sonra tekrar")
+
+    def metrics(self) -> dict:
+        lanes = {lane.name.lower(): 0 for lane in Priority}
+        for _, _, sequence, job in self._heap:
+            if sequence == job.sequence and not job.taken and not job.future.done():
+                lanes[job.priority.name.lower()] += 1
+        return {
+            "queued": lanes,
+            "tokens": round(self.bucket.tokens, 2),
+            "rate_per_minute": round(self.bucket.rate * 60, 2),
+            "dispatched": self.dispatched,
+            "upstream_calls": self.upstream_calls,
+            "merged": self.merged,
+            "shed_deadline": self.shed_deadline,
+            "shed_quota": self.shed_quota,
+            "retried": self.retried,
+            "retry_waiting": len(self._delayed),
+            "failed": self.failed,
+            "quota": self.quota.snapshot(),
+        }
+
+
+def split_fixtures(payload: dict, fixture_ids: list[int]) -> list[dict]:
+    """fixtures?ids= yanıtını tekil fixtures?id= yanıtlarına böl."""
+    if payload.get("errors"):
+        return [payload for _ in fixture_ids]
+    by_id = {item["fixture"]["id"]: item for item in payload.get("response") or []}
+    parts = []
+    for fixture_id in fixture_ids:
+        items = [by_id[fixture_id]] if fixture_id in by_id else []
+        parts.append({
+            **payload,
+            "parameters": {"id": str(fixture_id)},
+            "results": len(items),
+            "response": items,
+        })
+    return parts
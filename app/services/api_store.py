@@ -0,0 +1,139 @@
+"""
+API-Football yanıtları için kalıcı (SQLite) depo.
+
+api-sports kotası günlüktür; bellekteki cache her deploy/restart'ta
+kaybolur. Upstream'den gelen her başarılı yanıt burada da saklanır:
+
+    api_responses(path, params, fetched_at, ttl, payload, pinned)
+
+- payload zlib ile sıkıştırılmış JSON'dur.
+- Aynı makinedeki uvicorn worker'ları aynı dosyayı paylaşır (WAL modu:
+  okuyucular yazarı beklemez). Bir worker'ın çektiği yanıtı diğeri
+  upstream'e gitmeden kullanır.
+- Uygulama açılışında süresi dolmamış kayıtlar bellekteki cache'e yüklenir.
+- Replay modunda (API_FOOTBALL_REPLAY) istemci ağa hiç çıkmaz, kayıtlı
+  yanıtları süresine bakmadan döndürür. Dolu bir depo dosyası testler ve
+  benchmark'lar için sabit veri seti olarak da kullanılabilir; böyle bir
+  veri seti pin() ile sabitlenir, prune sabitlenmiş kayıtları silmez.
+
+sqlite3 çağrıları bloklayıcıdır; async koddan asyncio.to_thread ile
+çağrılır. Her thread kendi bağlantısını kullanır.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_responses (
+    path TEXT NOT NULL,
+    params TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    ttl REAL NOT NULL,
+    payload BLOB NOT NULL,
+    pinned INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (path, params)
+);
+CREATE INDEX IF NOT EXISTS ix_api_responses_fetched_at ON api_responses (fetched_at);
+"""
+
+
+def params_key(params: dict | None) -> str:
+    """Parametrelerin sıradan bağımsız metin karşılığı."""
+    return json.dumps({str(k): str(v) for k, v in (params or {}).items()}, sort_keys=True)
+
+
+COLUMNS = "path, params, fetched_at, ttl, payload"
+
+
+class StoredResponse:
+    def __init__(self, path: str, params: str, fetched_at: float, ttl: float, payload: bytes):
+        self.path = path
+        self.params = json.loads(params)
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+        self.payload = json.loads(zlib.decompress(payload))
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class ResponseStore:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+            # pinned kolonundan önce oluşturulmuş depo dosyaları
+            columns = {row[1] for row in db.execute("PRAGMA table_info(api_responses)")}
+            if "pinned" not in columns:
+                db.execute("ALTER TABLE api_responses ADD COLUMN pinned INTEGER NOT NULL DEFAULT 0")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def save(self, path: str, params: dict | None, payload: dict, ttl: float) -> None:
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode(), 6)
+        with self._connect() as db:
+            # Yenilenen kayıt sabitlenmişse sabit kalır
+            db.execute(
+                f"INSERT INTO api_responses ({COLUMNS}) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (path, params) DO UPDATE SET "
+                "fetched_at = excluded.fetched_at, ttl = excluded.ttl, payload = excluded.payload",
+                (path, params_key(params), time.time(), ttl, blob),
+            )
+
+    def load(self, path: str, params: dict | None) -> StoredResponse | None:
+        row = self._connect().execute(
+            f"SELECT {COLUMNS} FROM api_responses WHERE path = ? AND params = ?",
+            (path, params_key(params)),
+        ).fetchone()
+        return StoredResponse(*row) if row else None
+
+    def recent(self, limit: int, max_age_factor: float = 2.0) -> list[StoredResponse]:
+        """Hâlâ kullanılabilir (fetched_at + factor * ttl > şimdi) en yeni kayıtlar."""
+        rows = self._connect().execute(
+            f"SELECT {COLUMNS} FROM api_responses WHERE fetched_at + ? * ttl > ? "
+            "ORDER BY fetched_at DESC LIMIT ?",
+            (max_age_factor, time.time(), limit),
+        ).fetchall()
+        return [StoredResponse(*row) for row in rows]
+
+    def prune(self, max_age_factor: float = 2.0) -> int:
+        """
+        Süresi tamamen dolmuş, sabitlenmemiş kayıtları sil.
+
+        İstemci replay dışında periyodik çağırır.
+        """
+        with self._connect() as db:
+            return db.execute(
+                "DELETE FROM api_responses WHERE pinned = 0 AND fetched_at + ? * ttl <= ?",
+                (max_age_factor, time.time()),
+            ).rowcount
+
+    def pin(self) -> int:
+        """
+        Depodaki tüm kayıtları sabitle (replay veri seti olarak dondur).
+
+        Returns:
+            Yeni sabitlenen kayıt sayısı
+        """
+        with self._connect() as db:
+            return db.execute("UPDATE api_responses SET pinned = 1 WHERE pinned = 0").rowcount
+
+    def stats(self) -> dict:
+        count, pinned, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(pinned), 0), COALESCE(SUM(LENGTH(payload)), 0) FROM api_responses"
+        ).fetchone()
+        return {"path": str(self.path), "entries": count, "pinned": pinned, "payload_bytes": size}
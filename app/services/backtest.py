@@ -0,0 +1,347 @@
+"""
+Walk-forward backtest.
+
+Bir MLModel'in tahmin başarısını geçmiş maçlar üzerinde, sezon sezon
+ölçer: her test sezonu için model, o sezondan ÖNCEKİ sezonlarla yeniden
+eğitilir (walk-forward refit) ve sadece o sezon skorlanır. Böylece her
+tahmin, maç oynanmadan önce bilinebilecek veriyle yapılmış olur.
+
+- Feature matrisi tüm maçlar için bir kez kurulur (build_feature_matrix
+  zaten leakage içermez); fold'lar sadece satır maskesiyle ayrılır.
+- Fold'lar birbirinden bağımsızdır ve spawn ile açılan bir process pool'da
+  paralel çalışır. X, y ve sezon dizileri tek bir SharedMemory bloğunda
+  paylaşılır; worker'lara sadece tahminci ve sezon gönderilir.
+- Metrikler (accuracy, macro F1, AUC, log loss, MAE) ve oran bazlı ROI
+  NumPy dizi işlemleriyle hesaplanır; maç başına Python döngüsü yoktur.
+
+Sonuçlar MLModel satırının metrik kolonlarına ve backtest (JSON) kolonuna
+yazılır.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.models import Division, MLModel, Match
+from app.services.executor import attach, release, share_arrays
+from app.services.features import build_feature_matrix, load_matches_frame
+from app.services.model_registry import load_model
+from app.services.predictions import MARKETS
+
+# Market -> {sınıf etiketi: oran kolonu}
+ODDS_COLUMNS = {
+    "result": {"H": "odd_home", "D": "odd_draw", "A": "odd_away"},
+    "over25": {1: "odd_over25", 0: "odd_under25"},
+}
+
+EPSILON = 1e-15
+
+
+def market_targets(market: str, matches: pd.DataFrame) -> np.ndarray:
+    """Bitmiş maçlar için marketin gerçekleşen sınıfı (modelin eğitildiği etiketler)."""
+    home = matches["ft_home"].to_numpy(float)
+    away = matches["ft_away"].to_numpy(float)
+    if market == "result":
+        return np.select([home > away, home < away], ["H", "A"], default="D")
+    if market == "over25":
+        return (home + away > 2.5).astype(int)
+    raise ValueError(f"Backtest için tanımsız market: {market}")
+
+
+def season_numbers(dates: pd.Series) -> np.ndarray:
+    """Sezon başlangıç yılı (Temmuz-Haziran): 2023-08-12 -> 2023, 2024-05-19 -> 2023."""
+    dates = pd.to_datetime(dates)
+    return (dates.dt.year - (dates.dt.month < 7)).to_numpy(np.int32)
+
+
+# --- Metrikler -----------------------------------------------------------------
+
+def average_ranks(values: np.ndarray) -> np.ndarray:
+    """1'den başlayan sıralar; eşit değerler ortalama sıra alır."""
+    order = np.argsort(values, kind="mergesort")
+    _, first, counts = np.unique(values[order], return_index=True, return_counts=True)
+    ranks = np.empty(len(values))
+    ranks[order] = np.repeat(first + (counts + 1) / 2, counts)
+    return ranks
+
+
+def binary_auc(scores: np.ndarray, positive: np.ndarray) -> float:
+    """Mann-Whitney U ile ROC AUC."""
+    n_pos = int(positive.sum())
+    n_neg = len(positive) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return float("nan")
+    ranks = average_ranks(scores)
+    return float((ranks[positive].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+
+def classification_metrics(y: np.ndarray, proba: np.ndarray) -> dict:
+    """
+    Args:
+        y: gerçek sınıf kodları (0..K-1)
+        proba: (n, K) olasılıklar
+
+    MAE, gerçek sınıfa verilen olasılığın 1'den uzaklığının ortalamasıdır.
+    AUC ikili problemde pozitif sınıf için, çok sınıfta one-vs-rest ortalamasıdır.
+    """
+    n, k = proba.shape
+    if n == 0:
+        return {"samples": 0}
+    rows = np.arange(n)
+    pred = proba.argmax(axis=1)
+    p_true = proba[rows, y]
+
+    confusion = np.bincount(y * k + pred, minlength=k * k).reshape(k, k)
+    tp = np.diag(confusion).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.nan_to_num(tp / confusion.sum(axis=0))
+        recall = np.nan_to_num(tp / confusion.sum(axis=1))
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+
+    if k == 2:
+        auc = binary_auc(proba[:, 1], y == 1)
+    else:
+        auc = float(np.nanmean([binary_auc(proba[:, c], y == c) for c in range(k)]))
+
+    return {
+        "samples": n,
+        "accuracy": float((pred == y).mean()),
+        "f1_score": float(f1.mean()),
+        "auc_score": auc,
+        "log_loss": float(-np.log(np.clip(p_true, EPSILON, 1.0)).mean()),
+        "mae": float((1.0 - p_true).mean()),
+    }
+
+
+def betting_roi(y: np.ndarray, proba: np.ndarray, odds: np.ndarray, min_edge: float | None = None) -> dict:
+    """
+    Her maçta en olası sınıfa 1 birim bahis.
+
+    Args:
+        odds: (n, K) oranlar, proba ile aynı sınıf sırasında (eksik oran NaN)
+        min_edge: verilirse sadece p * oran - 1 > min_edge olan (value) bahisler
+    """
+    rows = np.arange(len(y))
+    pick = proba.argmax(axis=1)
+    price = odds[rows, pick]
+    bet = ~np.isnan(price) & (price > 1.0)
+    if min_edge is not None:
+        bet &= proba[rows, pick] * price - 1.0 > min_edge
+
+    profit = np.where(pick == y, price - 1.0, -1.0)[bet]
+    bets = int(bet.sum())
+    return {
+        "bets": bets,
+        "profit": round(float(profit.sum()), 4),
+        "roi": round(float(profit.sum() / bets), 4) if bets else None,
+    }
+
+
+def evaluate(y: np.ndarray, proba: np.ndarray, odds: np.ndarray | None) -> dict:
+    # NaN (ör. tek sınıflı sezonda AUC) JSON'a None olarak yazılır
+    metrics = {
+        key: (None if np.isnan(value) else round(value, 4)) if isinstance(value, float) else value
+        for key, value in classification_metrics(y, proba).items()
+    }
+    if odds is not None and len(y):
+        metrics["roi_flat"] = betting_roi(y, proba, odds)
+        metrics["roi_value"] = betting_roi(y, proba, odds, min_edge=0.0)
+    return metrics
+
+
+# --- Worker tarafı -----------------------------------------------------------------
+
+_shared: dict = {}
+
+
+def _init_backtest_worker(descriptor: dict) -> None:
+    """Paylaşılan X / y / sezon dizilerine worker ömrü boyunca bağlan."""
+    block, arrays = attach(descriptor)
+    _shared["block"] = block
+    _shared.update(arrays)
+
+
+def _fold_job(estimator, season: int, first_season: int, n_classes: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    first_season..season-1 ile eğit, season'ı skorla.
+
+    Returns:
+        (test satır indeksleri, (n_test, n_classes) olasılıklar)
+    """
+    X, y, seasons = _shared["X"], _shared["y"], _shared["season"]
+    train = (seasons < season) & (seasons >= first_season)
+    test = np.flatnonzero(seasons == season)
+
+    model = clone(estimator)
+    model.fit(X[train], y[train])
+    proba = np.zeros((len(test), n_classes))
+    # Eğitim setinde hiç görülmeyen sınıfın olasılığı 0 kalır
+    proba[:, model.classes_.astype(int)] = model.predict_proba(X[test])
+    return test, proba
+
+
+# --- Ana süreç tarafı ----------------------------------------------------------------
+
+def walk_forward(
+    estimator,
+    X: np.ndarray,
+    y: np.ndarray,
+    seasons: np.ndarray,
+    n_classes: int,
+    min_train_seasons: int = 2,
+    train_seasons: int | None = None,
+    workers: int = 4,
+) -> tuple[np.ndarray, list[int]]:
+    """
+    Tüm test sezonlarını paralel çalıştır.
+
+    Args:
+        min_train_seasons: ilk test sezonundan önce gereken sezon sayısı
+        train_seasons: verilirse kayan pencere (son N sezon), yoksa genişleyen pencere
+
+    Returns:
+        ((n, n_classes) olasılıklar, test edilmeyen satırlar NaN), test sezonları
+    """
+    all_seasons = np.unique(seasons).tolist()
+    folds = all_seasons[min_train_seasons:]
+    proba = np.full((len(y), n_classes), np.nan)
+    if not folds:
+        return proba, folds
+
+    def first_season(season: int) -> int:
+        return season - train_seasons if train_seasons else all_seasons[0]
+
+    # Worker'lara eğitilmemiş kopya gider; fit edilmiş ağırlıklar pickle edilmez
+    template = clone(estimator)
+    block, descriptor = share_arrays({
+        "X": np.ascontiguousarray(X, dtype=np.float64),
+        "y": y.astype(np.int64),
+        "season": seasons.astype(np.int32),
+    })
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max(1, min(workers, len(folds))),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_backtest_worker,
+            initargs=(descriptor,),
+        ) as pool:
+            jobs = [
+                pool.submit(_fold_job, template, season, first_season(season), n_classes)
+                for season in folds
+            ]
+            for job in jobs:
+                rows, fold_proba = job.result()
+                proba[rows] = fold_proba
+    finally:
+        release(block, unlink=True)
+    return proba, folds
+
+
+def load_backtest_frame(db: Session, division_codes: list[str] | None = None) -> pd.DataFrame:
+    """Bitmiş maçlar (feature kaynak kolonlarıyla)."""
+    condition = Match.ft_home.is_not(None) & Match.ft_away.is_not(None)
+    if division_codes:
+        division_ids = db.scalars(select(Division.id).where(Division.code.in_(division_codes))).all()
+        condition &= Match.division_id.in_(division_ids)
+    return load_matches_frame(db, condition)
+
+
+def run_backtest(
+    matches: pd.DataFrame,
+    estimator,
+    feature_names: list[str],
+    market: str,
+    min_train_seasons: int = 2,
+    train_seasons: int | None = None,
+    workers: int = 4,
+) -> dict:
+    """
+    Maç DataFrame'i üzerinde walk-forward backtest.
+
+    Returns:
+        overall (toplam metrikler + ROI), seasons (sezon -> metrikler), parametreler
+    """
+    started = time.perf_counter()
+    matrix = build_feature_matrix(matches)
+    matches = matches.set_index("id").loc[matrix.index]
+
+    labels = market_targets(market, matches)
+    classes, y = np.unique(labels, return_inverse=True)
+    seasons = season_numbers(matches["match_date"])
+    X = matrix[feature_names].astype(float).to_numpy()
+
+    proba, folds = walk_forward(
+        estimator, X, y, seasons, len(classes), min_train_seasons, train_seasons, workers
+    )
+    tested = ~np.isnan(proba[:, 0])
+
+    odds = None
+    odds_columns = ODDS_COLUMNS.get(market)
+    if odds_columns is not None:
+        odds = np.column_stack([
+            matches[odds_columns[label]].astype(float).to_numpy()
+            if label in odds_columns else np.full(len(matches), np.nan)
+            for label in classes.tolist()
+        ])
+
+    def subset(mask: np.ndarray) -> dict:
+        return evaluate(y[mask], proba[mask], odds[mask] if odds is not None else None)
+
+    return {
+        "market": market,
+        "classes": [str(label) for label in classes.tolist()],
+        "min_train_seasons": min_train_seasons,
+        "train_seasons": train_seasons,
+        "overall": subset(tested),
+        "seasons": {str(season): subset(tested & (seasons == season)) for season in folds},
+        "elapsed_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def ensure_backtest_column(db: Session) -> None:
+    """Eski veritabanlarında ml_models.backtest kolonu yoksa ekle."""
+    db.execute(text("ALTER TABLE ml_models ADD COLUMN IF NOT EXISTS backtest JSON"))
+
+
+def backtest_model(
+    db: Session,
+    record: MLModel,
+    division_codes: list[str] | None = None,
+    min_train_seasons: int = 2,
+    train_seasons: int | None = None,
+    workers: int = 4,
+) -> dict:
+    """
+    MLModel için backtest çalıştır ve sonuçları satıra yaz.
+
+    Model mimarisi ve hiperparametreleri artifact'tan alınır (fit edilmiş
+    ağırlıklar kullanılmaz, her fold'da yeniden eğitilir). Commit çağıran
+    tarafa bırakılır.
+    """
+    markets = {name: market for market, name in MARKETS.items()}
+    market = markets.get(record.name)
+    if market is None:
+        raise ValueError(f"{record.name} bir markete bağlı değil")
+
+    model = load_model(record)
+    matches = load_backtest_frame(db, division_codes)
+    result = run_backtest(
+        matches, model.estimator, model.feature_names, market,
+        min_train_seasons, train_seasons, workers,
+    )
+
+    overall = result["overall"]
+    for column in ("accuracy", "f1_score", "auc_score", "log_loss", "mae"):
+        setattr(record, column, overall.get(column))
+    result["divisions"] = division_codes
+    result["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    record.backtest = result
+    db.flush()
+    return result
@@ -0,0 +1,146 @@
+"""
+Asyncio micro-batcher.
+
+Tek tek gelen istekleri kısa bir pencere (birkaç ms) boyunca ya da
+max_batch_size dolana kadar toplar, handler'ı tüm batch için bir kez
+çağırır ve sonuçları bekleyen coroutine'lere dağıtır. Model çağrısının
+vektörizasyonu eşzamanlı tekil istekler arasında paylaşılmış olur.
+
+Pencere ilk isteğin gelişiyle başlar; boş kuyrukta bekleme maliyeti
+yoktur. Handler hata verirse batch'teki tüm istekler aynı hatayı alır.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class BatcherMetrics:
+    """Batch boyutu ve kuyruk bekleme metrikleri."""
+
+    def __init__(self, sample_size: int = 2048):
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        # Batch boyutu histogramı: 2'nin kuvvetleri (1, 2, 4, ...)
+        self.batch_sizes: dict[int, int] = {}
+        self.queue_waits = deque(maxlen=sample_size)
+        self.max_queue_wait = 0.0
+
+    def record_batch(self, size: int, waits: list[float], failed: bool) -> None:
+        self.batches += 1
+        self.items += size
+        self.errors += int(failed)
+        bucket = 1 << (size - 1).bit_length()
+        self.batch_sizes[bucket] = self.batch_sizes.get(bucket, 0) + 1
+        self.queue_waits.extend(waits)
+        self.max_queue_wait = max(self.max_queue_wait, max(waits))
+
+    def snapshot(self) -> dict:
+        waits = np.asarray(self.queue_waits) * 1000
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "errors": self.errors,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "batch_size_histogram": {f"<={k}": v for k, v in sorted(self.batch_sizes.items())},
+            "queue_wait_ms": {
+                "p50": round(float(np.percentile(waits, 50)), 3) if len(waits) else 0.0,
+                "p99": round(float(np.percentile(waits, 99)), 3) if len(waits) else 0.0,
+                "max": round(self.max_queue_wait * 1000, 3),
+            },
+        }
+
+
+class MicroBatcher:
+    """
+    Args:
+        handler: items listesini alıp aynı sırada sonuç listesi döndüren coroutine
+        window_ms: ilk istekten sonra batch'in toplanma süresi
+        max_batch_size: pencere dolmadan batch'i tetikleyen boyut
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list], Awaitable[list]],
+        window_ms: float = 5.0,
+        max_batch_size: int = 256,
+    ):
+        self.handler = handler
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.metrics = BatcherMetrics()
+        self._pending: list[tuple] = []
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def submit(self, item):
+        """İsteği kuyruğa ekle ve batch sonucunu bekle."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        self._wakeup.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def _collect(self) -> list[tuple]:
+        """İlk isteği bekle, sonra pencere ya da boyut sınırına kadar topla."""
+        await self._wakeup.wait()
+        if len(self._pending) < self.max_batch_size:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.window)
+            except asyncio.TimeoutError:
+                pass
+
+        batch = self._pending[: self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        self._full.clear()
+        if not self._pending:
+            self._wakeup.clear()
+        elif len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            items = [item for item, _, _ in batch]
+            waits = [started - queued for _, _, queued in batch]
+            try:
+                results = await self.handler(items)
+            except Exception as exc:
+                logger.exception(f"Micro-batch ({len(batch)} istek) başarısız")
+                self.metrics.record_batch(len(batch), waits, failed=True)
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            self.metrics.record_batch(len(batch), waits, failed=False)
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for _, future, _ in self._pending:
+            if not future.done():
+                future.cancel()
+        self._pending = []
@@ -0,0 +1,180 @@
+"""
+Admin CSV upload import'u.
+
+Upload edilen Matches.csv'yi request stream'inden parça parça okur ve
+uygulamanın async engine'i ile veritabanına yazar. Dosya hiçbir zaman
+tamamen belleğe alınmaz: bir batch yazılmadan bir sonraki parça okunmaz,
+böylece TCP akış kontrolü istemciye doğal backpressure uygular.
+CSV ayrıştırma (pandas) thread'de çalışır; event loop bloklanmaz.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Division, EloHistory, ImportJob, Match, Team
+from app.services.match_csv import (
+    match_records,
+    prepare_elo_records,
+    prepare_matches,
+    read_csv_bytes,
+    record_complete,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def iter_csv_batches(
+    stream: AsyncIterator[bytes], batch_rows: int
+) -> AsyncIterator[tuple[bytes, bytes, int, int]]:
+    """
+    Byte stream'ini tam CSV kayıtlarından oluşan batch'lere böl.
+
+    Tırnaklı alan içindeki satır sonu kaydı bölmez (record_complete);
+    kayıtlar import script'indeki read_record ile aynı kuralla ayrılır.
+
+    Yields:
+        (header, batch kayıtları, batch kayıt sayısı, şu ana kadar alınan byte)
+    """
+    header = None
+    pending = b""
+    record = b""
+    records: list[bytes] = []
+    received = 0
+
+    async for chunk in stream:
+        received += len(chunk)
+        pending += chunk
+        *complete, pending = pending.split(b"\n")
+        for line in complete:
+            record += line + b"\n"
+            if not record_complete(record):
+                continue
+            if header is None:
+                header = record
+            elif record.strip():
+                records.append(record)
+            record = b""
+
+        while len(records) >= batch_rows:
+            batch, records = records[:batch_rows], records[batch_rows:]
+            yield header, b"".join(batch), len(batch), received
+
+    record += pending
+    if header is None:
+        header, record = record + b"\n", b""
+    if record.strip():
+        records.append(record + b"\n")
+    if records:
+        yield header, b"".join(records), len(records), received
+
+
+async def resolve_ids(
+    db: AsyncSession, model, key: str, names, cache: dict, copy_to: tuple = ()
+) -> None:
+    """
+    Yeni isimleri ekle (ON CONFLICT DO NOTHING) ve id'lerini cache'e yaz.
+
+    Division için key='code', Team için key='name'. copy_to'daki kolonlar
+    da aynı değerle doldurulur (import_divisions'taki name=code gibi).
+    """
+    missing = sorted({name for name in names if name not in cache})
+    if not missing:
+        return
+
+    column = getattr(model, key)
+    values = [{key: name, **{field: name for field in copy_to}} for name in missing]
+    await db.execute(pg_insert(model).values(values).on_conflict_do_nothing(index_elements=[key]))
+    result = await db.execute(select(model.id, column).where(column.in_(missing)))
+    cache.update({name: id_ for id_, name in result.all()})
+
+
+async def import_batch(db: AsyncSession, chunk, div_map: dict, team_map: dict) -> dict:
+    """Tek bir CSV batch'ini maç ve ELO tablolarına yaz."""
+    await resolve_ids(db, Division, "code", chunk["Division"].dropna(), div_map, copy_to=("name",))
+    teams = set(chunk["HomeTeam"].dropna()) | set(chunk["AwayTeam"].dropna())
+    await resolve_ids(db, Team, "name", teams, team_map)
+
+    matches = await asyncio.to_thread(
+        lambda: match_records(prepare_matches(chunk, div_map, team_map))
+    )
+    elo = await asyncio.to_thread(
+        lambda: prepare_elo_records(chunk, team_map).to_dict("records")
+    )
+
+    counts = {"matches_added": 0, "elo_added": 0}
+    if matches:
+        result = await db.execute(
+            pg_insert(Match)
+            .on_conflict_do_nothing(
+                index_elements=["match_date", "home_team_id", "away_team_id"]
+            )
+            .returning(Match.id),
+            matches,
+        )
+        counts["matches_added"] = len(result.all())
+    if elo:
+        result = await db.execute(
+            pg_insert(EloHistory)
+            .on_conflict_do_nothing(index_elements=["team_id", "date", "source"])
+            .returning(EloHistory.id),
+            elo,
+        )
+        counts["elo_added"] = len(result.all())
+
+    counts["matches_skipped"] = len(matches) - counts["matches_added"]
+    counts["elo_skipped"] = len(elo) - counts["elo_added"]
+    return counts
+
+
+async def ingest_matches_csv(
+    session_maker: async_sessionmaker,
+    job_id: str,
+    stream: AsyncIterator[bytes],
+    total_bytes: int | None = None,
+    batch_rows: int = 5000,
+) -> None:
+    """
+    Upload stream'ini import et ve ImportJob kaydını batch batch güncelle.
+
+    Her batch (veri + iş sayaçları) tek transaction'da commit edilir;
+    ilerleme GET /admin/imports/{job_id} ile izlenebilir. Hata durumunda
+    iş 'failed' olarak işaretlenir, commit edilmiş batch'ler kalır.
+    İş çağrılmadan önce ImportJobRepository.claim ile running'e çekilmiş
+    olmalıdır (aynı işe iki upload yazmasın).
+    """
+    div_map: dict = {}
+    team_map: dict = {}
+
+    async with session_maker() as db:
+        job = await db.get(ImportJob, job_id)
+        job.total_bytes = total_bytes
+        job.started_at = datetime.now()
+        await db.commit()
+
+        try:
+            async for header, body, rows, received in iter_csv_batches(stream, batch_rows):
+                chunk = await asyncio.to_thread(read_csv_bytes, header, body)
+                counts = await import_batch(db, chunk, div_map, team_map)
+
+                job.bytes_received = received
+                job.rows_processed += rows
+                for field, value in counts.items():
+                    setattr(job, field, getattr(job, field) + value)
+                await db.commit()
+
+            job.status = "completed"
+        except Exception as exc:
+            await db.rollback()
+            logger.exception(f"Import job {job_id} failed")
+            job = await db.get(ImportJob, job_id)
+            job.status = "failed"
+            job.error = str(exc)[:2000]
+        finally:
+            job.finished_at = datetime.now()
+            await db.commit()
@@ -0,0 +1,339 @@
+"""
+Yerel ELO motoru.
+
+ELO puanları matches tablosundan hesaplanır: maçlar kronolojik sırayla
+tekrar oynanır (replay) ve her maçtan sonra iki takımın puanı güncellenir.
+Puanlar takım id'si ile indekslenen yoğun (dense) bir NumPy dizisinde
+tutulur; bilinmeyen takımlar NaN'dır ve ilk maçlarında tohumlanır.
+
+Güncelleme (World Football Elo):
+    beklenen = 1 / (1 + 10 ** ((away - home - ev_avantajı) / 400))
+    delta    = K * gol_farkı_çarpanı * (sonuç - beklenen)
+
+Sonuçlar elo_history tablosuna source='native' olarak (takım başına maç
+günü sonrası puan) ve Team.current_elo kolonuna toplu yazılır. Yeni biten
+maçlar apply_new_results ile artımlı uygulanır: bir maçın uygulanıp
+uygulanmadığı elo_history'deki native kayıttan anlaşılır, ayrı bir durum
+tablosu yoktur.
+
+Maç satırlarındaki ELO'lar (home_team_elo / away_team_elo) CSV'den ClubElo
+ölçeğinde gelir. Motor sadece boş olanları doldurur ve bunları
+Match.elo_source='native' ile işaretler; ClubElo değerlerinin üzerine
+yazılmaz.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, delete, exists, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models import EloHistory, Match, Team
+
+SOURCE = "native"
+
+ENGINE_COLUMNS = [
+    "id", "match_date", "home_team_id", "away_team_id",
+    "home_team_elo", "away_team_elo", "ft_home", "ft_away",
+]
+
+
+class EloConfig:
+    """Motor parametreleri."""
+
+    def __init__(
+        self,
+        k_factor: float = 20.0,
+        home_advantage: float = 65.0,
+        initial_rating: float = 1500.0,
+        margin_scaling: bool = True,
+        seed_from_match_elo: bool = True,
+    ):
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.initial_rating = initial_rating
+        # Gol farkına göre K çarpanı
+        self.margin_scaling = margin_scaling
+        # Takımın ilk puanı, varsa o maçtaki import edilmiş ClubElo değeri
+        self.seed_from_match_elo = seed_from_match_elo
+
+
+def margin_multiplier(goal_diff: np.ndarray) -> np.ndarray:
+    """Gol farkı çarpanı: 0-1 gol 1, 2 gol 1.5, N >= 3 gol (11 + N) / 8."""
+    n = np.abs(goal_diff)
+    return np.where(n <= 1, 1.0, np.where(n == 2, 1.5, (11.0 + n) / 8.0))
+
+
+class EloEngine:
+    """Dense puan dizisi üzerinde kronolojik ELO replay'i."""
+
+    def __init__(self, config: EloConfig | None = None, ratings: np.ndarray | None = None):
+        self.config = config or EloConfig()
+        self.ratings = ratings if ratings is not None else np.empty(0)
+
+    def ensure_capacity(self, max_team_id: int) -> None:
+        """Dizi max_team_id'yi kapsamıyorsa NaN ile büyüt."""
+        if max_team_id >= len(self.ratings):
+            grown = np.full(max_team_id + 1, np.nan)
+            grown[: len(self.ratings)] = self.ratings
+            self.ratings = grown
+
+    def expected_home(self, home_rating, away_rating):
+        """Ev sahibinin beklenen skoru (skaler ya da dizi)."""
+        diff = np.asarray(away_rating) - np.asarray(home_rating) - self.config.home_advantage
+        return 1.0 / (1.0 + 10.0 ** (diff / 400.0))
+
+    def replay(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """
+        Maçları verilen sırayla oyna ve puan dizisini yerinde güncelle.
+
+        Sonucu olmayan maçlar puanı değiştirmez, sadece maç öncesi
+        puanları alır. Maçlar (match_date, id) sırasında verilmelidir.
+
+        Returns:
+            id, pre_home, pre_away, post_home, post_away kolonları
+        """
+        n = len(matches)
+        result = pd.DataFrame({"id": matches["id"].to_numpy()})
+        if n == 0:
+            for col in ("pre_home", "pre_away", "post_home", "post_away"):
+                result[col] = np.empty(0)
+            return result
+
+        config = self.config
+        home = matches["home_team_id"].to_numpy(dtype=np.int64)
+        away = matches["away_team_id"].to_numpy(dtype=np.int64)
+        home_goals = matches["ft_home"].astype(float).to_numpy()
+        away_goals = matches["ft_away"].astype(float).to_numpy()
+        finished = ~(np.isnan(home_goals) | np.isnan(away_goals))
+
+        # Maç başına sabitler döngüden önce vektörel hesaplanır
+        goal_diff = np.nan_to_num(home_goals - away_goals)
+        score = np.where(goal_diff > 0, 1.0, np.where(goal_diff == 0, 0.5, 0.0))
+        k = np.full(n, config.k_factor)
+        if config.margin_scaling:
+            k = k * margin_multiplier(goal_diff)
+        if config.seed_from_match_elo:
+            seed_home = matches["home_team_elo"].astype(float).to_numpy()
+            seed_away = matches["away_team_elo"].astype(float).to_numpy()
+        else:
+            seed_home = seed_away = np.full(n, np.nan)
+
+        self.ensure_capacity(int(max(home.max(), away.max())))
+        ratings = self.ratings
+        pre_home, pre_away = np.empty(n), np.empty(n)
+        post_home, post_away = np.empty(n), np.empty(n)
+        initial = config.initial_rating
+        advantage = config.home_advantage
+
+        # ELO sıralı bir özyinelemedir; döngü sadece iki okuma ve iki yazma yapar
+        for i, (h, a, done, s, k_i, sh, sa) in enumerate(zip(
+            home.tolist(), away.tolist(), finished.tolist(), score.tolist(),
+            k.tolist(), seed_home.tolist(), seed_away.tolist(),
+        )):
+            rh, ra = ratings[h], ratings[a]
+            if rh != rh:
+                rh = sh if sh == sh else initial
+            if ra != ra:
+                ra = sa if sa == sa else initial
+            pre_home[i], pre_away[i] = rh, ra
+
+            if done:
+                delta = k_i * (s - 1.0 / (1.0 + 10.0 ** ((ra - rh - advantage) / 400.0)))
+                rh += delta
+                ra -= delta
+            ratings[h], ratings[a] = rh, ra
+            post_home[i], post_away[i] = rh, ra
+
+        result["pre_home"] = pre_home
+        result["pre_away"] = pre_away
+        result["post_home"] = post_home
+        result["post_away"] = post_away
+        return result
+
+
+def load_ratings(db: Session) -> np.ndarray:
+    """Team.current_elo değerlerini dense diziye oku (puansız takımlar NaN)."""
+    rows = db.execute(select(Team.id, Team.current_elo)).all()
+    if not rows:
+        return np.empty(0)
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    values = np.array([row[1] for row in rows], dtype=float)
+    ratings = np.full(int(ids.max()) + 1, np.nan)
+    ratings[ids] = values
+    return ratings
+
+
+def load_engine_matches(db: Session, where=None) -> pd.DataFrame:
+    """Motorun ihtiyaç duyduğu maç kolonlarını (match_date, id) sırasıyla oku."""
+    query = select(*[getattr(Match, col) for col in ENGINE_COLUMNS])
+    if where is not None:
+        query = query.where(where)
+    query = query.order_by(Match.match_date, Match.id)
+    return pd.read_sql(query, db.connection())
+
+
+def history_records(matches: pd.DataFrame, replayed: pd.DataFrame) -> list[dict]:
+    """Bitmiş maçlardan takım başına maç günü sonrası puan kayıtları."""
+    finished = (matches["ft_home"].notna() & matches["ft_away"].notna()).to_numpy()
+    order = np.arange(len(matches))[finished]
+    sides = [
+        pd.DataFrame({
+            "order": order,
+            "team_id": matches[team_col].to_numpy()[finished],
+            "date": matches["match_date"].to_numpy()[finished],
+            "elo": replayed[post_col].to_numpy()[finished].round(2),
+        })
+        for team_col, post_col in (("home_team_id", "post_home"), ("away_team_id", "post_away"))
+    ]
+    records = pd.concat(sides, ignore_index=True).sort_values("order", kind="stable")
+    # Aynı gün iki maç varsa günün son puanı kalır
+    records = records.drop_duplicates(subset=["team_id", "date"], keep="last").drop(columns="order")
+    records["source"] = SOURCE
+    return records.to_dict("records")
+
+
+def ensure_elo_source_column(db) -> None:
+    """Eski veritabanlarında matches.elo_source kolonu yoksa ekle (Session ya da Connection)."""
+    db.execute(text("ALTER TABLE matches ADD COLUMN IF NOT EXISTS elo_source VARCHAR(20)"))
+
+
+def write_history(db: Session, records: list[dict]) -> None:
+    if not records:
+        return
+    stmt = pg_insert(EloHistory)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["team_id", "date", "source"],
+        set_={"elo": stmt.excluded.elo, "updated_at": func.now()},
+        where=EloHistory.elo.is_distinct_from(stmt.excluded.elo),
+    )
+    db.execute(stmt, records)
+
+
+def write_ratings(db: Session, engine: EloEngine, team_ids) -> int:
+    """Verilen takımların güncel puanlarını Team tablosuna toplu yaz."""
+    now = datetime.now()
+    rows = [
+        {"id": int(team_id), "current_elo": round(float(engine.ratings[team_id]), 2), "elo_updated_at": now}
+        for team_id in sorted(set(team_ids))
+        if not np.isnan(engine.ratings[team_id])
+    ]
+    if rows:
+        db.execute(update(Team), rows)
+    return len(rows)
+
+
+def fill_match_elo(db: Session, matches: pd.DataFrame, replayed: pd.DataFrame) -> int:
+    """ELO'su olmayan (API'den gelen) maçlara maç öncesi puanları yaz."""
+    missing = (matches["home_team_elo"].isna() | matches["away_team_elo"].isna()).to_numpy()
+    if not missing.any():
+        return 0
+    rows = pd.DataFrame({
+        "id": replayed["id"].to_numpy()[missing],
+        "home_team_elo": replayed["pre_home"].to_numpy()[missing].round(2),
+        "away_team_elo": replayed["pre_away"].to_numpy()[missing].round(2),
+        "elo_source": SOURCE,
+    }).to_dict("records")
+    db.execute(update(Match), rows)
+    return len(rows)
+
+
+def refresh_fixture_elo(db: Session, engine: EloEngine) -> int:
+    """
+    Sonucu henüz belli olmayan maçların ELO'sunu güncel puanlarla tazele.
+
+    Fikstürün maç öncesi puanı, önündeki maçlar oynandıkça değişir.
+    Sadece ELO'su boş ya da daha önce motorun yazdığı fikstürler tazelenir;
+    CSV'den gelen ClubElo değerleri modelin eğitildiği ölçektedir, korunur.
+    """
+    fixtures = db.execute(
+        select(Match.id, Match.home_team_id, Match.away_team_id)
+        .where(
+            Match.ft_home.is_(None),
+            or_(
+                Match.home_team_elo.is_(None),
+                Match.away_team_elo.is_(None),
+                Match.elo_source == SOURCE,
+            ),
+        )
+    ).all()
+    if not fixtures:
+        return 0
+    engine.ensure_capacity(max(max(f.home_team_id, f.away_team_id) for f in fixtures))
+    rows = []
+    for fixture in fixtures:
+        home = engine.ratings[fixture.home_team_id]
+        away = engine.ratings[fixture.away_team_id]
+        if np.isnan(home) or np.isnan(away):
+            continue
+        rows.append({
+            "id": fixture.id,
+            "home_team_elo": round(float(home), 2),
+            "away_team_elo": round(float(away), 2),
+            "elo_source": SOURCE,
+        })
+    if rows:
+        db.execute(update(Match), rows)
+    return len(rows)
+
+
+def write_results(db: Session, engine: EloEngine, matches: pd.DataFrame, replayed: pd.DataFrame) -> dict:
+    finished = matches[matches["ft_home"].notna() & matches["ft_away"].notna()]
+    team_ids = set(finished["home_team_id"]) | set(finished["away_team_id"])
+    records = history_records(matches, replayed)
+    write_history(db, records)
+    return {
+        "matches": len(finished),
+        "history": len(records),
+        "teams": write_ratings(db, engine, team_ids),
+        "match_elo_filled": fill_match_elo(db, matches, replayed),
+        "fixtures_refreshed": refresh_fixture_elo(db, engine),
+    }
+
+
+def replay_all(db: Session, config: EloConfig | None = None) -> dict:
+    """
+    Tüm maçları baştan oyna ve native ELO kayıtlarını yeniden yaz.
+
+    İlk doldurma, parametre değişikliği ve geçmişe dönük düzeltmeler için.
+
+    Returns:
+        Yazılan maç / geçmiş kaydı / takım sayıları
+    """
+    engine = EloEngine(config)
+    matches = load_engine_matches(db, Match.ft_home.is_not(None) & Match.ft_away.is_not(None))
+    replayed = engine.replay(matches)
+
+    db.execute(delete(EloHistory).where(EloHistory.source == SOURCE))
+    summary = write_results(db, engine, matches, replayed)
+    db.commit()
+    return summary
+
+
+def apply_new_results(db: Session, config: EloConfig | None = None) -> dict:
+    """
+    Henüz uygulanmamış bitmiş maçları mevcut puanların üzerine uygula.
+
+    Başlangıç durumu Team.current_elo'dur. Uygulanmamış maç: ev sahibi
+    için o gün native elo_history kaydı olmayan bitmiş maç. Geç gelen
+    eski bir sonuç sadece sonraki puanları etkiler; tam tutarlılık için
+    replay_all çalıştırılır.
+
+    Commit çağıran tarafa bırakılır (async tarafta session.run_sync ile
+    çağrılabilir).
+    """
+    engine = EloEngine(config, load_ratings(db))
+    applied = exists().where(and_(
+        EloHistory.team_id == Match.home_team_id,
+        EloHistory.date == Match.match_date,
+        EloHistory.source == SOURCE,
+    ))
+    matches = load_engine_matches(
+        db, Match.ft_home.is_not(None) & Match.ft_away.is_not(None) & ~applied
+    )
+    replayed = engine.replay(matches)
+    summary = write_results(db, engine, matches, replayed)
+    db.flush()
+    return summary
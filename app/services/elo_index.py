@@ -0,0 +1,231 @@
+"""
+Bellek içi as-of ELO indeksi.
+
+"X takımının D tarihindeki ELO'su" sorusu için elo_history'yi her seferinde
+sorgulamak yerine tablo bir kez belleğe alınır. Kayıtlar (team_id, date)
+sırasıyla tek bir dizide tutulur; her takımın tarihleri ve puanları bu
+dizinin ardışık, tarihe göre sıralı bir dilimidir.
+
+Arama anahtarı team_id * SPAN + gün şeklinde tek bir int64'tür ve dizi bu
+anahtara göre sıralıdır. Böylece binlerce (takım, tarih) çifti tek bir
+np.searchsorted çağrısıyla (ikili arama) çözülür.
+
+Yenileme artımlıdır: son görülen id'den büyük satırlar ve updated_at'i
+son görülen değerden (UPDATE_OVERLAP kadar geriden) büyük satırlar okunur
+ve sıralı diziye yerleştirilir; yerinde güncellenen (upsert) puanlar da
+böylece görülür. Satır silinmişse (ör. replay_all) ya da son tam yüklemenin
+üzerinden FULL_RELOAD_SECONDS geçtiyse indeks baştan yüklenir.
+
+Okuyucular her zaman tutarlı bir görüntü görür: yeni diziler hazırlanıp
+tek atama ile yayınlanır.
+"""
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import EloHistory
+
+ELO_SOURCES = ("clubelo", "native")
+
+# Anahtar = team_id * SPAN + (gün + DAY_OFFSET); gün 1970'ten itibaren
+SPAN = 1 << 20
+DAY_OFFSET = 1 << 19
+EPOCH = np.datetime64("1970-01-01", "D")
+
+# updated_at = now() transaction başlangıcıdır; geç commit edilen satırlar için pay
+UPDATE_OVERLAP = timedelta(minutes=5)
+FULL_RELOAD_SECONDS = 60 * 60
+
+
+def day_numbers(dates) -> np.ndarray:
+    """date / datetime64 dizisini 1970'ten itibaren gün sayısına çevir."""
+    return (np.asarray(dates, dtype="datetime64[D]") - EPOCH).astype(np.int64)
+
+
+def make_keys(team_ids, days) -> np.ndarray:
+    return np.asarray(team_ids, dtype=np.int64) * SPAN + (np.asarray(days, dtype=np.int64) + DAY_OFFSET)
+
+
+class EloIndexState:
+    """İndeksin değişmez bir görüntüsü."""
+
+    def __init__(
+        self,
+        keys: np.ndarray,
+        values: np.ndarray,
+        last_id: int,
+        rows: int,
+        last_updated: datetime | None = None,
+    ):
+        self.keys = keys
+        self.values = values
+        self.last_id = last_id
+        self.rows = rows
+        self.last_updated = last_updated
+
+
+EMPTY_STATE = EloIndexState(np.empty(0, dtype=np.int64), np.empty(0), 0, 0)
+
+
+def merge_rows(state: EloIndexState, keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Yeni (anahtar, değer) satırlarını sıralı diziye yerleştir; aynı anahtar güncellenir."""
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+    # Aynı anahtar iki kez geldiyse sonuncusu kalır
+    last = np.append(keys[1:] != keys[:-1], True)
+    keys, values = keys[last], values[last]
+
+    positions = np.searchsorted(state.keys, keys)
+    found = positions < len(state.keys)
+    found[found] = state.keys[positions[found]] == keys[found]
+
+    merged_values = state.values.copy()
+    merged_values[positions[found]] = values[found]
+    new = ~found
+    return (
+        np.insert(state.keys, positions[new], keys[new]),
+        np.insert(merged_values, positions[new], values[new]),
+    )
+
+
+class EloIndex:
+    """Tek bir ELO kaynağı (clubelo / native) için as-of indeksi."""
+
+    def __init__(self, source: str = "clubelo"):
+        self.source = source
+        self.state = EMPTY_STATE
+        self.loaded_at: float | None = None
+        self.reloaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def fetch(self, db: Session, after_id: int = 0, updated_since: datetime | None = None):
+        """
+        id'si after_id'den büyük ya da updated_since'ten sonra güncellenmiş satırlar.
+
+        Returns:
+            (satırların id'leri, anahtarlar, puanlar, en son updated_at) ya da None
+        """
+        condition = EloHistory.id > after_id
+        if updated_since is not None:
+            condition = or_(condition, EloHistory.updated_at > updated_since)
+        result = db.execute(
+            select(EloHistory.id, EloHistory.team_id, EloHistory.date, EloHistory.elo, EloHistory.updated_at)
+            .where(EloHistory.source == self.source, condition)
+            .order_by(EloHistory.id)
+        ).all()
+        if not result:
+            return None
+        ids, team_ids, dates, values, updated = zip(*result)
+        keys = make_keys(team_ids, day_numbers(dates))
+        last_updated = max((value for value in updated if value is not None), default=None)
+        return np.asarray(ids, dtype=np.int64), keys, np.asarray(values, dtype=float), last_updated
+
+    def reload(self, db: Session) -> int:
+        """Tüm kaynağı baştan yükle. Returns: satır sayısı."""
+        fetched = self.fetch(db)
+        if fetched is None:
+            self.state = EMPTY_STATE
+        else:
+            ids, keys, values, last_updated = fetched
+            merged_keys, merged_values = merge_rows(EMPTY_STATE, keys, values)
+            self.state = EloIndexState(merged_keys, merged_values, int(ids.max()), len(keys), last_updated)
+        self.loaded_at = self.reloaded_at = time.monotonic()
+        return len(self.state.keys)
+
+    def refresh(self, db: Session) -> int:
+        """
+        Son yüklemeden sonra eklenen ya da güncellenen satırları indekse ekle.
+
+        Returns:
+            Okunan satır sayısı
+        """
+        state = self.state
+        if self.reloaded_at is None or time.monotonic() - self.reloaded_at >= FULL_RELOAD_SECONDS:
+            return self.reload(db)
+
+        total, = db.execute(
+            select(func.count()).where(EloHistory.source == self.source)
+        ).one()
+        since = state.last_updated - UPDATE_OVERLAP if state.last_updated is not None else None
+        fetched = self.fetch(db, state.last_id, since)
+        new_rows = 0 if fetched is None else int((fetched[0] > state.last_id).sum())
+        if total != state.rows + new_rows:
+            # Aradan satır silinmiş: artımlı birleştirme güvenli değil
+            return self.reload(db)
+
+        if fetched is not None:
+            ids, keys, values, last_updated = fetched
+            merged_keys, merged_values = merge_rows(state, keys, values)
+            if state.last_updated is not None and (last_updated is None or last_updated < state.last_updated):
+                last_updated = state.last_updated
+            self.state = EloIndexState(
+                merged_keys, merged_values, max(state.last_id, int(ids.max())), total, last_updated,
+            )
+        self.loaded_at = time.monotonic()
+        return 0 if fetched is None else len(fetched[1])
+
+    async def ensure_fresh(self, db: AsyncSession, max_age: float) -> None:
+        """İndeks hiç yüklenmediyse yükle, max_age saniyeden eskiyse artımlı yenile."""
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < max_age:
+            return
+        async with self._lock:
+            if self.loaded_at is None:
+                await db.run_sync(self.reload)
+            elif time.monotonic() - self.loaded_at >= max_age:
+                await db.run_sync(self.refresh)
+
+    def asof_many(self, team_ids, dates, strict: bool = False) -> np.ndarray:
+        """
+        Vektörel as-of arama: her (takım, tarih) için o tarihteki son puan.
+
+        strict=True ise sadece tarihten ÖNCEKİ kayıtlar kullanılır (maç günü
+        yazılan maç sonrası native puanlar için feature leakage'ı önler).
+
+        Returns:
+            Puanlar; kaydı olmayan çiftler NaN
+        """
+        state = self.state
+        team_ids = np.asarray(team_ids, dtype=np.int64)
+        queries = make_keys(team_ids, day_numbers(dates))
+        positions = np.searchsorted(state.keys, queries, side="left" if strict else "right") - 1
+
+        result = np.full(len(queries), np.nan)
+        valid = positions >= 0
+        valid[valid] = state.keys[positions[valid]] // SPAN == team_ids[valid]
+        result[valid] = state.values[positions[valid]]
+        return result
+
+    def asof(self, team_id: int, on: date, strict: bool = False) -> tuple[date, float] | None:
+        """Tek takım için as-of arama: (kaydın tarihi, puan) ya da None."""
+        state = self.state
+        key = make_keys([team_id], day_numbers([on]))[0]
+        position = np.searchsorted(state.keys, key, side="left" if strict else "right") - 1
+        if position < 0 or state.keys[position] // SPAN != team_id:
+            return None
+        day = int(state.keys[position] % SPAN - DAY_OFFSET)
+        return (EPOCH + np.timedelta64(day, "D")).item(), float(state.values[position])
+
+    def history(
+        self, team_id: int, start: date | None = None, end: date | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Takımın [start, end] aralığındaki (tarihler, puanlar) dizileri."""
+        state = self.state
+        lower = team_id * SPAN
+        if start is not None:
+            lower = make_keys([team_id], day_numbers([start]))[0]
+        upper = (team_id + 1) * SPAN
+        if end is not None:
+            upper = make_keys([team_id], day_numbers([end]))[0] + 1
+        lo, hi = np.searchsorted(state.keys, [lower, upper])
+        days = state.keys[lo:hi] % SPAN - DAY_OFFSET
+        return EPOCH + days.astype("timedelta64[D]"), state.values[lo:hi]
+
+
+# Süreç başına tek indeks (kaynak başına)
+elo_indexes = {source: EloIndex(source) for source in ELO_SOURCES}
@@ -0,0 +1,414 @@
+"""
+CPU-yoğun işler için process pool.
+
+Model skorlama ve pandas feature hesabı event loop'u (ve dolayısıyla
+/health, /auth/login gibi tüm istekleri) bloklamasın diye sınırlı bir
+process pool'da çalıştırılır. Worker'lar spawn ile başlar ve başlangıçta
+aktif modelleri (memory-map) ve ayarlıysa native ELO indeksini yükler; iş
+sırasında model yüklenmez (hot-swap sonrası ilk işte bir kez yüklenir).
+ELO indeksi elo_refresh_seconds'tan eskiyse işten önce artımlı yenilenir.
+Pool kapalıyken (workers=0) aynı indeks ana süreçte tutulur; iki yol da
+feature'ları aynı şekilde (_build_features) hesaplar.
+
+Büyük diziler pickle edilmez: ana süreç girdi ve çıktı için
+SharedMemory blokları ayırır, worker'a sadece blok adı ve yerleşim
+(descriptor) gönderilir. Worker bloklara bağlanıp okur/yazar, bloklar ana
+süreçte kapatılır ve silinir.
+
+Kuyruk sınırlıdır: aynı anda en fazla workers + max_queue iş kabul edilir,
+fazlası slot boşalana kadar bekler. metrics() kuyruk derinliği ve doluluk
+oranını raporlar.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from app.services.features import FEATURE_NAMES, build_fixture_features, fill_elo_from_index
+from app.services.model_registry import LoadedModel
+
+logger = logging.getLogger(__name__)
+
+
+# --- Shared memory yardımcıları -------------------------------------------
+
+def frame_arrays(frame: pd.DataFrame) -> dict[str, np.ndarray]:
+    """
+    DataFrame kolonlarını sabit genişlikli NumPy dizilerine çevir (NA -> NaN/NaT).
+
+    Sadece match_date ve gerçek datetime kolonları datetime64 olur. pd.read_sql
+    tamamı NULL olan sayısal kolonları (fikstürlerde skor, şut, oran) object
+    (None) döndürür; diğer object kolonlar float'a çevrilir.
+    """
+    arrays = {}
+    for col in frame.columns:
+        series = frame[col]
+        if col == "match_date" or pd.api.types.is_datetime64_any_dtype(series):
+            arrays[col] = pd.to_datetime(series).to_numpy("datetime64[ns]")
+        elif series.dtype == object:
+            arrays[col] = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+        elif pd.api.types.is_bool_dtype(series) and not series.hasnans:
+            arrays[col] = series.to_numpy(bool)
+        elif pd.api.types.is_integer_dtype(series) and not series.hasnans:
+            arrays[col] = series.to_numpy(np.int64)
+        else:
+            arrays[col] = series.astype(float).to_numpy()
+    return arrays
+
+
+def share_arrays(arrays: dict[str, np.ndarray]) -> tuple[shared_memory.SharedMemory, dict]:
+    """
+    Dizileri tek bir SharedMemory bloğuna kopyala.
+
+    Returns:
+        (blok, descriptor); descriptor worker'a gönderilir
+    """
+    layout = []
+    offset = 0
+    for name, array in arrays.items():
+        layout.append((name, array.dtype.str, array.shape, offset))
+        offset += -(-array.nbytes // 8) * 8
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+    for (name, dtype, shape, start), array in zip(layout, arrays.values()):
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=start)[...] = array
+    return block, {"name": block.name, "layout": layout}
+
+
+def allocate_array(shape: tuple, dtype=np.float64) -> tuple[shared_memory.SharedMemory, dict]:
+    """Worker'ın yazacağı boş bir çıktı bloğu ayır."""
+    dtype = np.dtype(dtype)
+    block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 8))
+    return block, {"name": block.name, "layout": [("out", dtype.str, shape, 0)]}
+
+
+def views(block: shared_memory.SharedMemory, descriptor: dict) -> dict[str, np.ndarray]:
+    """Bloğun üzerindeki diziler (kopyasız görünümler)."""
+    return {
+        name: np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+        for name, dtype, shape, offset in descriptor["layout"]
+    }
+
+
+def attach(descriptor: dict) -> tuple[shared_memory.SharedMemory, dict[str, np.ndarray]]:
+    """Başka süreçte açılmış bloğa bağlan."""
+    block = shared_memory.SharedMemory(name=descriptor["name"])
+    return block, views(block, descriptor)
+
+
+def release(block: shared_memory.SharedMemory, unlink: bool = False) -> None:
+    block.close()
+    if unlink:
+        block.unlink()
+
+
+# --- Worker tarafı -----------------------------------------------------------
+
+# Worker süreci başına yüklenen modeller ve indeksler
+_models: dict[str, LoadedModel] = {}
+_elo_index = None
+_elo_engine = None
+_elo_refresh_seconds = 60.0
+_elo_lock = threading.Lock()
+
+
+def model_spec(model: LoadedModel) -> dict:
+    """Worker'ın modeli yükleyebilmesi için gereken MLModel alanları."""
+    return {
+        "id": model.id,
+        "name": model.name,
+        "version": model.version,
+        "file_path": str(model.path),
+        "feature_names": model.feature_names,
+    }
+
+
+def _load_spec(spec: dict) -> LoadedModel:
+    from app.models import MLModel
+    from app.services.model_registry import load_model
+
+    record = MLModel(**spec)
+    loaded = load_model(record)
+    _models[spec["name"]] = loaded
+    return loaded
+
+
+def _configure_elo(database_url: str | None, refresh_seconds: float) -> None:
+    """Bu süreçteki native ELO indeksini ayarla (database_url yoksa kapalı)."""
+    global _elo_index, _elo_engine, _elo_refresh_seconds
+    if _elo_engine is not None:
+        _elo_engine.dispose()
+    _elo_index = None
+    _elo_engine = None
+    _elo_refresh_seconds = refresh_seconds
+    if database_url:
+        from sqlalchemy import create_engine
+
+        from app.services.elo_index import EloIndex
+
+        _elo_engine = create_engine(database_url, pool_size=1, max_overflow=0)
+        _elo_index = EloIndex("native")
+
+
+def _current_elo_index():
+    """
+    Native ELO indeksi; hiç yüklenmediyse yüklenir, refresh_seconds'tan
+    eskiyse artımlı yenilenir. Veritabanı hatasında eldeki görüntü kullanılır
+    ve bir sonraki deneme refresh_seconds sonra yapılır.
+    """
+    if _elo_index is None:
+        return None
+    with _elo_lock:
+        loaded_at = _elo_index.loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= _elo_refresh_seconds:
+            from sqlalchemy.orm import Session
+
+            try:
+                with Session(_elo_engine) as db:
+                    if loaded_at is None:
+                        _elo_index.reload(db)
+                    else:
+                        _elo_index.refresh(db)
+            except Exception:
+                logger.exception("Native ELO indeksi yenilenemedi")
+                _elo_index.loaded_at = time.monotonic()
+    return _elo_index
+
+
+def _init_worker(model_specs: list[dict], database_url: str | None, elo_refresh_seconds: float) -> None:
+    """Worker başlangıcı: aktif modelleri ve native ELO indeksini yükle."""
+    for spec in model_specs:
+        try:
+            _load_spec(spec)
+        except Exception:
+            logger.exception(f"Worker model yükleyemedi: {spec['name']} {spec['version']}")
+
+    _configure_elo(database_url, elo_refresh_seconds)
+    _current_elo_index()
+
+
+def _worker_model(spec: dict) -> LoadedModel:
+    model = _models.get(spec["name"])
+    if model is None or model.key != (spec["id"], spec["version"]):
+        # Hot-swap sonrası: yeni versiyon bu worker'da bir kez yüklenir
+        model = _load_spec(spec)
+    return model
+
+
+def _frame_from(arrays: dict[str, np.ndarray]) -> pd.DataFrame:
+    frame = pd.DataFrame({name: array.copy() for name, array in arrays.items()})
+    if "match_date" in frame:
+        frame["match_date"] = frame["match_date"].dt.date
+    return frame
+
+
+def _build_features(history: pd.DataFrame, fixtures: pd.DataFrame) -> pd.DataFrame:
+    """Eksik fikstür ELO'larını native indeksten doldurup feature matrisini kur."""
+    index = _current_elo_index()
+    if index is not None:
+        fixtures = fill_elo_from_index(fixtures, index)
+    return build_fixture_features(history, fixtures)
+
+
+def _features_job(history_desc: dict, fixtures_desc: dict, out_desc: dict) -> int:
+    """Fikstür feature matrisini hesapla ve çıktı bloğuna yaz."""
+    history_block, history_arrays = attach(history_desc)
+    fixtures_block, fixtures_arrays = attach(fixtures_desc)
+    out_block, out_arrays = attach(out_desc)
+    try:
+        history = _frame_from(history_arrays)
+        fixtures = _frame_from(fixtures_arrays)
+        matrix = _build_features(history, fixtures)
+        out_arrays["out"][...] = matrix[FEATURE_NAMES].astype(float).to_numpy()
+        return len(matrix)
+    finally:
+        # Görünümler bırakılmadan blok kapatılamaz
+        del history_arrays, fixtures_arrays, out_arrays
+        release(history_block)
+        release(fixtures_block)
+        release(out_block)
+
+
+def _score_job(matrix_desc: dict, spec: dict, out_desc: dict) -> None:
+    """Modelin olasılıklarını çıktı bloğuna yaz."""
+    model = _worker_model(spec)
+    matrix_block, matrix_arrays = attach(matrix_desc)
+    out_block, out_arrays = attach(out_desc)
+    try:
+        columns = [FEATURE_NAMES.index(name) for name in model.feature_names]
+        features = matrix_arrays["matrix"][:, columns]
+        out_arrays["out"][...] = model.estimator.predict_proba(features)
+    finally:
+        del matrix_arrays, out_arrays
+        release(matrix_block)
+        release(out_block)
+
+
+# --- Ana süreç tarafı ----------------------------------------------------------
+
+class ExecutorMetrics:
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+        self.waiting = 0
+        self.busy_seconds = 0.0
+
+
+class ComputeExecutor:
+    """
+    Sınırlı process pool.
+
+    workers=0 ise pool açılmaz, işler thread'de (asyncio.to_thread)
+    çalıştırılır; geliştirme ortamı ve testler için. ELO indeksi o durumda
+    ana süreçte tutulur.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 64):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.metrics_data = ExecutorMetrics()
+        self.started_at = time.monotonic()
+        self._pool: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._pool is not None
+
+    def start(
+        self,
+        models: dict[str, LoadedModel],
+        database_url: str | None = None,
+        workers: int | None = None,
+        max_queue: int | None = None,
+        elo_refresh_seconds: float = 60.0,
+    ) -> None:
+        """
+        Pool'u aç; worker'lar models'i ve (database_url verilirse) native
+        ELO indeksini yükleyerek başlar. database_url sync (psycopg2) URL'sidir.
+        """
+        if workers is not None:
+            self.workers = workers
+        if max_queue is not None:
+            self.max_queue = max_queue
+        if self.workers <= 0:
+            # Thread yolu: indeks ilk işte bu süreçte yüklenir
+            _configure_elo(database_url, elo_refresh_seconds)
+            return
+        context = multiprocessing.get_context("spawn")
+        specs = [model_spec(model) for model in models.values()]
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(specs, database_url, elo_refresh_seconds),
+        )
+        self._slots = asyncio.Semaphore(self.workers + self.max_queue)
+        self.started_at = time.monotonic()
+
+    def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        _configure_elo(None, _elo_refresh_seconds)
+
+    async def run(self, fn, *args):
+        """fn(*args)'ı pool'da çalıştır; kuyruk doluysa slot bekle."""
+        metrics = self.metrics_data
+        metrics.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            metrics.waiting -= 1
+
+        metrics.submitted += 1
+        metrics.running += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+            metrics.completed += 1
+            return result
+        except Exception:
+            metrics.failed += 1
+            raise
+        finally:
+            metrics.running -= 1
+            metrics.busy_seconds += time.perf_counter() - started
+            self._slots.release()
+
+    async def build_features(self, history: pd.DataFrame, fixtures: pd.DataFrame) -> pd.DataFrame:
+        """build_fixture_features'ın pool karşılığı (index=match_id, FEATURE_NAMES)."""
+        if not self.enabled:
+            return await asyncio.to_thread(_build_features, history, fixtures)
+
+        history_block, history_desc = share_arrays(frame_arrays(history))
+        fixtures_block, fixtures_desc = share_arrays(frame_arrays(fixtures))
+        out_block, out_desc = allocate_array((len(fixtures), len(FEATURE_NAMES)))
+        try:
+            await self.run(_features_job, history_desc, fixtures_desc, out_desc)
+            values = views(out_block, out_desc)["out"].copy()
+        finally:
+            release(history_block, unlink=True)
+            release(fixtures_block, unlink=True)
+            release(out_block, unlink=True)
+
+        index = pd.Index(fixtures["id"].to_numpy(), name="match_id")
+        return pd.DataFrame(values, index=index, columns=FEATURE_NAMES)
+
+    async def predict_proba(self, matrix: pd.DataFrame, models: dict[str, LoadedModel]) -> dict[str, np.ndarray]:
+        """Her market için olasılıklar; matris bir kez paylaşılır, marketler paralel skorlanır."""
+        if not self.enabled:
+            return await asyncio.to_thread(
+                lambda: {market: model.predict_proba(matrix) for market, model in models.items()}
+            )
+
+        matrix_block, matrix_desc = share_arrays(
+            {"matrix": matrix[FEATURE_NAMES].astype(float).to_numpy()}
+        )
+        outputs = {
+            market: allocate_array((len(matrix), len(model.classes)))
+            for market, model in models.items()
+        }
+        try:
+            await asyncio.gather(*[
+                self.run(_score_job, matrix_desc, model_spec(models[market]), desc)
+                for market, (_, desc) in outputs.items()
+            ])
+            return {
+                market: views(block, desc)["out"].copy()
+                for market, (block, desc) in outputs.items()
+            }
+        finally:
+            release(matrix_block, unlink=True)
+            for block, _ in outputs.values():
+                release(block, unlink=True)
+
+    def metrics(self) -> dict:
+        metrics = self.metrics_data
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        capacity = max(self.workers, 1)
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": metrics.running,
+            # Pool'a verilmiş ama worker bekleyen + slot bekleyen işler
+            "queue_depth": max(metrics.running - self.workers, 0) + metrics.waiting,
+            "saturation": round(min(metrics.running / capacity, 1.0), 3),
+            "utilization": round(metrics.busy_seconds / (elapsed * capacity), 3),
+            "submitted": metrics.submitted,
+            "completed": metrics.completed,
+            "failed": metrics.failed,
+        }
+
+
+# Süreç başına tek executor (main.py lifespan'da başlatılır)
+compute_executor = ComputeExecutor()
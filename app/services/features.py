@@ -0,0 +1,192 @@
+"""
+Point-in-time feature matrisi.
+
+Her maç için iki takımın maç öncesi formu ve son maç istatistikleri
+hesaplanır. Maçlar bir kez sıralanır, ev sahibi/deplasman perspektifleri
+alt alta dizilir ve pencereli toplamlar takım bazında gruplanmış kümülatif
+toplam farklarıyla (vektörel) bulunur; maç başına Python döngüsü yoktur.
+
+Leakage yok: bir maçın feature'ları sadece o takımın daha önceki
+maçlarından gelir (kümülatif toplamlar bir satır kaydırılır). Sonucu henüz
+belli olmayan maçlar da aynı şekilde feature alır, bu yüzden aynı fonksiyon
+eğitimde ve tahmin anında kullanılır.
+"""
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Match
+
+# Feature hesabı için gereken Match kolonları
+SOURCE_COLUMNS = [
+    "id", "division_id", "match_date", "home_team_id", "away_team_id",
+    "home_team_elo", "away_team_elo", "ft_home", "ft_away",
+    "home_shots_target", "away_shots_target", "home_corners", "away_corners",
+    "home_yellow", "away_yellow", "home_red", "away_red",
+    "odd_home", "odd_draw", "odd_away", "odd_over25", "odd_under25",
+]
+
+# Takım perspektifindeki ham değerler: (alan, ev sahibi kolonu, deplasman kolonu)
+PERSPECTIVE_COLUMNS = [
+    ("goals_for", "ft_home", "ft_away"),
+    ("goals_against", "ft_away", "ft_home"),
+    ("shots_target", "home_shots_target", "away_shots_target"),
+    ("corners", "home_corners", "away_corners"),
+    ("corners_against", "away_corners", "home_corners"),
+    ("yellow", "home_yellow", "away_yellow"),
+    ("red", "home_red", "away_red"),
+]
+
+FORM_WINDOWS = (3, 5)
+STATS_WINDOW = 5
+AVERAGED_FIELDS = ["goals_for", "goals_against", "shots_target", "corners", "corners_against", "cards"]
+
+TEAM_FEATURES = (
+    [f"form{w}" for w in FORM_WINDOWS]
+    + [f"avg_{field}_{STATS_WINDOW}" for field in AVERAGED_FIELDS]
+    + ["matches_played", "rest_days"]
+)
+MATCH_FEATURES = [
+    "home_team_elo", "away_team_elo", "elo_diff",
+    "odd_home", "odd_draw", "odd_away", "odd_over25", "odd_under25",
+]
+FEATURE_NAMES = (
+    [f"home_{name}" for name in TEAM_FEATURES]
+    + [f"away_{name}" for name in TEAM_FEATURES]
+    + [f"diff_{name}" for name in ("form5", f"avg_goals_for_{STATS_WINDOW}", f"avg_goals_against_{STATS_WINDOW}")]
+    + MATCH_FEATURES
+)
+
+
+def load_matches_frame(db: Session, where=None) -> pd.DataFrame:
+    """Feature hesabı için gereken maç kolonlarını oku."""
+    query = select(*[getattr(Match, col) for col in SOURCE_COLUMNS])
+    if where is not None:
+        query = query.where(where)
+    return pd.read_sql(query, db.connection())
+
+
+def stack_perspectives(matches: pd.DataFrame) -> pd.DataFrame:
+    """Her maçı ev sahibi ve deplasman için iki satıra aç (takım perspektifi)."""
+    sides = []
+    for is_home, team_col in ((True, "home_team_id"), (False, "away_team_id")):
+        side = pd.DataFrame({
+            "match_id": matches["id"].to_numpy(),
+            "match_date": matches["match_date"].to_numpy(),
+            "team_id": matches[team_col].to_numpy(),
+            "is_home": is_home,
+        })
+        for field, home_col, away_col in PERSPECTIVE_COLUMNS:
+            side[field] = matches[home_col if is_home else away_col].astype(float).to_numpy()
+        sides.append(side)
+
+    long = pd.concat(sides, ignore_index=True)
+    long["cards"] = long["yellow"] + 2 * long["red"].fillna(0)
+    diff = long["goals_for"] - long["goals_against"]
+    long["points"] = np.select([diff > 0, diff == 0, diff < 0], [3.0, 1.0, 0.0], default=np.nan)
+    return long.sort_values(["team_id", "match_date", "match_id"], kind="stable", ignore_index=True)
+
+
+def prior_window(long: pd.DataFrame, column: str, window: int | None) -> tuple[pd.Series, pd.Series]:
+    """
+    Her satır için takımın ÖNCEKİ en fazla window maçındaki toplam ve değer sayısı.
+
+    window=None tüm geçmiş demektir. Eksik değerler atlanır.
+    """
+    groups = long["team_id"]
+    values = long[column]
+    total = values.fillna(0.0).groupby(groups).cumsum()
+    count = values.notna().astype(float).groupby(groups).cumsum()
+
+    prior_total = total.groupby(groups).shift(1, fill_value=0.0)
+    prior_count = count.groupby(groups).shift(1, fill_value=0.0)
+    if window is not None:
+        prior_total = prior_total - total.groupby(groups).shift(window + 1, fill_value=0.0)
+        prior_count = prior_count - count.groupby(groups).shift(window + 1, fill_value=0.0)
+    return prior_total, prior_count
+
+
+def team_features(long: pd.DataFrame) -> pd.DataFrame:
+    """Takım perspektifindeki satırlar için maç öncesi feature'lar."""
+    features = pd.DataFrame({"match_id": long["match_id"], "is_home": long["is_home"]})
+
+    for window in FORM_WINDOWS:
+        points, played = prior_window(long, "points", window)
+        features[f"form{window}"] = points.where(played > 0)
+
+    for field in AVERAGED_FIELDS:
+        total, count = prior_window(long, field, STATS_WINDOW)
+        features[f"avg_{field}_{STATS_WINDOW}"] = (total / count.replace(0, np.nan)).round(3)
+
+    _, played = prior_window(long, "points", None)
+    features["matches_played"] = played
+    dates = pd.to_datetime(long["match_date"])
+    features["rest_days"] = (dates - dates.groupby(long["team_id"]).shift(1)).dt.days
+    return features
+
+
+def build_feature_matrix(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Match.id'ye hizalı, leakage içermeyen feature matrisi.
+
+    Args:
+        matches: SOURCE_COLUMNS kolonlarına sahip maçlar (bitmiş ve/veya gelecek)
+
+    Returns:
+        index=match_id, kolonlar=FEATURE_NAMES
+    """
+    matches = matches.sort_values(["match_date", "id"], kind="stable", ignore_index=True)
+    features = team_features(stack_perspectives(matches))
+
+    home = features[features["is_home"]].drop(columns="is_home").set_index("match_id")
+    away = features[~features["is_home"]].drop(columns="is_home").set_index("match_id")
+    matrix = home.add_prefix("home_").join(away.add_prefix("away_"), how="inner")
+
+    for name in ("form5", f"avg_goals_for_{STATS_WINDOW}", f"avg_goals_against_{STATS_WINDOW}"):
+        matrix[f"diff_{name}"] = matrix[f"home_{name}"] - matrix[f"away_{name}"]
+
+    match_cols = matches.set_index("id")
+    for col in MATCH_FEATURES:
+        if col == "elo_diff":
+            matrix[col] = match_cols["home_team_elo"] - match_cols["away_team_elo"]
+        else:
+            matrix[col] = match_cols[col]
+
+    matrix.index.name = "match_id"
+    return matrix.loc[matches["id"], FEATURE_NAMES]
+
+
+def build_fixture_features(history: pd.DataFrame, fixtures: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tahmin anı: geçmiş maçlar + henüz oynanmamış fikstürler için feature'lar.
+
+    Fikstürlerin sonucu bilinmediğinden kendi satırları hiçbir feature'a
+    katkı yapmaz; sadece fikstür satırları döndürülür.
+    """
+    history = history[~history["id"].isin(fixtures["id"])]
+    matrix = build_feature_matrix(pd.concat([history, fixtures], ignore_index=True))
+    return matrix.loc[fixtures["id"]]
+
+
+def fill_elo_from_index(matches: pd.DataFrame, index) -> pd.DataFrame:
+    """
+    Eksik home_team_elo / away_team_elo değerlerini as-of ELO indeksinden doldur.
+
+    Maç gününden ÖNCEKİ son kayıt kullanılır (strict), böylece maç sonrası
+    yazılan native puanlar feature'a sızmaz. index: app.services.elo_index.EloIndex
+    """
+    matches = matches.copy()
+    for team_col, elo_col in (("home_team_id", "home_team_elo"), ("away_team_id", "away_team_elo")):
+        missing = matches[elo_col].isna().to_numpy()
+        if missing.any():
+            # pandas copy-on-write: to_numpy() salt-okunur görünüm döndürebilir
+            values = matches[elo_col].to_numpy(dtype=float, copy=True)
+            values[missing] = index.asof_many(
+                matches[team_col].to_numpy()[missing],
+                pd.to_datetime(matches["match_date"]).to_numpy()[missing],
+                strict=True,
+            )
+            matches[elo_col] = values
+    return matches
@@ -0,0 +1,475 @@
+"""
+API-Football -> matches senkronizasyonu.
+
+Arka planda, ayarlı her lig için periyodik olarak:
+
+1. Fikstürler çekilir. İlk turda sezonun tamamı, sonraki turlarda sadece
+   lig watermark'ından (sync_states'te "fixtures:<lig id>") itibaren
+   lookahead_days sonrasına kadarki aralık (fixtures?league&season&from&to).
+   Watermark, yazılan maçlardan henüz sonuçlanmamış en erken maçın
+   tarihidir; hepsi sonuçlandıysa görülen en son maçın tarihi. Eşlenemeyen
+   bir maç varsa watermark onun tarihini geçmez. Böylece her tur sadece
+   değişebilecek (ya da henüz yazılamamış) maçları ister.
+2. API takım ve lig isimleri Team.name_api / Division.name_api ile
+   eşlenir. Eşlenemeyen maçlar atlanır (CSV'deki isimlerle çift kayıt
+   açılmasın diye takım otomatik eklenmez) ve loglanır.
+3. Maçlar doğal anahtar (tarih, ev sahibi, deplasman) üzerinden tek bir
+   INSERT ... ON CONFLICT DO UPDATE ile yazılır. Skor alanlarında API
+   değeri, CSV kaynaklı istatistiklerde mevcut değer önceliklidir. Hiçbir
+   kolonu değişmeyen satırlar güncellenmez (updated_at ilerlemez; tahmin
+   cache'i ve settlement gereksiz yere tetiklenmez).
+4. Son STATISTICS_LOOKBACK_DAYS gün içinde bitmiş, istatistiği henüz
+   olmayan maçlar için fixtures/statistics çekilir (possession, xG,
+   ofsayt, kurtarış ...) ve toplu UPDATE ile yazılır. Bu aralık fikstür
+   aralığından bağımsızdır: watermark ilerledikten sonra istatistiği
+   alınamamış maçlar da tekrar denenir.
+5. postprocess açıksa yeni biten maçlar team_stats, native ELO ve tahmin
+   sonuçlandırmaya uygulanır (üçü de idempotent).
+
+Tüm istekler BACKFILL önceliğiyle gönderilir; canlı ve kullanıcı
+istekleri zamanlayıcıda öne geçer.
+
+uvicorn --workers N ile her worker kendi FixtureSync'ini başlatır; lock_path
+verilmişse dosya kilidi (fcntl.flock) alan tek worker senkronizasyonu
+yürütür, diğerleri her turda kilidi yeniden dener. Kilit, sahibi olan
+süreç ölünce işletim sistemi tarafından bırakılır. fcntl olmayan
+platformlarda kilit yoktur.
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Division, Match, MatchResult, SyncState, Team
+from app.services.api_cache import FINISHED_STATUSES
+from app.services.api_football import ApiFootballClient
+from app.services.api_scheduler import Priority
+from app.services.elo import apply_new_results
+from app.services.settlement import settle_predictions
+from app.services.team_stats import update_team_stats
+
+logger = logging.getLogger(__name__)
+
+SOURCE = "api"
+
+# Sonucu kesinleşmiş sayılan durumlar (watermark bunları geçebilir)
+FINAL_STATUSES = FINISHED_STATUSES | {"PST"}
+
+# İstatistiği eksik bitmiş maçların kaç gün geriye kadar tekrar deneneceği
+STATISTICS_LOOKBACK_DAYS = 14
+
+# API istatistik tipi -> Match kolon soneki
+STATISTICS = {
+    "Ball Possession": "possession",
+    "expected_goals": "xg",
+    "Offsides": "offsides",
+    "Goalkeeper Saves": "saves",
+    "Total Shots": "shots",
+    "Shots on Goal": "shots_target",
+    "Corner Kicks": "corners",
+    "Fouls": "fouls",
+    "Yellow Cards": "yellow",
+    "Red Cards": "red",
+}
+# Bu istatistiklerde boş değer 0 demektir
+COUNT_STATISTICS = {"offsides", "saves", "shots", "shots_target", "corners", "fouls", "yellow", "red"}
+# CSV'de de bulunan kolonlar: mevcut değer korunur
+CSV_STATISTICS = {"shots", "shots_target", "corners", "fouls", "yellow", "red"}
+
+SCORE_COLUMNS = ["match_time", "ft_home", "ft_away", "ft_result", "ht_home", "ht_away", "ht_result"]
+STATISTIC_COLUMNS = [f"{side}_{name}" for name in STATISTICS.values() for side in ("home", "away")]
+
+
+def current_season(today: date | None = None) -> int:
+    """api-sports sezonu başlangıç yılıdır (Temmuz-Haziran)."""
+    today = today or date.today()
+    return today.year - (today.month < 7)
+
+
+def state_name(league_id: int) -> str:
+    return f"fixtures:{league_id}"
+
+
+def result_of(home: int | None, away: int | None) -> MatchResult | None:
+    if home is None or away is None:
+        return None
+    if home > away:
+        return MatchResult.HOME
+    if home < away:
+        return MatchResult.AWAY
+    return MatchResult.DRAW
+
+
+def fixture_record(item: dict, division_id: int, team_ids: dict[str, int]) -> dict | None:
+    """API fikstürünü Match satırına çevir; takım eşlenemezse None."""
+    home_id = team_ids.get(item["teams"]["home"]["name"])
+    away_id = team_ids.get(item["teams"]["away"]["name"])
+    if home_id is None or away_id is None:
+        return None
+
+    kickoff = datetime.fromisoformat(item["fixture"]["date"])
+    finished = item["fixture"]["status"]["short"] in FINISHED_STATUSES
+    fulltime = item.get("score", {}).get("fulltime") or item.get("goals") or {}
+    halftime = item.get("score", {}).get("halftime") or {}
+    ft_home, ft_away = (fulltime.get("home"), fulltime.get("away")) if finished else (None, None)
+    ht_home, ht_away = halftime.get("home"), halftime.get("away")
+    return {
+        "division_id": division_id,
+        "match_date": kickoff.date(),
+        "match_time": kickoff.time().replace(tzinfo=None),
+        "home_team_id": home_id,
+        "away_team_id": away_id,
+        "ft_home": ft_home,
+        "ft_away": ft_away,
+        "ft_result": result_of(ft_home, ft_away),
+        "ht_home": ht_home,
+        "ht_away": ht_away,
+        "ht_result": result_of(ht_home, ht_away),
+        "source": SOURCE,
+    }
+
+
+def parse_statistic(value, name: str):
+    if value is None:
+        return 0 if name in COUNT_STATISTICS else None
+    if isinstance(value, str):
+        value = value.rstrip("%")
+        try:
+            return float(value) if name == "xg" else int(float(value))
+        except ValueError:
+            return None
+    return float(value) if name == "xg" else int(value)
+
+
+def statistics_record(match_id: int, payload: dict) -> dict | None:
+    """fixtures/statistics yanıtını Match kolonlarına çevir; boş yanıtta None."""
+    teams = payload.get("response") or []
+    if len(teams) != 2:
+        return None
+    record = {"match_id": match_id, **{column: None for column in STATISTIC_COLUMNS}}
+    for side, team in zip(("home", "away"), teams):
+        for stat in team.get("statistics") or []:
+            name = STATISTICS.get(stat.get("type"))
+            if name is not None:
+                record[f"{side}_{name}"] = parse_statistic(stat.get("value"), name)
+    return record
+
+
+def kickoff_of(item: dict) -> datetime:
+    return datetime.fromisoformat(item["fixture"]["date"]).replace(tzinfo=None)
+
+
+def next_watermark(items: list[dict], previous: datetime | None) -> datetime | None:
+    """Sonuçlanmamış en erken maç; yoksa görülen en son maç."""
+    kickoffs = [
+        (kickoff_of(item), item["fixture"]["status"]["short"] in FINAL_STATUSES)
+        for item in items
+    ]
+    pending = [kickoff for kickoff, final in kickoffs if not final]
+    if pending:
+        return min(pending)
+    if kickoffs:
+        return max(kickoff for kickoff, _ in kickoffs)
+    return previous
+
+
+async def upsert_matches(db: AsyncSession, records: list[dict]) -> list[int]:
+    """
+    Maçları doğal anahtar üzerinden toplu yaz.
+
+    Returns:
+        Eklenen ya da gerçekten değişen maçların id'leri
+    """
+    if not records:
+        return []
+    stmt = pg_insert(Match)
+    # Skorlarda API değeri, boşsa mevcut değer
+    new_values = {
+        column: func.coalesce(getattr(stmt.excluded, column), getattr(Match, column))
+        for column in SCORE_COLUMNS
+    }
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["match_date", "home_team_id", "away_team_id"],
+        set_={**new_values, "updated_at": func.now()},
+        where=or_(*[getattr(Match, column).is_distinct_from(value) for column, value in new_values.items()]),
+    ).returning(Match.id)
+    result = await db.execute(stmt, records)
+    return list(result.scalars().all())
+
+
+async def write_statistics(db: AsyncSession, records: list[dict]) -> int:
+    """İstatistikleri toplu UPDATE ile yaz (CSV kolonlarında mevcut değer korunur)."""
+    if not records:
+        return 0
+    table = Match.__table__
+    values = {}
+    for column in STATISTIC_COLUMNS:
+        # Kolon adları SET için ayrılmış; parametreler new_ önekiyle
+        current, new = table.c[column], bindparam(f"new_{column}")
+        if column.split("_", 1)[1] in CSV_STATISTICS:
+            values[column] = func.coalesce(current, new)
+        else:
+            values[column] = func.coalesce(new, current)
+    rows = [
+        {"match_id": record["match_id"], **{f"new_{column}": record[column] for column in STATISTIC_COLUMNS}}
+        for record in records
+    ]
+    # Core executemany (ORM'nin PK bazlı bulk UPDATE modu özel WHERE kabul etmez)
+    connection = await db.connection()
+    await connection.execute(
+        update(table).where(table.c.id == bindparam("match_id")).values(**values), rows
+    )
+    return len(records)
+
+
+class FixtureSync:
+    """Ayarlı ligleri periyodik olarak matches tablosuna senkronize eden arka plan görevi."""
+
+    def __init__(
+        self,
+        client: ApiFootballClient,
+        leagues: list[int],
+        season: int | None = None,
+        lookahead_days: int = 7,
+        postprocess: bool = True,
+        lock_path: str | Path | None = None,
+    ):
+        self.client = client
+        self.leagues = leagues
+        self.season = season
+        self.lookahead_days = lookahead_days
+        self.postprocess = postprocess
+        self.lock_path = Path(lock_path) if lock_path else None
+        self.last_run: dict[int, dict] = {}
+        self._lock_file = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def leader(self) -> bool:
+        """Bu süreç senkronizasyonu yürütüyor mu."""
+        return self.lock_path is None or fcntl is None or self._lock_file is not None
+
+    def acquire_leadership(self) -> bool:
+        """Worker'lar arası kilidi beklemeden almayı dene."""
+        if self.leader:
+            return True
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_path, "a")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._lock_file = handle
+        logger.info(f"Fikstür senkronizasyonu bu worker'da çalışacak ({self.lock_path})")
+        return True
+
+    def release_leadership(self) -> None:
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def mappings(self, db: AsyncSession) -> tuple[dict[str, int], dict[str, int]]:
+        divisions = await db.execute(select(Division.name_api, Division.id).where(Division.name_api.is_not(None)))
+        teams = await db.execute(select(Team.name_api, Team.id).where(Team.name_api.is_not(None)))
+        return dict(divisions.all()), dict(teams.all())
+
+    async def fetch_fixtures(self, league_id: int, season: int, watermark: datetime | None) -> list[dict]:
+        params = {"league": league_id, "season": season}
+        if watermark is not None:
+            # Geç gelen skor düzeltmeleri için bir gün geriden başla
+            params["from"] = (watermark.date() - timedelta(days=1)).isoformat()
+            params["to"] = (date.today() + timedelta(days=self.lookahead_days)).isoformat()
+        return await self.request_fixtures(params)
+
+    async def request_fixtures(self, params: dict) -> list[dict]:
+        payload = await self.client.fixtures(priority=Priority.BACKFILL, **params)
+        if payload.get("errors"):
+            raise RuntimeError(f"API-Football hata döndürdü: {payload['errors']}")
+        return payload.get("response") or []
+
+    async def missing_statistics(
+        self,
+        db: AsyncSession,
+        league_id: int,
+        season: int,
+        division_id: int,
+        team_ids: dict[str, int],
+        fixture_by_key: dict[tuple, int],
+    ) -> dict[int, int]:
+        """
+        Son STATISTICS_LOOKBACK_DAYS günde bitmiş, istatistiği olmayan maçlar.
+
+        Fikstür id'si bu turda çekilen maçlardan doğal anahtarla bulunur;
+        bulunamayanlar için bakış aralığının fikstürleri ayrıca istenir.
+
+        Returns:
+            match_id -> fixture_id
+        """
+        since = date.today() - timedelta(days=STATISTICS_LOOKBACK_DAYS)
+        missing = (
+            await db.execute(
+                select(Match.id, Match.match_date, Match.home_team_id, Match.away_team_id).where(
+                    Match.division_id == division_id,
+                    Match.match_date >= since,
+                    Match.ft_home.is_not(None),
+                    Match.home_possession.is_(None),
+                )
+            )
+        ).all()
+        keys = {row.id: (row.match_date, row.home_team_id, row.away_team_id) for row in missing}
+        if any(key not in fixture_by_key for key in keys.values()):
+            fixture_by_key = dict(fixture_by_key)
+            params = {"league": league_id, "season": season,
+                      "from": since.isoformat(), "to": date.today().isoformat()}
+            for item in await self.request_fixtures(params):
+                record = fixture_record(item, division_id, team_ids)
+                if record is not None:
+                    key = (record["match_date"], record["home_team_id"], record["away_team_id"])
+                    fixture_by_key.setdefault(key, item["fixture"]["id"])
+        return {match_id: fixture_by_key[key] for match_id, key in keys.items() if key in fixture_by_key}
+
+    async def fetch_statistics(self, fixture_ids: dict[int, int]) -> list[dict]:
+        """match_id -> fixture_id için istatistikleri paralel çek (zamanlayıcı kotayı yönetir)."""
+        async def one(match_id: int, fixture_id: int):
+            try:
+                payload = await self.client.fixture_statistics(fixture_id, priority=Priority.BACKFILL)
+            except Exception:
+                logger.exception(f"Fixture {fixture_id} istatistikleri alınamadı")
+                return None
+            return statistics_record(match_id, payload)
+
+        records = await asyncio.gather(*[one(m, f) for m, f in fixture_ids.items()])
+        return [record for record in records if record is not None]
+
+    async def sync_league(self, session_maker: async_sessionmaker, league_id: int) -> dict:
+        season = self.season or current_season()
+        summary = {"league": league_id, "season": season, "fixtures": 0, "unmapped": 0,
+                   "upserted": 0, "statistics": 0}
+
+        async with session_maker() as db:
+            state = await db.get(SyncState, state_name(league_id))
+            if state is None or (state.cursor or {}).get("season") != season:
+                # İlk tur ya da yeni sezon: tüm sezon
+                state = state or SyncState(name=state_name(league_id))
+                state.watermark = None
+                db.add(state)
+
+            items = await self.fetch_fixtures(league_id, season, state.watermark)
+            summary["fixtures"] = len(items)
+            if not items:
+                state.cursor = {"season": season}
+                await db.commit()
+                return summary
+
+            division_ids, team_ids = await self.mappings(db)
+            league_name = items[0]["league"]["name"]
+            division_id = division_ids.get(league_name)
+            if division_id is None:
+                logger.warning(f"Lig {league_id} ({league_name}) Division.name_api ile eşlenemedi")
+                summary["unmapped"] = len(items)
+                return summary
+
+            records, fixture_by_key = {}, {}
+            mapped_items, unmapped_kickoffs = [], []
+            unmapped = set()
+            for item in items:
+                record = fixture_record(item, division_id, team_ids)
+                if record is None:
+                    unmapped.update(
+                        name for name in (item["teams"]["home"]["name"], item["teams"]["away"]["name"])
+                        if name not in team_ids
+                    )
+                    unmapped_kickoffs.append(kickoff_of(item))
+                    summary["unmapped"] += 1
+                    continue
+                mapped_items.append(item)
+                key = (record["match_date"], record["home_team_id"], record["away_team_id"])
+                # Aynı anahtar bir INSERT'te iki kez olamaz (ertelenip aynı güne alınan maç)
+                records[key] = record
+                fixture_by_key[key] = item["fixture"]["id"]
+            if unmapped:
+                logger.warning(f"Lig {league_id}: Team.name_api ile eşlenemeyen takımlar {sorted(unmapped)}")
+            if not records:
+                # Takımlar henüz eşlenmemiş: watermark ilerletilmez, eşleme
+                # yapıldığında aynı aralık tekrar okunur
+                state.cursor = {"season": season, "fixtures": len(items), "upserted": 0}
+                await db.commit()
+                return summary
+
+            changed = await upsert_matches(db, list(records.values()))
+            summary["upserted"] = len(changed)
+
+            fixture_ids = await self.missing_statistics(
+                db, league_id, season, division_id, team_ids, fixture_by_key
+            )
+            statistics = await self.fetch_statistics(fixture_ids)
+            summary["statistics"] = await write_statistics(db, statistics)
+
+            if self.postprocess and changed:
+                await self.apply_results(db, changed)
+
+            watermark = next_watermark(mapped_items, state.watermark)
+            if unmapped_kickoffs:
+                # Eşlenemeyen maçlar yazılmadı: eşleme yapılınca tekrar okunabilsinler
+                watermark = min(watermark, min(unmapped_kickoffs))
+            state.watermark = watermark
+            state.cursor = {"season": season, "fixtures": len(items), "upserted": len(changed)}
+            await db.commit()
+        return summary
+
+    async def apply_results(self, db: AsyncSession, match_ids: list[int]) -> None:
+        """Yeni biten maçları türetilmiş tablolara uygula (commit çağıran tarafta)."""
+        result = await db.execute(
+            select(Match).where(Match.id.in_(match_ids), Match.ft_home.is_not(None))
+        )
+        finished = list(result.scalars().all())
+        if not finished:
+            return
+        await update_team_stats(db, finished)
+        await db.run_sync(apply_new_results)
+        await db.run_sync(settle_predictions)
+
+    async def run_once(self, session_maker: async_sessionmaker) -> list[dict]:
+        summaries = []
+        for league_id in self.leagues:
+            try:
+                summary = await self.sync_league(session_maker, league_id)
+            except Exception:
+                logger.exception(f"Lig {league_id} senkronizasyonu başarısız")
+                continue
+            summary["finished_at"] = datetime.now().isoformat(timespec="seconds")
+            self.last_run[league_id] = summary
+            summaries.append(summary)
+        return summaries
+
+    async def _poll(self, session_maker: async_sessionmaker, interval: float) -> None:
+        while True:
+            if self.acquire_leadership():
+                await self.run_once(session_maker)
+            await asyncio.sleep(interval)
+
+    def start(self, session_maker: async_sessionmaker, interval: float) -> None:
+        if self.leagues:
+            self._task = asyncio.create_task(self._poll(session_maker, interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.release_leadership()
@@ -0,0 +1,245 @@
+"""
+Matches.csv ayrıştırma yardımcıları.
+
+CSV chunk'larını kolon kolon (vektörel) Match / EloHistory kayıtlarına
+çevirir. Hem import script'i hem de admin upload endpoint'i kullanır.
+"""
+
+import io
+import logging
+
+import pandas as pd
+from sqlalchemy import text
+
+from app.models import MatchResult
+
+logger = logging.getLogger(__name__)
+
+
+# CSV okunurken kullanılan kolon tipleri. Sadece bu kolonlar okunur;
+# sayısal kolonlar NaN içerebildiği için float64 okunup sonra dönüştürülür.
+CSV_DTYPES = {
+    'Division': 'str',
+    'MatchDate': 'str',
+    'MatchTime': 'str',
+    'HomeTeam': 'str',
+    'AwayTeam': 'str',
+    'FTResult': 'str',
+    'HTResult': 'str',
+    'HomeElo': 'float64',
+    'AwayElo': 'float64',
+    'Form3Home': 'float64',
+    'Form3Away': 'float64',
+    'Form5Home': 'float64',
+    'Form5Away': 'float64',
+    'FTHome': 'float64',
+    'FTAway': 'float64',
+    'HTHome': 'float64',
+    'HTAway': 'float64',
+    'HomeShots': 'float64',
+    'AwayShots': 'float64',
+    'HomeTarget': 'float64',
+    'AwayTarget': 'float64',
+    'HomeFouls': 'float64',
+    'AwayFouls': 'float64',
+    'HomeCorners': 'float64',
+    'AwayCorners': 'float64',
+    'HomeYellow': 'float64',
+    'AwayYellow': 'float64',
+    'HomeRed': 'float64',
+    'AwayRed': 'float64',
+    'OddHome': 'float64',
+    'OddDraw': 'float64',
+    'OddAway': 'float64',
+    'Over25': 'float64',
+    'Under25': 'float64',
+    'C_HTB': 'float64',
+    'C_PHB': 'float64',
+    'C_VHD': 'float64',
+    'C_VAD': 'float64',
+    'C_LTH': 'float64',
+    'C_LTA': 'float64',
+}
+
+# CSV kolonu -> Match kolonu
+MATCH_INT_COLUMNS = {
+    'Form3Home': 'form3_home',
+    'Form3Away': 'form3_away',
+    'Form5Home': 'form5_home',
+    'Form5Away': 'form5_away',
+    'FTHome': 'ft_home',
+    'FTAway': 'ft_away',
+    'HTHome': 'ht_home',
+    'HTAway': 'ht_away',
+    'HomeShots': 'home_shots',
+    'AwayShots': 'away_shots',
+    'HomeTarget': 'home_shots_target',
+    'AwayTarget': 'away_shots_target',
+    'HomeCorners': 'home_corners',
+    'AwayCorners': 'away_corners',
+    'HomeFouls': 'home_fouls',
+    'AwayFouls': 'away_fouls',
+    'HomeYellow': 'home_yellow',
+    'AwayYellow': 'away_yellow',
+    'HomeRed': 'home_red',
+    'AwayRed': 'away_red',
+}
+
+MATCH_FLOAT_COLUMNS = {
+    'HomeElo': 'home_team_elo',
+    'AwayElo': 'away_team_elo',
+    'OddHome': 'odd_home',
+    'OddDraw': 'odd_draw',
+    'OddAway': 'odd_away',
+    'Over25': 'odd_over25',
+    'Under25': 'odd_under25',
+    'C_HTB': 'c_htb',
+    'C_PHB': 'c_phb',
+    'C_VHD': 'c_vhd',
+    'C_VAD': 'c_vad',
+    'C_LTH': 'c_lth',
+    'C_LTA': 'c_lta',
+}
+
+RESULT_CODES = {result.value: result for result in MatchResult}
+
+
+def record_complete(record: bytes) -> bool:
+    """
+    Satır sonuyla biten ham CSV kaydı tamam mı?
+
+    Tırnaklı alanlar satır sonu içerebilir; tırnak sayısı tekse satır sonu
+    bir alanın içindedir ("" kaçışı sayıyı bozmaz).
+    """
+    return record.count(b'"') % 2 == 0
+
+
+def read_csv_bytes(header: bytes, body: bytes) -> pd.DataFrame:
+    """Header + tam satırlardan oluşan bir CSV parçasını CSV_DTYPES ile oku."""
+    return pd.read_csv(
+        io.BytesIO(header + body),
+        usecols=lambda col: col in CSV_DTYPES,
+        dtype=CSV_DTYPES,
+    )
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """Tarih kolonunu vektörel olarak datetime.date'e çevir."""
+    return pd.to_datetime(values, errors='coerce').dt.date
+
+
+def parse_times(values: pd.Series) -> pd.Series:
+    """Saat kolonunu vektörel olarak datetime.time'a çevir (HH:MM, gerekirse serbest format)."""
+    times = pd.to_datetime(values, format='%H:%M', errors='coerce')
+    retry = times.isna() & values.notna() & (values != '')
+    if retry.any():
+        times[retry] = pd.to_datetime(values[retry], format='mixed', errors='coerce')
+    return times.dt.time.where(times.notna(), None)
+
+
+def prepare_matches(chunk: pd.DataFrame, div_map: dict, team_map: dict) -> pd.DataFrame:
+    """
+    CSV chunk'ını Match kolonlarına kolon kolon (vektörel) çevir.
+    
+    Tam sayı kolonları nullable Int64, sonuç kolonları MatchResult olur.
+    """
+    frame = pd.DataFrame(index=chunk.index)
+    frame['division_id'] = chunk['Division'].map(div_map)
+    frame['match_date'] = parse_dates(chunk['MatchDate'])
+    if 'MatchTime' in chunk:
+        frame['match_time'] = parse_times(chunk['MatchTime'])
+    else:
+        frame['match_time'] = None
+    frame['home_team_id'] = chunk['HomeTeam'].map(team_map)
+    frame['away_team_id'] = chunk['AwayTeam'].map(team_map)
+    
+    for csv_col, column in MATCH_FLOAT_COLUMNS.items():
+        frame[column] = chunk[csv_col] if csv_col in chunk else float('nan')
+    for csv_col, column in MATCH_INT_COLUMNS.items():
+        values = chunk[csv_col] if csv_col in chunk else pd.Series(float('nan'), index=chunk.index)
+        frame[column] = values.round().astype('Int64')
+    for csv_col, column in (('FTResult', 'ft_result'), ('HTResult', 'ht_result')):
+        frame[column] = chunk[csv_col].map(RESULT_CODES) if csv_col in chunk else None
+    
+    frame['source'] = 'csv'
+    return frame
+
+
+def match_records(frame: pd.DataFrame) -> list:
+    """Hazırlanmış maç frame'ini ORM'e verilecek dict listesine çevir (NaN/NA -> None)."""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def prepare_elo_records(chunk: pd.DataFrame, team_map: dict) -> pd.DataFrame:
+    """
+    Chunk'tan (team_id, date, elo) kayıtlarını vektörel olarak çıkar.
+    
+    HomeTeam/AwayTeam ve HomeElo/AwayElo kolonları melt ile alt alta dizilir;
+    takım başına gün başına tek kayıt kalır (ilk görülen).
+    """
+    teams = chunk[['HomeTeam', 'AwayTeam']].assign(date=parse_dates(chunk['MatchDate']))
+    teams = teams.melt(id_vars='date', value_name='team')
+    elos = chunk[['HomeElo', 'AwayElo']].melt(value_name='elo')
+    
+    records = pd.DataFrame({
+        'team_id': teams['team'].map(team_map),
+        'date': teams['date'],
+        'elo': elos['elo'],
+    }).dropna()
+    records['team_id'] = records['team_id'].astype('int64')
+    return records.drop_duplicates(subset=['team_id', 'date'], ignore_index=True)
+
+
+def ensure_unique_constraint(db, table: str, name: str, columns: list):
+    """
+    Eski tablolarda unique constraint yoksa ekle.
+    
+    create_all mevcut tabloya constraint eklemez; ON CONFLICT için
+    hedef kolonlar üzerinde unique index şart. db bir Session ya da
+    Connection olabilir (lifespan'da conn.run_sync ile çağrılır).
+    """
+    exists = db.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {'name': name}
+    ).scalar()
+    if not exists:
+        logger.info(f"{name} constraint'i ekleniyor")
+        db.execute(text(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({', '.join(columns)})"
+        ))
+
+
+def ensure_match_unique_constraint(db):
+    """Maç doğal anahtarı: (match_date, home_team_id, away_team_id)."""
+    ensure_unique_constraint(
+        db, 'matches', 'uq_matches_natural_key',
+        ['match_date', 'home_team_id', 'away_team_id'],
+    )
+
+
+def ensure_elo_unique_constraint(db):
+    """
+    Takım ve kaynak başına günde tek ELO kaydı: (team_id, date, source).
+    
+    source kolonundan önceki tablolarda kolon eklenir (mevcut satırlar
+    'clubelo' olur) ve eski (team_id, date) constraint'i kaldırılır.
+    Yerinde güncellemeler için updated_at kolonu da eklenir (snapshot versiyonu).
+    """
+    db.execute(text(
+        "ALTER TABLE elo_history "
+        "ADD COLUMN IF NOT EXISTS source VARCHAR(20) NOT NULL DEFAULT 'clubelo'"
+    ))
+    db.execute(text(
+        "ALTER TABLE elo_history ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT now()"
+    ))
+    db.execute(text(
+        "ALTER TABLE elo_history DROP CONSTRAINT IF EXISTS uq_elo_history_team_date"
+    ))
+    ensure_unique_constraint(
+        db, 'elo_history', 'uq_elo_history_team_date_source', ['team_id', 'date', 'source'],
+    )
+
+
+def ensure_import_constraints(db):
+    """Upload ve bulk import'un ON CONFLICT hedeflerini eski veritabanlarında oluştur."""
+    ensure_match_unique_constraint(db)
+    ensure_elo_unique_constraint(db)
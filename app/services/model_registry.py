@@ -0,0 +1,243 @@
+"""
+Süreçte yerleşik model registry'si.
+
+Her model adı (market) için is_active=True olan MLModel satırının
+artifact'ı süreç başına bir kez yüklenir ve bellekte tutulur. Tahmin yolu
+sadece registry.get(name) çağırır; model yükleme hiçbir zaman istek
+sırasında yapılmaz.
+
+Hot-swap: arka planda çalışan bir görev ml_models tablosunu periyodik
+olarak okur. Aktif model değiştiyse yeni artifact thread'de yüklenip
+doğrulanır, ardından registry sözlüğü tek bir atama ile değiştirilir.
+Devam eden istekler eline aldığı LoadedModel'i kullanmaya devam eder; eski
+model son referans bırakılınca serbest kalır. Doğrulamadan geçemeyen
+artifact yüklenmez, eski model hizmet vermeye devam eder.
+
+Artifact'lar joblib ile sıkıştırmasız yazılır (save_artifact) ve
+mmap_mode='r' ile açılır: içlerindeki NumPy dizileri dosyadan memory-map
+edilir, böylece aynı makinedeki uvicorn worker'ları modeli işletim
+sisteminin sayfa önbelleği üzerinden paylaşır, her biri ayrı kopya tutmaz.
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import MLModel
+from app.services.features import FEATURE_NAMES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_DIR = Path(__file__).parent.parent / "data" / "models"
+
+
+class ModelArtifactError(Exception):
+    """Artifact yüklenemedi ya da MLModel kaydıyla uyuşmuyor."""
+
+
+def save_artifact(estimator, path: str | Path) -> Path:
+    """Modeli memory-map ile açılabilecek şekilde (sıkıştırmasız) kaydet."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(estimator, path, compress=0)
+    return path
+
+
+def resolve_artifact_path(file_path: str, model_dir: Path = DEFAULT_MODEL_DIR) -> Path:
+    path = Path(file_path)
+    return path if path.is_absolute() else model_dir / path
+
+
+class LoadedModel:
+    """Yüklenmiş, doğrulanmış ve salt okunur bir model."""
+
+    def __init__(self, record: MLModel, estimator, path: Path):
+        self.id = record.id
+        self.name = record.name
+        self.version = record.version
+        self.feature_names = list(record.feature_names)
+        self.estimator = estimator
+        self.path = path
+        self.loaded_at = time.time()
+
+    @property
+    def key(self) -> tuple[int, str]:
+        return self.id, self.version
+
+    @property
+    def classes(self) -> list:
+        return list(getattr(self.estimator, "classes_", []))
+
+    def features(self, matrix: pd.DataFrame) -> np.ndarray:
+        """Feature matrisinden modelin kolonlarını, eğitimdeki sırayla al."""
+        return matrix[self.feature_names].astype(float).to_numpy()
+
+    def predict_proba(self, matrix: pd.DataFrame) -> np.ndarray:
+        return self.estimator.predict_proba(self.features(matrix))
+
+    def predict(self, matrix: pd.DataFrame) -> np.ndarray:
+        return self.estimator.predict(self.features(matrix))
+
+
+def load_model(record: MLModel, model_dir: Path = DEFAULT_MODEL_DIR) -> LoadedModel:
+    """
+    Artifact'ı memory-map ile aç ve feature_names'i doğrula.
+
+    Raises:
+        ModelArtifactError: dosya yok, feature listesi boş/bilinmeyen
+            feature içeriyor ya da modelin beklediği feature sayısı uyuşmuyor
+    """
+    path = resolve_artifact_path(record.file_path, model_dir)
+    if not path.exists():
+        raise ModelArtifactError(f"{record.name} {record.version}: artifact bulunamadı ({path})")
+    if not record.feature_names:
+        raise ModelArtifactError(f"{record.name} {record.version}: feature_names boş")
+
+    unknown = sorted(set(record.feature_names) - set(FEATURE_NAMES))
+    if unknown:
+        raise ModelArtifactError(
+            f"{record.name} {record.version}: bilinmeyen feature'lar {unknown}"
+        )
+
+    estimator = joblib.load(path, mmap_mode="r")
+    expected = getattr(estimator, "n_features_in_", None)
+    if expected is not None and expected != len(record.feature_names):
+        raise ModelArtifactError(
+            f"{record.name} {record.version}: model {expected} feature bekliyor, "
+            f"kayıtta {len(record.feature_names)} var"
+        )
+    trained_names = getattr(estimator, "feature_names_in_", None)
+    if trained_names is not None and list(trained_names) != list(record.feature_names):
+        raise ModelArtifactError(
+            f"{record.name} {record.version}: feature sırası eğitimdekiyle aynı değil"
+        )
+    return LoadedModel(record, estimator, path)
+
+
+def record_key(record: MLModel, model_dir: Path = DEFAULT_MODEL_DIR) -> tuple:
+    """
+    Kaydın ve artifact dosyasının yüklemeyi etkileyen hali.
+
+    Yüklenemeyen bir kayıt bu anahtar değişene kadar (satır güncellenir ya da
+    dosya yazılır/değişir) tekrar denenmez.
+    """
+    path = resolve_artifact_path(record.file_path, model_dir)
+    try:
+        stat = path.stat()
+        artifact = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        artifact = None
+    return record.id, record.version, record.file_path, tuple(record.feature_names or ()), artifact
+
+
+class ModelRegistry:
+    """Model adı -> aktif LoadedModel."""
+
+    def __init__(self, model_dir: Path = DEFAULT_MODEL_DIR):
+        self.model_dir = model_dir
+        self.models: dict[str, LoadedModel] = {}
+        self.version = 0
+        self.listeners: list = []
+        # Model adı -> yüklenemeyen kaydın record_key'i
+        self.failed: dict[str, tuple] = {}
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def get(self, name: str) -> LoadedModel | None:
+        """Aktif modeli döndür. Asla yükleme yapmaz."""
+        return self.models.get(name)
+
+    def active_versions(self) -> dict[str, str]:
+        return {name: model.version for name, model in self.models.items()}
+
+    def on_swap(self, listener) -> None:
+        """Aktif model değiştiğinde listener(name, old, new) çağrılır."""
+        self.listeners.append(listener)
+
+    async def sync(self, session_maker: async_sessionmaker) -> list[str]:
+        """
+        ml_models tablosundaki aktif modellerle registry'yi eşitle.
+
+        Returns:
+            Değişen model adları
+        """
+        async with self._lock:
+            async with session_maker() as db:
+                result = await db.execute(select(MLModel).where(MLModel.is_active.is_(True)))
+                records = list(result.scalars().all())
+
+            active = {}
+            for record in sorted(records, key=lambda r: r.trained_at):
+                # Aynı isimde birden fazla aktif varsa en son eğitilen kazanır
+                active[record.name] = record
+
+            models = dict(self.models)
+            changed = []
+            for name, record in active.items():
+                current = models.get(name)
+                if current is not None and current.key == (record.id, record.version):
+                    continue
+                key = record_key(record, self.model_dir)
+                if self.failed.get(name) == key:
+                    continue
+                try:
+                    loaded = await asyncio.to_thread(load_model, record, self.model_dir)
+                except Exception:
+                    logger.exception(f"Model {name} {record.version} yüklenemedi, mevcut model korunuyor")
+                    self.failed[name] = key
+                    continue
+                self.failed.pop(name, None)
+                models[name] = loaded
+                changed.append(name)
+
+            for name in set(self.failed) - set(active):
+                del self.failed[name]
+            for name in set(models) - set(active):
+                del models[name]
+                changed.append(name)
+
+            if changed:
+                previous, self.models = self.models, models
+                self.version += 1
+                for name in changed:
+                    new = self.models.get(name)
+                    logger.info(f"Model {name}: {new.version if new else 'kaldırıldı'}")
+                    for listener in self.listeners:
+                        listener(name, previous.get(name), new)
+            return changed
+
+    async def _poll(self, session_maker: async_sessionmaker, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync(session_maker)
+            except Exception:
+                logger.exception("Model registry senkronizasyonu başarısız")
+
+    async def start(self, session_maker: async_sessionmaker, interval: float) -> None:
+        """Aktif modelleri yükle ve periyodik senkronizasyonu başlat."""
+        try:
+            await self.sync(session_maker)
+        except Exception:
+            logger.exception("Aktif modeller yüklenemedi")
+        self._task = asyncio.create_task(self._poll(session_maker, interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Süreç başına tek registry
+model_registry = ModelRegistry()
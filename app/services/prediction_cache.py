@@ -0,0 +1,218 @@
+"""
+Tahmin sonuç cache'i.
+
+Anahtar (match_id, market, model_version). Sınırlı LRU + TTL: en az
+kullanılan kayıt max_entries aşılınca, her kayıt ttl_seconds sonunda düşer.
+
+Single-flight: aynı anahtar için eşzamanlı cache miss'lerde hesaplama
+bir kez, isteklerden bağımsız bir task içinde yapılır; diğer istekler aynı
+sonucu bekler. İlk isteğin iptal edilmesi (client bağlantıyı kapattı)
+bekleyenleri etkilemez.
+
+Geçersiz kılma:
+- Aktif model değişince (model_registry.on_swap) eski versiyonun kayıtları
+  silinir; yeni versiyon zaten farklı anahtar üretir.
+- Maçın girdileri değişince (ELO, oran, skor güncellemesi) kayıt silinir.
+  Bunu arka plandaki invalidator matches.updated_at üzerinden yakalar:
+  değişen maçların kendisi ve aynı takımların cache'teki fikstürleri
+  (form feature'ları değişmiştir) düşürülür.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Match
+
+logger = logging.getLogger(__name__)
+
+# updated_at = now() transaction başlangıcıdır: watermark'tan önce damgalanıp
+# sonra commit edilen satırları kaçırmamak için pencere bu kadar geriden açılır
+WATERMARK_OVERLAP = timedelta(minutes=2)
+
+
+def window_start(watermark: datetime) -> datetime:
+    if watermark - datetime.min <= WATERMARK_OVERLAP:
+        return watermark
+    return watermark - WATERMARK_OVERLAP
+
+
+class PredictionCache:
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 600):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._by_match: dict[int, set[tuple]] = {}
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._by_match.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: tuple) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_match.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_match[key[0]]
+
+    async def get_or_compute(self, key: tuple, compute: Callable[[], Awaitable]):
+        """
+        Cache'te varsa döndür; yoksa compute()'u (anahtar başına tek kez) çalıştır.
+
+        None sonuçlar (bulunamayan maç) cache'lenmez.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        task = asyncio.create_task(self._compute(key, compute))
+        # Bekleyen kalmadıysa "exception never retrieved" uyarısını önle
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: tuple, compute: Callable[[], Awaitable]):
+        try:
+            value = await compute()
+            if value is not None:
+                self.put(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate_matches(self, match_ids) -> int:
+        removed = 0
+        for match_id in match_ids:
+            for key in list(self._by_match.get(match_id, ())):
+                self._remove(key)
+                removed += 1
+        self.invalidations += removed
+        return removed
+
+    def invalidate_model_version(self, model_version: str) -> int:
+        keys = [key for key in self._entries if key[2] == model_version]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def cached_match_ids(self) -> list[int]:
+        return list(self._by_match)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class CacheInvalidator:
+    """matches.updated_at'i izleyip değişen maçları cache'ten düşüren arka plan görevi."""
+
+    def __init__(self, cache: PredictionCache):
+        self.cache = cache
+        self.watermark: datetime | None = None
+        # Örtüşme penceresinde zaten işlenmiş (id, updated_at) satırları
+        self._seen: set[tuple[int, datetime]] = set()
+        self._task: asyncio.Task | None = None
+
+    async def poll_once(self, session_maker: async_sessionmaker) -> int:
+        async with session_maker() as db:
+            if self.watermark is None:
+                # İlk tur: cache boş, sadece başlangıç noktasını al
+                self.watermark = await db.scalar(select(func.max(Match.updated_at))) or datetime.min
+                return 0
+
+            since = window_start(self.watermark)
+            rows = (
+                await db.execute(
+                    select(Match.id, Match.home_team_id, Match.away_team_id, Match.updated_at)
+                    .where(Match.updated_at > since)
+                )
+            ).all()
+            if rows:
+                self.watermark = max(self.watermark, max(row.updated_at for row in rows))
+            floor = window_start(self.watermark)
+            changed = [row for row in rows if (row.id, row.updated_at) not in self._seen]
+            self._seen = {(row.id, row.updated_at) for row in rows if row.updated_at > floor}
+            if not changed:
+                return 0
+
+            match_ids = {row.id for row in changed}
+            team_ids = {row.home_team_id for row in changed} | {row.away_team_id for row in changed}
+            cached = self.cache.cached_match_ids()
+            if cached:
+                # Aynı takımların cache'teki maçlarının form feature'ları da değişti
+                affected = await db.execute(
+                    select(Match.id).where(
+                        Match.id.in_(cached),
+                        or_(Match.home_team_id.in_(team_ids), Match.away_team_id.in_(team_ids)),
+                    )
+                )
+                match_ids.update(affected.scalars().all())
+        return self.cache.invalidate_matches(match_ids)
+
+    async def _poll(self, session_maker: async_sessionmaker, interval: float) -> None:
+        while True:
+            try:
+                await self.poll_once(session_maker)
+            except Exception:
+                logger.exception("Prediction cache invalidation başarısız")
+            await asyncio.sleep(interval)
+
+    def start(self, session_maker: async_sessionmaker, interval: float) -> None:
+        self._task = asyncio.create_task(self._poll(session_maker, interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
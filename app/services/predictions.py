@@ -0,0 +1,270 @@
+"""
+Toplu (matchday) tahmin servisi.
+
+Bir tarih aralığındaki ve/veya liglerdeki tüm oynanmamış maçlar için tek
+bir feature matrisi kurulur, her market için aktif model bir kez (tüm
+matris üzerinde) çağrılır ve ortaya çıkan Prediction satırlarının hepsi
+tek bir INSERT ile yazılır.
+
+Market -> model adı eşlemesi MARKETS'tedir; model adı ml_models.name ile
+aynıdır ve aktif versiyon model_registry'den alınır.
+"""
+
+import asyncio
+import math
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, delete, insert, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.models import Division, Match, Prediction
+from app.services.executor import ComputeExecutor
+from app.services.features import load_matches_frame
+from app.services.model_registry import LoadedModel, ModelRegistry
+
+# Market -> ml_models.name
+MARKETS = {
+    "result": "result_model",
+    "over25": "goals_model",
+}
+
+# Sayısal sınıf etiketleri için okunur karşılıklar
+MARKET_LABELS = {
+    "over25": {0: "Under", 1: "Over"},
+}
+
+
+def fixture_filter(date_from: date | None, date_to: date | None, division_ids: list[int] | None):
+    """Oynanmamış maçlar için WHERE koşulu."""
+    conditions = [Match.ft_home.is_(None)]
+    if date_from is not None:
+        conditions.append(Match.match_date >= date_from)
+    if date_to is not None:
+        conditions.append(Match.match_date <= date_to)
+    if division_ids:
+        conditions.append(Match.division_id.in_(division_ids))
+    return conditions
+
+
+def load_prediction_inputs(db: Session, conditions) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Fikstürleri ve fikstürlerdeki takımların geçmiş maçlarını oku.
+
+    Geçmiş sadece ilgili takımlarla sınırlanır; feature'lar takım bazında
+    hesaplandığından diğer maçlar sonucu değiştirmez.
+    """
+    fixtures = load_matches_frame(db, and_(*conditions))
+    if fixtures.empty:
+        return fixtures, fixtures
+    team_ids = sorted(set(fixtures["home_team_id"]) | set(fixtures["away_team_id"]))
+    history = load_matches_frame(
+        db,
+        and_(
+            Match.ft_home.is_not(None),
+            Match.match_date <= fixtures["match_date"].max(),
+            or_(Match.home_team_id.in_(team_ids), Match.away_team_id.in_(team_ids)),
+        ),
+    )
+    return history, fixtures
+
+
+def market_label(market: str, label) -> str:
+    if isinstance(label, np.generic):
+        label = label.item()
+    return str(MARKET_LABELS.get(market, {}).get(label, label))
+
+
+def json_value(value):
+    """NaN -> None (JSON kolonları NaN kabul etmez)."""
+    value = float(value)
+    return None if math.isnan(value) else round(value, 4)
+
+
+def model_version(model: LoadedModel) -> str:
+    """Prediction.model_version değeri: <model adı>:<versiyon>."""
+    return f"{model.name}:{model.version}"
+
+
+def score_markets(
+    matrix: pd.DataFrame,
+    models: dict[str, LoadedModel],
+    probabilities_by_market: dict[str, np.ndarray] | None = None,
+) -> list[dict]:
+    """
+    Her market için modeli tüm matris üzerinde bir kez çalıştır.
+
+    probabilities_by_market verilirse (ör. process pool'da hesaplanmış)
+    model tekrar çağrılmaz, sadece satırlar kurulur.
+
+    Returns:
+        Prediction satırları (dict)
+    """
+    rows = []
+    match_ids = matrix.index.to_numpy()
+    for market, model in models.items():
+        if probabilities_by_market is not None:
+            probabilities = probabilities_by_market[market]
+        else:
+            probabilities = model.predict_proba(matrix)
+        labels = [market_label(market, label) for label in model.classes]
+        best = probabilities.argmax(axis=1)
+        features = matrix[model.feature_names].astype(float).to_numpy()
+
+        for i, match_id in enumerate(match_ids.tolist()):
+            rows.append({
+                "match_id": match_id,
+                "market": market,
+                "prediction": labels[best[i]],
+                "probability": round(float(probabilities[i, best[i]]), 4),
+                "prob_details": {
+                    label: round(float(p), 4) for label, p in zip(labels, probabilities[i])
+                },
+                "model_version": model_version(model),
+                "features_used": {
+                    name: json_value(value) for name, value in zip(model.feature_names, features[i])
+                },
+            })
+    return rows
+
+
+def active_models(registry: ModelRegistry, markets: list[str] | None = None) -> dict[str, LoadedModel]:
+    """İstenen marketlerden aktif modeli olanlar."""
+    models = {}
+    for market in markets or MARKETS:
+        model = registry.get(MARKETS[market])
+        if model is not None:
+            models[market] = model
+    return models
+
+
+async def write_predictions(db: AsyncSession, rows: list[dict]) -> int:
+    """
+    Prediction satırlarını toplu yaz.
+
+    Aynı (maç, market, model versiyonu) için önceki tahminler silinir;
+    servis aynı aralık için tekrar çalıştırılabilir.
+    """
+    if not rows:
+        return 0
+    keys = {(row["match_id"], row["market"], row["model_version"]) for row in rows}
+    await db.execute(
+        delete(Prediction).where(
+            tuple_(Prediction.match_id, Prediction.market, Prediction.model_version).in_(keys)
+        )
+    )
+    await db.execute(insert(Prediction), rows)
+    return len(rows)
+
+
+async def resolve_division_ids(db: AsyncSession, codes: list[str] | None) -> list[int] | None:
+    if not codes:
+        return None
+    result = await db.execute(select(Division.id).where(Division.code.in_(codes)))
+    return list(result.scalars().all())
+
+
+async def compute_predictions(
+    executor: ComputeExecutor,
+    history: pd.DataFrame,
+    fixtures: pd.DataFrame,
+    models: dict[str, LoadedModel],
+) -> tuple[list[dict], float, float]:
+    """
+    Feature matrisini kur ve marketleri skorla (CPU işi executor'da).
+
+    Returns:
+        (Prediction satırları, feature süresi, model süresi)
+    """
+    started = time.perf_counter()
+    matrix = await executor.build_features(history, fixtures)
+    feature_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    probabilities = await executor.predict_proba(matrix, models)
+    model_seconds = time.perf_counter() - started
+
+    rows = await asyncio.to_thread(score_markets, matrix, models, probabilities)
+    return rows, feature_seconds, model_seconds
+
+
+async def predict_matchday(
+    db: AsyncSession,
+    registry: ModelRegistry,
+    executor: ComputeExecutor,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    divisions: list[str] | None = None,
+    markets: list[str] | None = None,
+) -> dict:
+    """
+    Aralıktaki tüm fikstürler için tahmin üret ve kaydet.
+
+    Commit çağıran tarafa bırakılır.
+
+    Returns:
+        fixtures, predictions (satırlar), models (market -> versiyon),
+        feature_seconds, model_seconds
+    """
+    models = active_models(registry, markets)
+    summary = {
+        "fixtures": 0,
+        "predictions": [],
+        "models": {market: model_version(model) for market, model in models.items()},
+        "feature_seconds": 0.0,
+        "model_seconds": 0.0,
+    }
+    if not models:
+        return summary
+
+    division_ids = await resolve_division_ids(db, divisions)
+    if divisions and not division_ids:
+        return summary
+
+    conditions = fixture_filter(date_from, date_to, division_ids)
+    history, fixtures = await db.run_sync(load_prediction_inputs, conditions)
+    if fixtures.empty:
+        return summary
+
+    rows, feature_seconds, model_seconds = await compute_predictions(
+        executor, history, fixtures, models
+    )
+    summary["feature_seconds"] = round(feature_seconds, 3)
+    summary["model_seconds"] = round(model_seconds, 3)
+
+    await write_predictions(db, rows)
+    summary["fixtures"] = len(fixtures)
+    summary["predictions"] = rows
+    return summary
+
+
+async def predict_matches(
+    session_maker: async_sessionmaker,
+    registry: ModelRegistry,
+    executor: ComputeExecutor,
+    items: list[tuple[int, str]],
+) -> list[dict | None]:
+    """
+    (match_id, market) isteklerini tek feature matrisi ve market başına tek
+    model çağrısıyla tahmin et (micro-batcher handler'ı). Sonuçlar kaydedilmez.
+
+    Returns:
+        items ile aynı sırada Prediction satırları; maç ya da aktif model
+        yoksa None
+    """
+    match_ids = sorted({match_id for match_id, _ in items})
+    models = active_models(registry, sorted({market for _, market in items}))
+    if not models:
+        return [None] * len(items)
+
+    async with session_maker() as db:
+        history, fixtures = await db.run_sync(load_prediction_inputs, [Match.id.in_(match_ids)])
+    if fixtures.empty:
+        return [None] * len(items)
+
+    rows, _, _ = await compute_predictions(executor, history, fixtures, models)
+    by_key = {(row["match_id"], row["market"]): row for row in rows}
+    return [by_key.get(item) for item in items]
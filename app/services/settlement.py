@@ -0,0 +1,112 @@
+"""
+Tahmin sonuçlandırma (settlement).
+
+Maç sonucu geldiğinde Prediction.actual_value ve is_correct doldurulur.
+Her market için TEK bir set-based UPDATE ... FROM matches çalışır; tahmin
+başına döngü yoktur.
+
+Artımlı ve idempotent: bir tahmin, henüz sonuçlandırılmamışsa
+(is_correct IS NULL) ya da maçı son turdan sonra değiştiyse (skor
+düzeltmesi; matches.updated_at > watermark) yeniden hesaplanır. Aynı
+veriyle tekrar çalıştırmak aynı sonucu yazar. Watermark her market için
+ayrı tutulur (sync_states'te 'settlement:<market>' satırı): sadece bazı
+market'leri sonuçlandıran bir tur (--market) diğerlerinin watermark'ını
+ilerletmez.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Match, Prediction, SyncState
+
+STATE_NAME = "settlement"
+
+CORNERS_LINE = 9.5
+
+total_goals = Match.ft_home + Match.ft_away
+total_corners = Match.home_corners + Match.away_corners
+
+# Market -> (gerçekleşen değer ifadesi, gerekli kolonlar)
+SETTLEMENT_RULES = {
+    "result": (
+        case(
+            (Match.ft_home > Match.ft_away, "H"),
+            (Match.ft_home < Match.ft_away, "A"),
+            else_="D",
+        ),
+        [Match.ft_home, Match.ft_away],
+    ),
+    "over25": (
+        case((total_goals > 2.5, "Over"), else_="Under"),
+        [Match.ft_home, Match.ft_away],
+    ),
+    "btts": (
+        case((and_(Match.ft_home > 0, Match.ft_away > 0), "Yes"), else_="No"),
+        [Match.ft_home, Match.ft_away],
+    ),
+    "corners": (
+        case((total_corners > CORNERS_LINE, "Over"), else_="Under"),
+        [Match.home_corners, Match.away_corners],
+    ),
+}
+
+
+def get_state(db: Session, market: str) -> SyncState:
+    name = f"{STATE_NAME}:{market}"
+    state = db.get(SyncState, name)
+    if state is None:
+        # Market bazlı satırlardan önceki ortak watermark'tan devam et
+        legacy = db.get(SyncState, STATE_NAME)
+        state = SyncState(name=name, watermark=legacy.watermark if legacy is not None else None)
+        db.add(state)
+    return state
+
+
+def settle_market(db: Session, market: str, watermark: datetime | None, upper: datetime) -> int:
+    """Tek market için sonuçlandırma UPDATE'i. Returns: güncellenen tahmin sayısı."""
+    actual, required = SETTLEMENT_RULES[market]
+    pending = Prediction.is_correct.is_(None)
+    if watermark is not None:
+        pending = or_(pending, Match.updated_at > watermark)
+
+    stmt = (
+        update(Prediction)
+        .where(
+            Prediction.match_id == Match.id,
+            Prediction.market == market,
+            Match.updated_at <= upper,
+            pending,
+            *[column.is_not(None) for column in required],
+        )
+        .values(
+            actual_value=actual,
+            is_correct=Prediction.prediction == actual,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
+
+
+def settle_predictions(db: Session, markets: list[str] | None = None) -> dict[str, int]:
+    """
+    Watermark'tan bu yana sonuçlanan maçların tahminlerini market market sonuçlandır.
+
+    Üst sınır iş başında alınır; çalışma sırasında değişen maçlar bir
+    sonraki turda işlenir. Commit çağıran tarafa bırakılır.
+
+    Returns:
+        Market -> güncellenen tahmin sayısı
+    """
+    upper = db.scalar(select(func.max(Match.updated_at)))
+    if upper is None:
+        return {}
+
+    counts = {}
+    for market in markets or SETTLEMENT_RULES:
+        state = get_state(db, market)
+        counts[market] = settle_market(db, market, state.watermark, upper)
+        state.watermark = upper
+    db.flush()
+    return counts
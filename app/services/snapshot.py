@@ -0,0 +1,288 @@
+"""
+Columnar veri snapshot'ları.
+
+matches, elo_history ve team_stats tablolarını veritabanından okuyup
+Arrow IPC (varsayılan) ya da Parquet dosyalarına yazar. Eğitim ve analiz
+işleri veritabanına dokunmadan bu dosyaları memory-map ile açar.
+
+Dizin yapısı:
+    <root>/
+        LATEST                          -> aktif versiyon adı
+        20240501T120000-1a2b3c4d/
+            _snapshot.json              -> watermark, satır sayıları, format
+            matches/division=E0/season=2023/part-0.arrow
+            elo_history/season=2023/part-0.arrow
+            team_stats/part-0.arrow
+
+Versiyon, tabloların en son değişiklik zamanı ve satır sayılarından
+(data watermark) türetilir; veri değişmediyse yeni snapshot yazılmaz.
+Arrow IPC dosyaları sıkıştırmasız yazılır, böylece memory-map ile
+açıldıklarında kolonlar kopyalanmadan (zero-copy) kullanılır.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    Time,
+    cast,
+    func,
+    literal_column,
+    select,
+)
+from sqlalchemy.orm import Session
+
+from app.models import Division, EloHistory, Match, TeamStats
+
+LATEST_FILE = "LATEST"
+MANIFEST_FILE = "_snapshot.json"
+FORMATS = {"arrow": "arrow", "parquet": "parquet"}
+
+# Tablo adı -> (model, partition kolonları)
+SNAPSHOT_TABLES = {
+    "matches": (Match, ["division", "season"]),
+    "elo_history": (EloHistory, ["season"]),
+    "team_stats": (TeamStats, []),
+}
+
+PARTITION_TYPES = {"division": pa.string(), "season": pa.int32()}
+
+
+def season_of(date_column):
+    """Sezon başlangıç yılı (Temmuz-Haziran): 2023-08-12 -> 2023, 2024-05-19 -> 2023."""
+    shifted = date_column - literal_column("interval '6 months'")
+    return cast(func.extract("year", shifted), Integer)
+
+
+def snapshot_query(name: str):
+    """Tablonun snapshot'a yazılacak SELECT'i (partition kolonlarıyla)."""
+    model, _ = SNAPSHOT_TABLES[name]
+    columns = list(model.__table__.columns)
+    if name == "matches":
+        return (
+            select(
+                *columns,
+                Division.code.label("division"),
+                season_of(Match.match_date).label("season"),
+            )
+            .join(Division, Division.id == Match.division_id)
+            .order_by(Match.match_date, Match.id)
+        )
+    if name == "elo_history":
+        return select(*columns, season_of(EloHistory.date).label("season")).order_by(
+            EloHistory.date, EloHistory.team_id
+        )
+    return select(*columns).order_by(model.team_id)
+
+
+def arrow_type(column_type) -> pa.DataType:
+    """SQLAlchemy kolon tipini Arrow tipine çevir."""
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Time):
+        return pa.time64("us")
+    # JSON kolonları (team_stats.recent_matches) metin olarak yazılır
+    return pa.string()
+
+
+def json_columns(name: str) -> list[str]:
+    model, _ = SNAPSHOT_TABLES[name]
+    return [c.name for c in model.__table__.columns if isinstance(c.type, JSON)]
+
+
+def arrow_schema(name: str) -> pa.Schema:
+    model, partitions = SNAPSHOT_TABLES[name]
+    fields = [pa.field(c.name, arrow_type(c.type)) for c in model.__table__.columns]
+    fields += [pa.field(p, PARTITION_TYPES[p]) for p in partitions]
+    return pa.schema(fields)
+
+
+def data_watermark(db: Session) -> dict:
+    """Her tablo için son değişiklik zamanı ve satır sayısı."""
+    watermark = {}
+    for name, changed_at in (
+        ("matches", Match.updated_at),
+        ("elo_history", EloHistory.updated_at),
+        ("team_stats", TeamStats.updated_at),
+    ):
+        last_change, rows = db.execute(select(func.max(changed_at), func.count())).one()
+        watermark[name] = {
+            "last_change": last_change.isoformat() if last_change else None,
+            "rows": rows,
+        }
+    return watermark
+
+
+def snapshot_version(watermark: dict) -> str:
+    """Watermark'tan deterministik versiyon adı: <son değişiklik>-<kısa hash>."""
+    changes = [t["last_change"] for t in watermark.values() if t["last_change"]]
+    stamp = max(changes).replace("-", "").replace(":", "")[:15] if changes else "empty"
+    digest = hashlib.sha1(json.dumps(watermark, sort_keys=True).encode()).hexdigest()
+    return f"{stamp}-{digest[:8]}"
+
+
+def file_format(fmt: str):
+    if fmt == "parquet":
+        file_fmt = ds.ParquetFileFormat()
+        return file_fmt, file_fmt.make_write_options(compression="zstd")
+    file_fmt = ds.IpcFileFormat()
+    # Sıkıştırmasız: memory-map ile zero-copy okuma için şart
+    return file_fmt, file_fmt.make_write_options(compression=None)
+
+
+def iter_record_batches(db: Session, name: str, schema: pa.Schema, batch_size: int):
+    """Sorgu sonucunu server-side cursor ile batch batch Arrow'a çevir."""
+    result = db.execute(snapshot_query(name).execution_options(yield_per=batch_size))
+    columns = list(result.keys())
+    encoded = json_columns(name)
+    for rows in result.partitions(batch_size):
+        frame = pd.DataFrame(rows, columns=columns)
+        for col in encoded:
+            frame[col] = [None if value is None else json.dumps(value) for value in frame[col]]
+        yield pa.RecordBatch.from_pandas(frame, schema=schema, preserve_index=False)
+
+
+def write_latest(root: Path, version: str) -> None:
+    """LATEST işaretçisini atomik olarak güncelle."""
+    tmp = root / f".{LATEST_FILE}.tmp"
+    tmp.write_text(version)
+    os.replace(tmp, root / LATEST_FILE)
+
+
+def export_snapshot(
+    db: Session,
+    root: str,
+    fmt: str = "arrow",
+    batch_size: int = 100_000,
+    force: bool = False,
+) -> Path:
+    """
+    Snapshot yaz ve dizinini döndür.
+
+    Aynı watermark için snapshot zaten varsa (force değilse) hiçbir şey
+    yazılmaz. Dosyalar önce geçici dizine yazılır, sonra tek rename ile
+    yayınlanır; yarım kalan export okuyuculara görünmez.
+    """
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+    watermark = data_watermark(db)
+    version = snapshot_version(watermark)
+    target = root_path / version
+
+    if target.exists() and not force:
+        write_latest(root_path, version)
+        return target
+
+    staging = root_path / f".{version}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    file_fmt, write_options = file_format(fmt)
+    extension = FORMATS[fmt]
+
+    for name, (_, partitions) in SNAPSHOT_TABLES.items():
+        schema = arrow_schema(name)
+        partitioning = None
+        if partitions:
+            partitioning = ds.partitioning(
+                pa.schema([schema.field(p) for p in partitions]), flavor="hive"
+            )
+        ds.write_dataset(
+            iter_record_batches(db, name, schema, batch_size),
+            str(staging / name),
+            schema=schema,
+            format=file_fmt,
+            file_options=write_options,
+            partitioning=partitioning,
+            basename_template=f"part-{{i}}.{extension}",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    manifest = {
+        "version": version,
+        "format": fmt,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "watermark": watermark,
+        "tables": {name: parts for name, (_, parts) in SNAPSHOT_TABLES.items()},
+    }
+    (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    write_latest(root_path, version)
+    return target
+
+
+def resolve_snapshot(root: str, version: str | None = None) -> Path:
+    """Versiyon verilmezse LATEST'in gösterdiği snapshot dizini."""
+    root_path = Path(root)
+    if version is None:
+        version = (root_path / LATEST_FILE).read_text().strip()
+    return root_path / version
+
+
+def open_snapshot(root: str, version: str | None = None) -> dict[str, ds.Dataset]:
+    """
+    Snapshot tablolarını memory-map edilmiş Arrow dataset'leri olarak aç.
+
+    Dosyalar okunmaz; sadece şema ve dosya listesi çözülür. Veri,
+    to_table() / scanner ile ihtiyaç duyulan kolon ve partition'lar için
+    sayfa sayfa map edilir.
+    """
+    path = resolve_snapshot(root, version)
+    manifest = json.loads((path / MANIFEST_FILE).read_text())
+    file_fmt = ds.ParquetFileFormat() if manifest["format"] == "parquet" else ds.IpcFileFormat()
+    filesystem = pafs.LocalFileSystem(use_mmap=True)
+
+    datasets = {}
+    for name, partitions in manifest["tables"].items():
+        partitioning = None
+        if partitions:
+            partitioning = ds.partitioning(
+                pa.schema([pa.field(p, PARTITION_TYPES[p]) for p in partitions]),
+                flavor="hive",
+            )
+        datasets[name] = ds.dataset(
+            str(path / name),
+            format=file_fmt,
+            partitioning=partitioning,
+            filesystem=filesystem,
+        )
+    return datasets
+
+
+def load_table(
+    root: str,
+    name: str,
+    version: str | None = None,
+    columns: list | None = None,
+    filter=None,
+) -> pa.Table:
+    """
+    Tek bir snapshot tablosunu yükle.
+
+    Örnek:
+        load_table(root, "matches", filter=(ds.field("division") == "E0")
+                   & (ds.field("season") >= 2018))
+    """
+    return open_snapshot(root, version)[name].to_table(columns=columns, filter=filter)
@@ -0,0 +1,219 @@
+"""
+TeamStats feature store güncelleyicisi.
+
+Her takımın son WINDOW maçı team_stats.recent_matches kolonunda küçük
+bir ring buffer olarak tutulur. Yeni biten bir maç uygulanırken sadece
+iki takımın buffer'ı kaydırılır, ortalamalar ve seriler güncellenir;
+matches tablosu yeniden taranmaz.
+
+Bir maç iki kez uygulanmaz: (last_match_date, last_match_id) watermark'ından
+eski ya da ona eşit maçlar atlanır. Geçmişe dönük düzeltmeler veya ilk
+doldurma için rebuild_team_stats tüm tabloyu baştan hesaplar.
+"""
+
+from collections import deque
+from typing import Iterable
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Match, MatchResult, TeamStats
+
+WINDOW = 5
+
+# recent_matches girdisindeki alanların sırası
+GOALS_FOR, GOALS_AGAINST, SHOTS, SHOTS_TARGET, CORNERS, CORNERS_AGAINST, POINTS = range(7)
+
+# TeamStats kolonu -> ortalaması alınan alan
+AVERAGE_FIELDS = {
+    "avg_goals_scored_5": GOALS_FOR,
+    "avg_goals_conceded_5": GOALS_AGAINST,
+    "avg_shots_5": SHOTS,
+    "avg_shots_target_5": SHOTS_TARGET,
+    "avg_corners_5": CORNERS,
+    "avg_corners_conceded_5": CORNERS_AGAINST,
+}
+
+
+def ensure_team_stats_columns(db) -> None:
+    """
+    Eski veritabanlarında ring buffer ve watermark kolonları yoksa ekle.
+
+    create_all mevcut tabloya kolon eklemez. db bir Session ya da
+    Connection olabilir (lifespan'da conn.run_sync ile çağrılır).
+    """
+    for column, ddl_type in (
+        ("recent_matches", "JSON"),
+        ("last_match_id", "INTEGER"),
+        ("last_match_date", "DATE"),
+    ):
+        db.execute(text(f"ALTER TABLE team_stats ADD COLUMN IF NOT EXISTS {column} {ddl_type}"))
+
+
+def is_finished(match: Match) -> bool:
+    return match.ft_home is not None and match.ft_away is not None
+
+
+def match_entries(match: Match) -> list[tuple[int, list]]:
+    """Maçı ev sahibi ve deplasman perspektifinden iki buffer girdisine çevir."""
+    if match.ft_result is not None:
+        result = match.ft_result
+    elif match.ft_home > match.ft_away:
+        result = MatchResult.HOME
+    elif match.ft_home < match.ft_away:
+        result = MatchResult.AWAY
+    else:
+        result = MatchResult.DRAW
+
+    home_points = {MatchResult.HOME: 3, MatchResult.DRAW: 1, MatchResult.AWAY: 0}[result]
+    away_points = {MatchResult.HOME: 0, MatchResult.DRAW: 1, MatchResult.AWAY: 3}[result]
+    return [
+        (match.home_team_id, [
+            match.ft_home, match.ft_away, match.home_shots, match.home_shots_target,
+            match.home_corners, match.away_corners, home_points,
+        ]),
+        (match.away_team_id, [
+            match.ft_away, match.ft_home, match.away_shots, match.away_shots_target,
+            match.away_corners, match.home_corners, away_points,
+        ]),
+    ]
+
+
+class TeamForm:
+    """Tek bir takımın ring buffer'ı ve serileri."""
+
+    def __init__(self, recent: list | None = None, win_streak: int = 0, scoring_streak: int = 0):
+        self.recent = deque(recent or [], maxlen=WINDOW)
+        self.win_streak = win_streak or 0
+        self.scoring_streak = scoring_streak or 0
+
+    @classmethod
+    def from_stats(cls, stats: TeamStats) -> "TeamForm":
+        return cls(stats.recent_matches, stats.win_streak, stats.scoring_streak)
+
+    def push(self, entry: list) -> None:
+        """Yeni maçı ekle; en eski maç buffer'dan düşer."""
+        self.recent.append(entry)
+        self.win_streak = self.win_streak + 1 if entry[POINTS] == 3 else 0
+        self.scoring_streak = self.scoring_streak + 1 if entry[GOALS_FOR] > 0 else 0
+
+    def average(self, field: int) -> float | None:
+        values = [entry[field] for entry in self.recent if entry[field] is not None]
+        if not values:
+            return None
+        return round(sum(values) / len(values), 3)
+
+    def apply_to(self, stats: TeamStats) -> None:
+        """Buffer'dan türetilen değerleri TeamStats satırına yaz."""
+        for column, field in AVERAGE_FIELDS.items():
+            setattr(stats, column, self.average(field))
+        stats.current_form = sum(entry[POINTS] for entry in self.recent)
+        stats.win_streak = self.win_streak
+        stats.scoring_streak = self.scoring_streak
+        stats.recent_matches = [list(entry) for entry in self.recent]
+
+
+def is_applied(stats: TeamStats, match: Match) -> bool:
+    """Maç bu takım için zaten uygulanmış mı (watermark'tan eski/eşit)?"""
+    if stats.last_match_date is None:
+        return False
+    return (match.match_date, match.id) <= (stats.last_match_date, stats.last_match_id or 0)
+
+
+def apply_matches(stats_by_team: dict[int, TeamStats], matches: Iterable[Match]) -> set[int]:
+    """
+    Bitmiş maçları kronolojik sırayla TeamStats satırlarına uygula.
+
+    stats_by_team eksik takımlar için yerinde doldurulur.
+
+    Returns:
+        Değişen takımların id'leri
+    """
+    changed = set()
+    ordered = sorted((m for m in matches if is_finished(m)), key=lambda m: (m.match_date, m.id))
+    for match in ordered:
+        for team_id, entry in match_entries(match):
+            stats = stats_by_team.get(team_id)
+            if stats is None:
+                stats = TeamStats(team_id=team_id, win_streak=0, scoring_streak=0)
+                stats_by_team[team_id] = stats
+            if is_applied(stats, match):
+                continue
+
+            form = TeamForm.from_stats(stats)
+            form.push(entry)
+            form.apply_to(stats)
+            stats.last_match_id = match.id
+            stats.last_match_date = match.match_date
+            changed.add(team_id)
+    return changed
+
+
+def affected_team_ids(matches: Iterable[Match]) -> set[int]:
+    ids = set()
+    for match in matches:
+        ids.update((match.home_team_id, match.away_team_id))
+    return ids
+
+
+async def update_team_stats(db: AsyncSession, matches: list[Match]) -> int:
+    """
+    Yeni biten maçları uygula; sadece etkilenen team_stats satırları yazılır.
+
+    Commit çağıran tarafa bırakılır.
+
+    Returns:
+        Güncellenen takım sayısı
+    """
+    team_ids = affected_team_ids(matches)
+    if not team_ids:
+        return 0
+    result = await db.execute(select(TeamStats).where(TeamStats.team_id.in_(team_ids)))
+    stats_by_team = {stats.team_id: stats for stats in result.scalars().all()}
+    existing = set(stats_by_team)
+
+    changed = apply_matches(stats_by_team, matches)
+    for team_id in changed - existing:
+        db.add(stats_by_team[team_id])
+    await db.flush()
+    return len(changed)
+
+
+def rebuild_team_stats(db: Session, batch_size: int = 50_000) -> int:
+    """
+    Tüm team_stats tablosunu matches'tan baştan hesapla (backfill).
+
+    Maçlar tarih sırasıyla stream edilir; her takım için sadece ring buffer
+    bellekte tutulur. Sonuç tek bir upsert ile yazılır.
+
+    Returns:
+        Yazılan takım sayısı
+    """
+    stats_by_team: dict[int, TeamStats] = {}
+    query = (
+        select(Match)
+        .where(Match.ft_home.is_not(None), Match.ft_away.is_not(None))
+        .order_by(Match.match_date, Match.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.execute(query).scalars().partitions(batch_size):
+        apply_matches(stats_by_team, partition)
+        db.expunge_all()
+
+    columns = [
+        "team_id", *AVERAGE_FIELDS, "current_form", "win_streak", "scoring_streak",
+        "recent_matches", "last_match_id", "last_match_date",
+    ]
+    rows = [{col: getattr(stats, col) for col in columns} for stats in stats_by_team.values()]
+    if rows:
+        stmt = pg_insert(TeamStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["team_id"],
+            # Core upsert onupdate'i tetiklemez; snapshot versiyonu updated_at'e bakar
+            set_={**{col: stmt.excluded[col] for col in columns if col != "team_id"}, "updated_at": func.now()},
+        )
+        db.execute(stmt)
+    db.commit()
+    return len(rows)
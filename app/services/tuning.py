@@ -0,0 +1,270 @@
+"""
+Paralel hiperparametre araması.
+
+Yeni bir MLModel versiyonu için aday hiperparametre kombinasyonları
+denenir ve en iyisi kaydedilir.
+
+- Feature matrisi bir kez kurulur ve zamana göre bölünür: son
+  valid_seasons sezon doğrulama, öncesi eğitim. X, y ve sezon dizileri
+  tek bir SharedMemory bloğuna konur; worker'lar başlangıçta bir kez
+  bağlanır, denemelere sadece parametreler gönderilir.
+- Denemeler spawn ile açılan bir process pool'da paralel çalışır. Her
+  worker'da BLAS/OpenMP tek thread'e sınırlanır, böylece throughput
+  çekirdek sayısıyla ölçeklenir (iç içe paralellik çekirdekleri paylaşmaz).
+- Kötü adaylar successive halving ile erken elenir: tüm adaylar az sayıda
+  boosting turuyla (min_iter) denenir, doğrulama log loss'una göre en iyi
+  1/eta'sı eta kat daha fazla turla tekrar denenir; max_iter'e kadar.
+
+Kazanan parametrelerle model tüm veriyle (eğitim + doğrulama) yeniden
+eğitilir, artifact save_artifact ile yazılır ve is_active=False bir
+MLModel satırı eklenir. Aktifleştirme ayrı bir karardır.
+"""
+
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from threadpoolctl import threadpool_limits
+
+from app.models import MLModel
+from app.services.backtest import (
+    classification_metrics,
+    load_backtest_frame,
+    market_targets,
+    season_numbers,
+)
+from app.services.executor import attach, release, share_arrays
+from app.services.features import FEATURE_NAMES, build_feature_matrix
+from app.services.model_registry import DEFAULT_MODEL_DIR, save_artifact
+from app.services.predictions import MARKETS
+
+# Parametre -> aday değerler (HistGradientBoostingClassifier)
+SEARCH_SPACE = {
+    "learning_rate": [0.01, 0.02, 0.03, 0.05, 0.08, 0.1, 0.15, 0.2],
+    "max_leaf_nodes": [7, 15, 31, 63],
+    "max_depth": [None, 3, 4, 6, 8],
+    "min_samples_leaf": [20, 50, 100, 200, 400],
+    "l2_regularization": [0.0, 0.01, 0.1, 1.0, 10.0],
+    "max_features": [0.5, 0.7, 0.85, 1.0],
+}
+
+
+def sample_candidates(n_trials: int, seed: int) -> list[dict]:
+    """Arama uzayından tekrarsız rastgele kombinasyonlar."""
+    rng = np.random.default_rng(seed)
+    candidates, seen = [], set()
+    space_size = math.prod(len(values) for values in SEARCH_SPACE.values())
+    while len(candidates) < min(n_trials, space_size):
+        params = {
+            name: values[rng.integers(len(values))] for name, values in SEARCH_SPACE.items()
+        }
+        key = tuple(params.values())
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+
+def make_estimator(params: dict, max_iter: int, seed: int = 0) -> HistGradientBoostingClassifier:
+    # Tur sayısı halving bütçesi olarak kullanıldığından iç early stopping kapalı
+    return HistGradientBoostingClassifier(
+        **params, max_iter=max_iter, early_stopping=False, random_state=seed
+    )
+
+
+# --- Worker tarafı -----------------------------------------------------------------
+
+_shared: dict = {}
+
+
+def _init_tuning_worker(descriptor: dict) -> None:
+    """Paylaşılan dizilere bağlan ve worker'ı tek thread'e sınırla."""
+    block, arrays = attach(descriptor)
+    _shared["block"] = block
+    _shared.update(arrays)
+    _shared["limits"] = threadpool_limits(limits=1)
+
+
+def _trial_job(params: dict, max_iter: int, valid_from: int, seed: int) -> dict:
+    """Eğitim sezonlarıyla fit et, doğrulama sezonlarında skorla."""
+    X, y, seasons = _shared["X"], _shared["y"], _shared["season"]
+    train = seasons < valid_from
+    valid = ~train
+
+    started = time.perf_counter()
+    model = make_estimator(params, max_iter, seed)
+    model.fit(X[train], y[train])
+    proba = np.zeros((int(valid.sum()), int(y.max()) + 1))
+    proba[:, model.classes_.astype(int)] = model.predict_proba(X[valid])
+    metrics = classification_metrics(y[valid], proba)
+    metrics["fit_seconds"] = round(time.perf_counter() - started, 2)
+    return metrics
+
+
+# --- Ana süreç tarafı ----------------------------------------------------------------
+
+def successive_halving(
+    candidates: list[dict],
+    X: np.ndarray,
+    y: np.ndarray,
+    seasons: np.ndarray,
+    valid_from: int,
+    min_iter: int = 50,
+    max_iter: int = 800,
+    eta: int = 3,
+    workers: int = 4,
+    seed: int = 0,
+) -> list[dict]:
+    """
+    Returns:
+        Tüm denemeler (rung, max_iter, params, metrikler); son rung'un en
+        iyisi listenin ilk elemanıdır
+    """
+    block, descriptor = share_arrays({
+        "X": np.ascontiguousarray(X, dtype=np.float64),
+        "y": y.astype(np.int64),
+        "season": seasons.astype(np.int32),
+    })
+    trials = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max(1, workers),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_tuning_worker,
+            initargs=(descriptor,),
+        ) as pool:
+            survivors = candidates
+            budget = min_iter
+            rung = 0
+            while True:
+                jobs = [
+                    pool.submit(_trial_job, params, budget, valid_from, seed)
+                    for params in survivors
+                ]
+                results = [
+                    {"rung": rung, "max_iter": budget, "params": params, **job.result()}
+                    for params, job in zip(survivors, jobs)
+                ]
+                results.sort(key=lambda trial: trial["log_loss"])
+                trials.extend(results)
+
+                if budget >= max_iter or len(results) == 1:
+                    break
+                keep = max(1, len(results) // eta)
+                survivors = [trial["params"] for trial in results[:keep]]
+                budget = min(budget * eta, max_iter)
+                rung += 1
+    finally:
+        release(block, unlink=True)
+
+    final_rung = trials[-1]["rung"]
+    best = min((t for t in trials if t["rung"] == final_rung), key=lambda t: t["log_loss"])
+    return [best] + [t for t in trials if t is not best]
+
+
+def next_version(db: Session, name: str) -> str:
+    """Tarih bazlı versiyon: v20240519.1, v20240519.2, ..."""
+    prefix = f"v{datetime.now():%Y%m%d}."
+    versions = db.scalars(
+        select(MLModel.version).where(MLModel.name == name, MLModel.version.like(f"{prefix}%"))
+    ).all()
+    numbers = [int(v[len(prefix):]) for v in versions if v[len(prefix):].isdigit()]
+    return f"{prefix}{max(numbers, default=0) + 1}"
+
+
+def tune_model(
+    db: Session,
+    market: str,
+    n_trials: int = 60,
+    valid_seasons: int = 1,
+    division_codes: list[str] | None = None,
+    min_iter: int = 50,
+    max_iter: int = 800,
+    eta: int = 3,
+    workers: int = 4,
+    seed: int = 0,
+) -> tuple[MLModel, list[dict]]:
+    """
+    Market modeli için arama yap, en iyi modeli kaydet.
+
+    Commit çağıran tarafa bırakılır.
+
+    Returns:
+        (yeni MLModel satırı, tüm denemeler)
+    """
+    matches = load_backtest_frame(db, division_codes)
+    matrix = build_feature_matrix(matches)
+    matches = matches.set_index("id").loc[matrix.index]
+
+    labels = market_targets(market, matches)
+    _, y = np.unique(labels, return_inverse=True)
+    seasons = season_numbers(matches["match_date"])
+    X = matrix[FEATURE_NAMES].astype(float).to_numpy()
+
+    all_seasons = np.unique(seasons)
+    if len(all_seasons) <= valid_seasons:
+        raise ValueError(f"Doğrulama için {valid_seasons} sezondan fazla veri gerekli")
+    valid_from = int(all_seasons[-valid_seasons])
+
+    candidates = sample_candidates(n_trials, seed)
+    trials = successive_halving(
+        candidates, X, y, seasons, valid_from, min_iter, max_iter, eta, workers, seed
+    )
+    best = trials[0]
+
+    # Kazanan: tüm veriyle, gerçek sınıf etiketleriyle yeniden eğit
+    estimator = make_estimator(best["params"], best["max_iter"], seed)
+    estimator.fit(X, labels)
+
+    name = MARKETS[market]
+    version = next_version(db, name)
+    file_path = f"{name}/{version}.joblib"
+    save_artifact(estimator, DEFAULT_MODEL_DIR / file_path)
+
+    record = MLModel(
+        name=name,
+        version=version,
+        file_path=file_path,
+        trained_at=datetime.now(),
+        training_samples=len(X),
+        feature_names=list(FEATURE_NAMES),
+        hyperparameters={
+            **best["params"],
+            "max_iter": best["max_iter"],
+            "estimator": "HistGradientBoostingClassifier",
+            "search": {
+                "trials": len(candidates),
+                "fits": len(trials),
+                "eta": eta,
+                "valid_from_season": valid_from,
+                "divisions": division_codes,
+                "seed": seed,
+            },
+        },
+        # Doğrulama sezon(lar)ındaki skorlar
+        accuracy=round(best["accuracy"], 4),
+        f1_score=round(best["f1_score"], 4),
+        auc_score=None if np.isnan(best["auc_score"]) else round(best["auc_score"], 4),
+        log_loss=round(best["log_loss"], 4),
+        mae=round(best["mae"], 4),
+        is_active=False,
+    )
+    db.add(record)
+    db.flush()
+    return record, trials
+
+
+def trials_frame(trials: list[dict]) -> pd.DataFrame:
+    """Denemeleri rapor için düz tabloya çevir."""
+    return pd.DataFrame([
+        {"rung": t["rung"], "max_iter": t["max_iter"], "log_loss": t["log_loss"],
+         "accuracy": t["accuracy"], "fit_seconds": t["fit_seconds"], **t["params"]}
+        for t in trials
+    ])
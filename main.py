@@ -1,23 +1,92 @@
 from contextlib import asynccontextmanager
 
-import requests
 from fastapi import FastAPI
 
 from app.core.config import get_settings
 from app.core.cors import setup_cors
 from app.core.exception_handlers import app_exception_handler, generic_exception_handler
 from app.core.exceptions import BaseAppException
-from app.db.database import Base, engine
-from app.routers import auth
+from app.db.database import Base, async_session_maker, engine
+from app.routers import auth, imports, predictions, teams
+from app.services.api_cache import ResponseCache, ResponseTtlPolicy
+from app.services.api_football import api_football
+from app.services.api_scheduler import RequestScheduler
+from app.services.api_store import ResponseStore
+from app.services.backtest import ensure_backtest_column
+from app.services.elo import ensure_elo_source_column
+from app.services.executor import compute_executor
+from app.services.fixture_sync import FixtureSync
+from app.services.match_csv import ensure_import_constraints
+from app.services.model_registry import model_registry
+from app.services.team_stats import ensure_team_stats_columns
 
 settings = get_settings()
 
+fixture_sync = FixtureSync(
+    api_football,
+    leagues=settings.API_FOOTBALL_SYNC_LEAGUES,
+    season=settings.API_FOOTBALL_SYNC_SEASON,
+    lookahead_days=settings.API_FOOTBALL_SYNC_LOOKAHEAD_DAYS,
+    postprocess=settings.API_FOOTBALL_SYNC_POSTPROCESS,
+    lock_path=settings.API_FOOTBALL_SYNC_LOCK_PATH,
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all mevcut tabloya kolon eklemez
+        await conn.run_sync(ensure_backtest_column)
+        # CSV upload'ın ON CONFLICT hedefleri (uq_matches_natural_key, elo_history)
+        await conn.run_sync(ensure_import_constraints)
+        await conn.run_sync(ensure_team_stats_columns)
+        await conn.run_sync(ensure_elo_source_column)
+    await model_registry.start(async_session_maker, settings.MODEL_REGISTRY_POLL_SECONDS)
+    compute_executor.start(
+        model_registry.models,
+        database_url=settings.DATABASE_URL_SYNC,
+        workers=settings.COMPUTE_WORKERS,
+        max_queue=settings.COMPUTE_MAX_QUEUE,
+        elo_refresh_seconds=settings.ELO_INDEX_REFRESH_SECONDS,
+    )
+    predictions.cache_invalidator.start(async_session_maker, settings.PREDICTION_CACHE_POLL_SECONDS)
+    store = ResponseStore(settings.API_FOOTBALL_STORE_PATH) if settings.API_FOOTBALL_STORE_PATH else None
+    api_football.start(
+        base_url=settings.API_FOOTBALL_BASE_URL,
+        api_key=settings.API_FOOTBALL_KEY,
+        timeout=settings.API_FOOTBALL_TIMEOUT_SECONDS,
+        max_connections=settings.API_FOOTBALL_MAX_CONNECTIONS,
+        max_retries=settings.API_FOOTBALL_MAX_RETRIES,
+        cache=ResponseCache(
+            max_entries=settings.API_FOOTBALL_CACHE_MAX_ENTRIES,
+            policy=ResponseTtlPolicy(
+                finished=settings.API_FOOTBALL_TTL_FINISHED_SECONDS,
+                live=settings.API_FOOTBALL_TTL_LIVE_SECONDS,
+                default=settings.API_FOOTBALL_TTL_DEFAULT_SECONDS,
+            ),
+            store=store,
+        ),
+        store=store,
+        scheduler=RequestScheduler(
+            # Her worker kendi bucket'ını tutar: plan limiti worker'lar arasında bölünür
+            rate_per_minute=settings.API_FOOTBALL_RATE_PER_MINUTE / max(1, settings.API_FOOTBALL_WORKERS),
+            burst=max(1, settings.API_FOOTBALL_BURST // max(1, settings.API_FOOTBALL_WORKERS)),
+            daily_reserve=settings.API_FOOTBALL_DAILY_RESERVE,
+        ),
+        replay=settings.API_FOOTBALL_REPLAY,
+        prune_interval=settings.API_FOOTBALL_STORE_PRUNE_SECONDS,
+    )
+    await api_football.warm()
+    if not settings.API_FOOTBALL_REPLAY:
+        fixture_sync.start(async_session_maker, settings.API_FOOTBALL_SYNC_SECONDS)
     yield
+    await fixture_sync.stop()
+    await api_football.stop()
+    await predictions.cache_invalidator.stop()
+    await predictions.batcher.close()
+    compute_executor.stop()
+    await model_registry.stop()
     await engine.dispose()
 
 
@@ -48,45 +117,30 @@ async def health():
 
 @app.get("/apitest")
 async def apitest():
-    url = "https://v3.football.api-sports.io/players/league=203"
-
-    payload = {}
-    headers = {
-        "x-apisports-key": "c8c106cd827858adfbd000e6d049b3e6",
-    }
-
-    response = requests.request("GET", url, headers=headers, data=payload)
-    return response.json()
+    return await api_football.players(league=203, season=2024)
 
 
 @app.get("/besiktas-fikstur")
 async def get_besiktas_fixtures():
-    url = "https://v3.football.api-sports.io/fixtures"
-
-    params = {"team": "549", "season": "2024"}
+    return await api_football.fixtures(team=549, season=2024)
 
-    headers = {
-        "x-apisports-key": "c8c106cd827858adfbd000e6d049b3e6",
-        "x-rapidapi-host": "v3.football.api-sports.io",
-    }
 
-    response = requests.get(url, headers=headers, params=params)
-    data = response.json()
+@app.get("/mac-istatistik/{fixture_id}")
+async def get_match_statistics(fixture_id: int):
+    return await api_football.fixture_statistics(fixture_id)
 
-    return data
 
+@app.get("/api-football/metrics")
+async def get_api_football_metrics():
+    return api_football.metrics()
 
-@app.get("/mac-istatistik/{fixture_id}")
-async def get_match_statistics(fixture_id: int):
-    url = "https://v3.football.api-sports.io/fixtures/statistics"
-    params = {"fixture": fixture_id}
-    headers = {
-        "x-apisports-key": "c8c106cd827858adfbd000e6d049b3e6",
-        "x-rapidapi-host": "v3.football.api-sports.io",
-    }
 
-    response = requests.get(url, headers=headers, params=params)
-    return response.json()
+@app.get("/api-football/sync")
+async def get_api_football_sync():
+    return {"leagues": fixture_sync.leagues, "leader": fixture_sync.leader, "last_run": fixture_sync.last_run}
 
 
 app.include_router(auth.router)
+app.include_router(imports.router)
+app.include_router(teams.router)
+app.include_router(predictions.router)